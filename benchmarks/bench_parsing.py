@@ -0,0 +1,164 @@
+"""Microbenchmarks for ``parse_listing`` and the ``cleanup.process_*`` functions.
+
+Runs every function over the corpus and reports ns/op and the tracemalloc peak, the
+most memory traced at once during an op (not a count of allocations). Result pages
+are the captured, anonymised pages in ``benchmarks/corpus`` (see
+``benchmarks/capture_corpus.py``), or the hand-written page in
+``tests/fixtures/autoscout24`` while none were captured; raw field strings always come
+from ``tests/fixtures/autoscout24/raw_fields.json``. Results are compared against
+``benchmarks/baseline_parsing.json``:
+
+    python benchmarks/bench_parsing.py                  # compare, exit 1 on regression
+    python benchmarks/bench_parsing.py --save-baseline  # record a new baseline
+
+To compare across machines, every ns/op is divided by the ns/op of a calibration run
+of the standard library's ``HTMLParser`` over the same pages, and a benchmark regresses
+when this ratio exceeds the baseline's by more than ``--threshold``.
+"""
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from html.parser import HTMLParser
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from as24_crawl.pipelines.data_processing.cleanup import COLUMN_PROCESSORS
+from as24_crawl.scraping import parse_listing
+
+CORPUS_DIR = Path(__file__).parents[1] / "tests" / "fixtures" / "autoscout24"
+CAPTURED_DIR = Path(__file__).parent / "corpus"
+BASELINE = Path(__file__).parent / "baseline_parsing.json"
+def parse_page(page_html):
+    soup = BeautifulSoup(page_html, "html.parser")
+    results = []
+    for listing in soup.find_all("article", class_="cldt-summary-full-item"):
+        try:
+            results.append(parse_listing(listing))
+        except ValueError:
+            pass
+    return results
+
+
+def corpus_paths():
+    """Captured pages if there are any, otherwise the hand-written fixture page."""
+    return sorted(CAPTURED_DIR.glob("*.html")) or [CORPUS_DIR / "result_page.html"]
+
+
+def calibrate(pages):
+    for page_html in pages:
+        parser = HTMLParser()
+        parser.feed(page_html)
+        parser.close()
+
+
+def build_benchmarks():
+    """Maps benchmark names to ``(function, list of argument tuples)``."""
+    raw_fields = json.loads((CORPUS_DIR / "raw_fields.json").read_text())
+    pages = [path.read_text() for path in corpus_paths()]
+    listings = [
+        listing
+        for page_html in pages
+        for listing in BeautifulSoup(page_html, "html.parser").find_all("article", class_="cldt-summary-full-item")
+        if "mileage_road" in str(listing)
+    ]
+
+    benchmarks = {
+        f"process_{column}": (process, [(raw,) for raw, _ in raw_fields[column]])
+        for column, process in COLUMN_PROCESSORS.items()
+    }
+    benchmarks["parse_listing"] = (parse_listing, [(listing,) for listing in listings])
+    benchmarks["parse_page"] = (parse_page, [(page_html,) for page_html in pages])
+    return benchmarks, (calibrate, [(pages,)])
+
+
+def measure(func, calls, min_time):
+    """Returns ``(ns/op, mean tracemalloc peak bytes/op)`` for calling ``func`` over every argument tuple."""
+    loops, elapsed = 0, 0.0
+    while elapsed < min_time:
+        start = time.perf_counter_ns()
+        for args in calls:
+            func(*args)
+        elapsed += (time.perf_counter_ns() - start) / 1e9
+        loops += 1
+    ns_per_op = elapsed * 1e9 / (loops * len(calls))
+
+    peak = 0
+    tracemalloc.start()
+    for args in calls:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(*args)
+        peak += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return ns_per_op, peak / len(calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown, default 25%%.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to run each benchmark for.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    args = parser.parse_args()
+    # parse_page hits the corpus listing without mileage, keep its error log out of the report
+    logging.disable(logging.CRITICAL)
+
+    benchmarks, (calibration, calibration_calls) = build_benchmarks()
+    calibration_ns, _ = measure(calibration, calibration_calls, args.min_time)
+    results = {}
+    for name, (func, calls) in benchmarks.items():
+        ns_per_op, bytes_per_op = measure(func, calls, args.min_time)
+        results[name] = {
+            "relative": round(ns_per_op / calibration_ns, 6),
+            "ns_per_op": round(ns_per_op),
+            "tracemalloc_peak_bytes_per_op": round(bytes_per_op),
+        }
+
+    corpus = [path.name for path in corpus_paths()]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if baseline.get("corpus", corpus) != corpus:
+        print(f"The baseline was recorded on the pages {baseline['corpus']}, not comparing.")  # noqa: T201
+        baseline = {}
+    baseline = baseline.get("results", {})
+    regressions = []
+    print(f"calibration (HTMLParser over the pages): {calibration_ns:,.0f} ns")  # noqa: T201
+    print(  # noqa: T201
+        f"{'benchmark':<28} {'ns/op':>12} {'relative':>10} {'baseline':>10} {'change':>8} {'tracemalloc peak B/op':>22}"
+    )
+    for name, result in results.items():
+        reference = baseline.get(name, {}).get("relative")
+        change = result["relative"] / reference - 1 if reference else 0.0
+        if change > args.threshold:
+            regressions.append(name)
+        print(  # noqa: T201
+            f"{name:<28} {result['ns_per_op']:>12,} {result['relative']:>10.3g} {reference or 0:>10.3g} {change:>+8.1%} "
+            f"{result['tracemalloc_peak_bytes_per_op']:>22,}"
+        )
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": platform.node(),
+                    "python": platform.python_version(),
+                    "corpus": corpus,
+                    "calibration_ns": round(calibration_ns),
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Saved baseline to {args.baseline}")  # noqa: T201
+    elif regressions:
+        print(f"Throughput relative to the calibration regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Storage layouts of the crawl datasets: file size, write time and workbench load times.
+
+Writes the same table with every layout in ``LAYOUTS`` and times typical workbench
+reads of it: a full load, a column subset, a row filter on model and year that parquet
+can answer from row group statistics, and ``query.median_price_by_country`` in DuckDB.
+
+    python benchmarks/bench_storage.py                       # synthetic table from the fixtures
+    python benchmarks/bench_storage.py --input data/02_intermediate/cleaned_results.parquet
+
+``--input`` takes a cleaned_results file or version directory; without it the listings
+in ``tests/fixtures/autoscout24/result_page.html`` are repeated over ``--rows`` rows of
+random segments. Like crawled rows, every row keeps the HTML of its listing, with its
+own ad id, price and mileage.
+"""
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from bs4 import BeautifulSoup
+
+from as24_crawl.datasets import TunedParquetDataset
+from as24_crawl.query import median_price_by_country, resolve_parquet_path
+from as24_crawl.scraping import parse_listing
+
+CORPUS_DIR = Path(__file__).parents[1] / "tests" / "fixtures" / "autoscout24"
+# Layout name to TunedParquetDataset ``layout`` and ``save_args``
+LAYOUTS = {
+    "pandas default": (None, {}),
+    "zstd": (None, {"compression": "zstd"}),
+    "tuned auto": ("auto", {}),
+    "tuned catalog": ({"sort_keys": ["brand", "model", "country", "year"]}, {}),
+}
+SEGMENTS = {"vw": ["golf", "polo", "passat", "tiguan"], "bmw": ["3er", "5er", "x1"], "audi": ["a3", "a4", "q5"]}
+COUNTRIES = ["D", "A", "B", "E", "F", "I", "L", "NL"]
+
+
+def _german_number(value: float) -> str:
+    return f"{value:,.0f}".replace(",", ".")
+
+
+def synthetic_results(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Fixture listings with random segments, prices and mileages, shaped like cleaned_results."""
+    soup = BeautifulSoup((CORPUS_DIR / "result_page.html").read_text(), "html.parser")
+    listings = []
+    for listing in soup.find_all("article", class_="cldt-summary-full-item"):
+        try:
+            listings.append({**parse_listing(listing), "guid": listing["data-guid"]})
+        except ValueError:
+            pass
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame(listings).sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    data["brand"] = rng.choice(list(SEGMENTS), rows)
+    data["model"] = [rng.choice(SEGMENTS[brand]) for brand in data["brand"]]
+    data["country"] = rng.choice(COUNTRIES, rows)
+    data["year"] = rng.integers(2010, 2024, rows)
+    price = rng.lognormal(9.8, 0.5, rows).round(-1)
+    mileage = rng.integers(0, 300_000, rows)
+
+    # a unique ad id per row (a bijection of the row number), written into the url and html
+    offset = int(rng.integers(2**32))
+    guids = [f"{(row * 2654435761 + offset) % 2**32:08x}" for row in range(rows)]
+    data["html"] = [
+        html.replace(guid, new_guid)
+        .replace(f">{old_price}<", f">€ {_german_number(new_price)},-<")
+        .replace(f">{old_mileage}<", f">{_german_number(new_mileage)} km<")
+        for html, guid, new_guid, old_price, new_price, old_mileage, new_mileage in zip(
+            data["html"], data["guid"], guids, data["price"], price, data["mileage"], mileage
+        )
+    ]
+    data["url"] = [url.replace(guid, new_guid) for url, guid, new_guid in zip(data["url"], data["guid"], guids)]
+    data["price"] = price
+    data["mileage"] = mileage.astype("float64")
+    return data.drop(columns="guid")
+
+
+def timed(func, repeat):
+    """Best of ``repeat`` wall clock times of ``func()``, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(data, path, layout, save_args, model, year, repeat):
+    dataset = TunedParquetDataset(filepath=str(path), layout=layout, save_args=save_args)
+    write_s = timed(lambda: dataset.save(data), repeat)
+    return {
+        "size_mb": path.stat().st_size / 2**20,
+        "write_s": write_s,
+        "full_s": timed(lambda: pd.read_parquet(path), repeat),
+        "columns_s": timed(lambda: pq.read_table(path, columns=["model", "country", "mileage", "price"]), repeat),
+        "filter_s": timed(lambda: pq.read_table(path, filters=[("model", "=", model), ("year", "=", year)]), repeat),
+        "duckdb_s": timed(
+            lambda: median_price_by_country(model, year, 150_000, tables={"cleaned_results": str(path)}), repeat
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, help="cleaned_results parquet file or versioned dataset directory.")
+    parser.add_argument("--rows", type=int, default=500_000, help="Rows of the synthetic table.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best is reported.")
+    args = parser.parse_args()
+    # parse_listing logs the corpus listing without mileage, keep it out of the report
+    logging.disable(logging.CRITICAL)
+
+    data = pd.read_parquet(resolve_parquet_path(str(args.input))) if args.input else synthetic_results(args.rows)
+    model, year = str(data["model"].mode()[0]), int(data["year"].mode()[0])
+    print(f"{len(data):,} rows, filters on model = {model!r} and year = {year}")  # noqa: T201
+    print(  # noqa: T201
+        f"{'layout':<16} {'size MiB':>9} {'write s':>8} {'full s':>8} {'columns s':>10} {'filter s':>9} {'duckdb s':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, (layout, save_args) in LAYOUTS.items():
+            path = Path(tmp_dir) / f"{name.replace(' ', '_')}.parquet"
+            result = measure(data, path, layout, save_args, model, year, args.repeat)
+            print(  # noqa: T201
+                f"{name:<16} {result['size_mb']:>9.1f} {result['write_s']:>8.3f} {result['full_s']:>8.3f} "
+                f"{result['columns_s']:>10.3f} {result['filter_s']:>9.3f} {result['duckdb_s']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
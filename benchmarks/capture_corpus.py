@@ -0,0 +1,81 @@
+"""Captures an autoscout24 result page, anonymised, into the parsing benchmark corpus.
+
+    python benchmarks/capture_corpus.py --url "https://www.autoscout24.de/lst/ford/fiesta?cy=NL&page=1"
+    python benchmarks/capture_corpus.py --input saved_page.html --name ford_fiesta_nl
+
+The page keeps its markup, scripts and size, so ``bench_parsing.py`` measures what the
+crawler parses. Before it is written to ``benchmarks/corpus/<name>.html``:
+
+- ad ids (in ``id``, ``data-guid`` and the ad links) are replaced by hashes,
+- seller names, addresses and phone numbers are blanked,
+- image URLs and inline JSON (which repeats the seller data) are replaced by filler
+  of the same length.
+
+Check the output for anything personal before committing it.
+"""
+import argparse
+import hashlib
+import re
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+SELLER_CLASSES = re.compile(r"(SellerInfo|DealerInfo|Seller|Contact|Phone|Address)_")
+AD_ID = re.compile(r"[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}|(?<=-)[0-9a-f]{8,}(?=$|[?#])")
+
+
+def pseudonym(value: str) -> str:
+    """Same length hash of ``value``, so that equal ids stay equal across the page."""
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    return (digest * (len(value) // len(digest) + 1))[: len(value)]
+
+
+def anonymise(page_html: str) -> str:
+    soup = BeautifulSoup(page_html, "html.parser")
+    for element in soup.find_all(attrs={"data-guid": True}):
+        element["data-guid"] = pseudonym(element["data-guid"])
+    for element in soup.find_all(id=AD_ID):
+        element["id"] = AD_ID.sub(lambda match: pseudonym(match.group()), element["id"])
+    for link in soup.find_all("a", href=True):
+        if link["href"].startswith("tel:"):
+            link["href"] = "tel:"
+        else:
+            link["href"] = AD_ID.sub(lambda match: pseudonym(match.group()), link["href"])
+    for element in soup.find_all(class_=SELLER_CLASSES):
+        for text in element.find_all(string=True):
+            text.replace_with("x" * len(text))
+    for image in soup.find_all(["img", "source"]):
+        for attribute in ("src", "srcset"):
+            if image.get(attribute):
+                image[attribute] = "x" * len(image[attribute])
+    for script in soup.find_all("script"):
+        if script.string and script.get("type", "").endswith("json"):
+            script.string = "x" * len(script.string)
+    return str(soup)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--url", help="Result page to fetch.")
+    source.add_argument("--input", type=Path, help="Result page saved from a browser.")
+    parser.add_argument("--name", default="result_page", help="File name in benchmarks/corpus, without .html.")
+    args = parser.parse_args()
+
+    if args.url:
+        response = requests.get(args.url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+        response.raise_for_status()
+        page_html = response.text
+    else:
+        page_html = args.input.read_text()
+
+    CORPUS_DIR.mkdir(exist_ok=True)
+    output = CORPUS_DIR / f"{args.name}.html"
+    output.write_text(anonymise(page_html))
+    print(f"Wrote {output}, check it for personal data before committing it.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Startup-time benchmark for the crawl entry points.
+
+Times fresh interpreters so import costs are measured the way cron jobs and spawned
+pool workers pay them:
+
+    python benchmarks/startup.py --repeat 10 --max-seconds 1.0
+
+Exits non-zero when the crawl-only entry point or the worker import exceed
+``--max-seconds`` (median).
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "crawl-only --help": [sys.executable, "-m", "as24_crawl.crawl", "--help"],
+    "worker import (as24_crawl.scraping)": [sys.executable, "-c", "import as24_crawl.scraping"],
+    "kedro node import (crawl_nodes)": [
+        sys.executable,
+        "-c",
+        "import as24_crawl.pipelines.data_processing.crawl_nodes",
+    ],
+    "as24-crawl --help (kedro)": [sys.executable, "-m", "as24_crawl", "--help"],
+}
+GATED = ("crawl-only --help", "worker import (as24_crawl.scraping)")
+
+
+def time_command(command, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failed = []
+    for name, command in COMMANDS.items():
+        median = time_command(command, args.repeat)
+        print(f"{name:<40} {median * 1000:8.1f} ms")  # noqa: T201
+        if name in GATED and median > args.max_seconds:
+            failed.append(name)
+
+    if failed:
+        print(f"Slower than {args.max_seconds}s: {', '.join(failed)}")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
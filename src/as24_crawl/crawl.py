@@ -0,0 +1,132 @@
+"""Lightweight crawl-only entry point, ``as24-crawl-only``.
+
+Runs the same crawl as the ``data_processing`` pipeline without bootstrapping Kedro,
+for short cron-driven crawls. Everything beyond the standard library is imported
+lazily so that ``--help`` and pool workers start quickly; pandas is only imported
+when writing a parquet file.
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("as24_crawl.crawl")
+
+PARAMETER_FILES = "parameters*.yml"
+PROFILE_DIR = Path("data/08_reporting/profiles")
+
+
+def load_parameters(conf_source: Path, env: str) -> Dict[str, Any]:
+    """Reads ``parameters*.yml`` from ``base`` and overlays the files found in ``env``.
+
+    Only top level keys are merged, which is all the crawl parameters need. Use
+    ``kedro run`` for anything requiring the full OmegaConf resolution.
+    """
+    import yaml
+
+    parameters = {}
+    for environment in ("base", env):
+        for path in sorted((conf_source / environment).glob(PARAMETER_FILES)):
+            parameters.update(yaml.safe_load(path.read_text()) or {})
+    return parameters
+
+
+def write_results(results: List[Dict[str, Any]], output: Path) -> None:
+    """Writes records as JSON lines, or as parquet when the suffix asks for it."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix == ".parquet":
+        import pandas as pd
+
+        pd.DataFrame(results).to_parquet(output)
+    else:
+        with output.open("w") as f:
+            for record in results:
+                f.write(json.dumps(record) + "\n")
+
+
+def init_crawl_worker(crawl: Optional[Dict[str, Any]]) -> None:
+    """Pool initializer: applies ``params:crawl`` and starts profiling if the run is profiled."""
+    from as24_crawl.profiling import start_worker_profiling
+    from as24_crawl.scraping import configure_crawler
+
+    configure_crawler(crawl)
+    start_worker_profiling()
+
+
+def run_crawl(parameters: Dict[str, Any], processes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Crawls every task of the configured grid in a process pool."""
+    from multiprocessing import Pool
+
+    from as24_crawl.scraping import build_url_template, crawl_tasks, run_deferrable, scrape_job
+
+    year_range = parameters["year_range"]
+    tasks = crawl_tasks(
+        build_url_template(parameters["base_url"], parameters["url_params"]),
+        parameters["countries"],
+        parameters["brand_model"],
+        list(range(year_range[0], year_range[1] + 1)),
+        # no disk cache: short crawls want fresh pages, and workers skip importing joblib
+        None,
+    )
+
+    results = []
+    with Pool(processes, initializer=init_crawl_worker, initargs=(parameters.get("crawl"),)) as pool:
+        for _, task_results in run_deferrable(scrape_job, tasks, pool.imap_unordered):
+            results.extend(task_results)
+        pool.close()
+        pool.join()
+    logger.info(f"Finished crawling {len(results)} records from {len(tasks)} tasks.")
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="as24-crawl-only", description=__doc__.splitlines()[0])
+    parser.add_argument("--conf-source", type=Path, default=Path("conf"), help="Kedro configuration directory.")
+    parser.add_argument("--env", default="local", help="Configuration environment overlaid on base.")
+    parser.add_argument("--countries", help="Comma separated countries, overrides params:countries.")
+    parser.add_argument("--brand-model", help="Comma separated brand/model pairs, overrides params:brand_model.")
+    parser.add_argument("--years", help="Year range as FROM-TO, overrides params:year_range.")
+    parser.add_argument("--processes", type=int, help="Size of the crawl pool, defaults to the number of CPUs.")
+    parser.add_argument("--profile", action="store_true", help="Write stack samples and allocations to data/08_reporting/profiles/.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Output file (.jsonl or .parquet), defaults to data/01_raw/crawl/incremental/<timestamp>.jsonl.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parameters = load_parameters(args.conf_source, args.env)
+    if args.countries:
+        parameters["countries"] = args.countries.split(",")
+    if args.brand_model:
+        parameters["brand_model"] = args.brand_model.split(",")
+    if args.years:
+        years = [int(year) for year in args.years.split("-")]
+        parameters["year_range"] = [years[0], years[-1]]
+
+    output = args.output or Path("data/01_raw/crawl/incremental") / f"{datetime.now():%Y-%m-%dT%H.%M.%S}.jsonl"
+    if args.profile:
+        from as24_crawl.profiling import RunProfiler
+
+        profiler = RunProfiler(PROFILE_DIR)
+        profiler.start()
+        profiler.node_started("crawl")
+        results = run_crawl(parameters, args.processes)
+        profiler.node_finished("crawl")
+        profiler.stop()
+    else:
+        results = run_crawl(parameters, args.processes)
+    write_results(results, output)
+    logger.info(f"Saved results to {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
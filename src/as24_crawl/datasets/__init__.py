@@ -0,0 +1,8 @@
+"""Custom Kedro datasets for the as24_crawl project."""
+
+from .arrow_cached_parquet_dataset import ArrowCachedParquetDataset
+from .duckdb_query_dataset import DuckDBQueryDataset
+from .optional_dataset import OptionalDataset
+from .tuned_parquet_dataset import TunedParquetDataset
+
+__all__ = ["ArrowCachedParquetDataset", "DuckDBQueryDataset", "OptionalDataset", "TunedParquetDataset"]
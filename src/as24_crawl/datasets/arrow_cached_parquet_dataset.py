@@ -0,0 +1,118 @@
+"""``ArrowCachedParquetDataset`` is a ``TunedParquetDataset`` that loads through a
+memory-mapped Arrow IPC (Feather v2) mirror of every dataset version.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from kedro.io.core import DatasetError, get_filepath_str
+
+from .tuned_parquet_dataset import TunedParquetDataset
+
+logger = logging.getLogger(__name__)
+
+# ``load_args`` applied to the mirrored table, like ``pandas.read_parquet`` would
+SUPPORTED_LOAD_ARGS = {"columns", "filters"}
+
+
+class ArrowCachedParquetDataset(TunedParquetDataset):
+    """Saves like ``TunedParquetDataset``; loads zero-copy from an uncompressed Arrow IPC mirror.
+
+    The first load of a version decodes the parquet file once and writes the mirror to
+    ``cache_dir``; every following load memory-maps it, so repeated loads in the workbench
+    and several notebook kernels share the same OS pages instead of each holding a decoded
+    copy. Mirrors are keyed by the dataset's full path and version (by mtime and size for
+    unversioned datasets), so a new pipeline run never serves stale data.
+
+    Example usage for the YAML API:
+
+    .. code-block:: yaml
+
+        cleaned_results:
+          type: as24_crawl.datasets.ArrowCachedParquetDataset
+          versioned: True
+          filepath: data/02_intermediate/cleaned_results.parquet
+          cache_dir: data/.arrow_cache
+
+    Columns are numpy backed by default, converted once per load. With
+    ``arrow_backed: True`` they are returned as ``pd.ArrowDtype``, which wraps the mapped
+    buffers without copying, but not every consumer accepts them (e.g. ``np.asarray`` of
+    a frame of them is ``object``). ``load_args`` may select ``columns`` and ``filters``
+    rows as in ``pandas.read_parquet``.
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_dir: str = "data/.arrow_cache",
+        arrow_backed: bool = False,
+        keep_mirrors: int = 2,
+        **kwargs: Any,
+    ) -> None:
+        """Creates a new instance of ``ArrowCachedParquetDataset``.
+
+        Args:
+            cache_dir: Local directory holding the Arrow IPC mirrors.
+            arrow_backed: Return ``pd.ArrowDtype`` columns instead of numpy ones.
+            keep_mirrors: Number of most recent mirrors kept per dataset.
+            **kwargs: Passed on to ``TunedParquetDataset``, e.g. ``layout``.
+
+        Raises:
+            DatasetError: When the filesystem is not local or ``load_args`` has keys
+                other than ``columns`` and ``filters``.
+        """
+        super().__init__(**kwargs)
+        if self._protocol != "file":
+            raise DatasetError(f"{self.__class__.__name__} can only memory-map files on a local filesystem.")
+        unsupported = set(self._load_args) - SUPPORTED_LOAD_ARGS
+        if unsupported:
+            raise DatasetError(f"{self.__class__.__name__} does not support load_args {sorted(unsupported)}.")
+        self._cache_dir = Path(cache_dir)
+        self._arrow_backed = arrow_backed
+        self._keep_mirrors = keep_mirrors
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "cache_dir": str(self._cache_dir), "arrow_backed": self._arrow_backed}
+
+    def _load(self) -> pd.DataFrame:
+        load_path = Path(get_filepath_str(self._get_load_path(), self._protocol))
+        mirror = self._mirror_path(load_path)
+        if not mirror.exists():
+            self._write_mirror(pq.read_table(load_path), mirror)
+
+        with pa.memory_map(str(mirror)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if self._load_args.get("filters"):
+            table = table.filter(pq.filters_to_expression(self._load_args["filters"]))
+        if self._load_args.get("columns"):
+            table = table.select(self._load_args["columns"])
+        if self._arrow_backed:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def _mirror_path(self, load_path: Path) -> Path:
+        version = self.resolve_load_version()
+        if version is None:
+            stat = load_path.stat()
+            version = f"{stat.st_mtime_ns}-{stat.st_size}"
+        # datasets with the same file name in different directories get their own mirrors
+        path_hash = hashlib.sha1(str(Path(self._filepath).resolve()).encode()).hexdigest()[:12]
+        return self._cache_dir / f"{load_path.stem}-{path_hash}" / f"{version}.arrow"
+
+    def _write_mirror(self, table: pa.Table, mirror: Path) -> None:
+        """Writes the mirror atomically so concurrent kernels never map a partial file."""
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = mirror.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, mirror)
+        logger.info(f"Wrote Arrow IPC mirror {mirror}")
+
+        mirrors = sorted(mirror.parent.glob("*.arrow"), key=lambda path: path.stat().st_mtime_ns)
+        for stale in mirrors[: -self._keep_mirrors]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,70 @@
+"""``DuckDBQueryDataset`` loads the result of a SQL query over parquet datasets."""
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from kedro.io.core import AbstractDataset, DatasetError
+
+from as24_crawl.query import query
+
+
+class DuckDBQueryDataset(AbstractDataset[pd.DataFrame, pd.DataFrame]):
+    """Runs a DuckDB query over parquet files on load. The dataset is read-only.
+
+    Tables are registered as views (see ``as24_crawl.query.connect``), versioned
+    datasets resolve to their newest version.
+
+    Example usage for the YAML API:
+
+    .. code-block:: yaml
+
+        golf_2015_median_price:
+          type: as24_crawl.datasets.DuckDBQueryDataset
+          sql: >
+            SELECT country, median(price) AS median_price
+            FROM cleaned_results
+            WHERE model = ? AND year = ? AND mileage < ?
+            GROUP BY country
+          parameters: [golf, 2015, 150000]
+    """
+
+    def __init__(
+        self,
+        *,
+        sql: str,
+        parameters: Optional[List[Any]] = None,
+        tables: Optional[Dict[str, str]] = None,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``DuckDBQueryDataset``.
+
+        Args:
+            sql: Query to run, with ``?`` placeholders.
+            parameters: Values bound to the placeholders.
+            tables: View names to parquet paths, defaults to ``as24_crawl.query.TABLES``.
+            threads: DuckDB worker threads, defaults to all cores.
+            memory_limit: DuckDB memory limit, e.g. ``"4GB"``.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        self._sql = sql
+        self._parameters = parameters or []
+        self._tables = tables
+        self._threads = threads
+        self._memory_limit = memory_limit
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"sql": self._sql, "parameters": self._parameters, "tables": self._tables}
+
+    def _load(self) -> pd.DataFrame:
+        return query(
+            self._sql,
+            self._parameters,
+            tables=self._tables,
+            threads=self._threads,
+            memory_limit=self._memory_limit,
+        )
+
+    def _save(self, data: pd.DataFrame) -> None:
+        raise DatasetError(f"{self.__class__.__name__} is read-only.")
@@ -0,0 +1,59 @@
+"""``OptionalDataset`` wraps another dataset and loads a default while it does not exist."""
+from copy import deepcopy
+from typing import Any, Dict, Optional, Union
+
+from kedro.io.core import AbstractDataset
+
+
+class OptionalDataset(AbstractDataset[Any, Any]):
+    """Loads the wrapped dataset, or ``default`` if nothing has been saved yet.
+
+    Lets a node read the output of a previous run (for incremental updates) under a
+    second catalog name without failing on the very first run.
+
+    Example usage for the YAML API:
+
+    .. code-block:: yaml
+
+        comparables_index_previous:
+          type: as24_crawl.datasets.OptionalDataset
+          dataset:
+            type: pickle.PickleDataset
+            filepath: data/06_models/comparables_index.pickle
+            versioned: True
+          default: {}
+    """
+
+    def __init__(
+        self,
+        *,
+        dataset: Union[Dict[str, Any], AbstractDataset],
+        default: Any = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Creates a new instance of ``OptionalDataset``.
+
+        Args:
+            dataset: The wrapped dataset or its catalog config.
+            default: Value loaded while the wrapped dataset does not exist.
+            metadata: Any arbitrary metadata, ignored by Kedro.
+        """
+        if isinstance(dataset, dict):
+            dataset = AbstractDataset.from_config("wrapped", dataset)
+        self._dataset = dataset
+        self._default = default
+        self.metadata = metadata
+
+    def _describe(self) -> Dict[str, Any]:
+        return {"dataset": self._dataset._describe(), "default": self._default}
+
+    def _load(self) -> Any:
+        if not self._dataset.exists():
+            return deepcopy(self._default)
+        return self._dataset.load()
+
+    def _save(self, data: Any) -> None:
+        self._dataset.save(data)
+
+    def _exists(self) -> bool:
+        return self._dataset.exists()
@@ -0,0 +1,172 @@
+"""``TunedParquetDataset`` is a ``pandas.ParquetDataset`` that picks the Parquet layout
+(sort order, row-group size, dictionary encoding, zstd level) from the data it saves.
+"""
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from kedro.io.core import DatasetError, get_filepath_str
+from kedro_datasets.pandas import ParquetDataset
+
+logger = logging.getLogger(__name__)
+
+# Rows inspected to estimate cardinalities and value sizes
+SAMPLE_ROWS = 100_000
+# ``save_args`` of ``pandas.DataFrame.to_parquet`` without a ``pyarrow.parquet.write_table``
+# counterpart; ``index`` is applied when converting to a table
+UNSUPPORTED_SAVE_ARGS = {"partition_cols"}
+
+
+@dataclass
+class ParquetLayout:
+    sort_keys: List[str]
+    row_group_size: int
+    dictionary_columns: List[str]
+    compression_level: Dict[str, int]
+
+    def write(self, table: pa.Table, where: Any, **write_args: Any) -> None:
+        """Writes ``table`` sorted, with ``write_args`` of ``pq.write_table`` overriding the layout.
+
+        The per column zstd levels are dropped when ``write_args`` set another ``compression``.
+        """
+        if self.sort_keys:
+            table = table.sort_by([(key, "ascending") for key in self.sort_keys])
+        defaults = {
+            "row_group_size": self.row_group_size,
+            "use_dictionary": self.dictionary_columns or False,
+            "compression": "zstd",
+            "compression_level": self.compression_level,
+        }
+        if "compression" in write_args and "compression_level" not in write_args:
+            del defaults["compression_level"]
+        pq.write_table(table, where, **{**defaults, **write_args})
+
+
+def _is_string(data_type: pa.DataType) -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_dictionary(data_type)
+
+
+def choose_layout(
+    table: pa.Table,
+    sort_keys: Union[str, List[str]] = "auto",
+    max_sort_keys: int = 3,
+    sort_key_ratio: float = 0.01,
+    dictionary_ratio: float = 0.5,
+    row_group_bytes: int = 32 * 2**20,
+    large_value_bytes: int = 256,
+    zstd_level: int = 3,
+    large_value_zstd_level: int = 9,
+) -> ParquetLayout:
+    """Picks a layout from the cardinality and size of the columns of ``table``.
+
+    Args:
+        table: The data to write.
+        sort_keys: Columns to sort by, or ``auto`` for up to ``max_sort_keys`` string
+            columns with at most ``sort_key_ratio`` distinct values per row, fewest first.
+            Sorting clusters repeated values for the encoders and lets readers skip row
+            groups by their min/max statistics.
+        max_sort_keys: Maximum number of ``auto`` sort keys.
+        sort_key_ratio: Maximum distinct values per row of an ``auto`` sort key.
+        dictionary_ratio: String columns with at most this many distinct values per row
+            are dictionary encoded.
+        row_group_bytes: Target in-memory size of a row group.
+        large_value_bytes: String columns with a larger mean value size (e.g. raw HTML)
+            are compressed with ``large_value_zstd_level``, all others with ``zstd_level``.
+        zstd_level: zstd level of regular columns.
+        large_value_zstd_level: zstd level of large value columns.
+    Returns:
+        The chosen layout.
+    """
+    n_rows = max(table.num_rows, 1)
+    sample = table
+    if table.num_rows > SAMPLE_ROWS:
+        sample = table.take(np.linspace(0, table.num_rows - 1, SAMPLE_ROWS).astype("int64"))
+
+    distinct, value_bytes = {}, {}
+    for name, column in zip(sample.column_names, sample.columns):
+        if _is_string(column.type):
+            values = column.cast(pa.string()) if pa.types.is_dictionary(column.type) else column
+            distinct[name] = pc.count_distinct(values).as_py() / max(len(sample), 1)
+            value_bytes[name] = (pc.sum(pc.binary_length(values)).as_py() or 0) / max(len(sample), 1)
+
+    if sort_keys == "auto":
+        candidates = [name for name, ratio in distinct.items() if ratio <= sort_key_ratio and ratio * len(sample) > 1]
+        sort_keys = sorted(candidates, key=distinct.get)[:max_sort_keys]
+
+    return ParquetLayout(
+        sort_keys=list(sort_keys),
+        row_group_size=int(min(max(row_group_bytes / max(table.nbytes / n_rows, 1), 10_000), 1_000_000)),
+        dictionary_columns=[name for name, ratio in distinct.items() if ratio <= dictionary_ratio],
+        compression_level={
+            name: large_value_zstd_level if value_bytes.get(name, 0) > large_value_bytes else zstd_level
+            for name in table.column_names
+        },
+    )
+
+
+class TunedParquetDataset(ParquetDataset):
+    """Saves with a Parquet layout chosen per save by ``choose_layout``; loads like
+    ``pandas.ParquetDataset``.
+
+    Example usage for the YAML API:
+
+    .. code-block:: yaml
+
+        crawling_results:
+          type: as24_crawl.datasets.TunedParquetDataset
+          versioned: True
+          filepath: data/01_raw/crawling_results.parquet
+          layout:
+            sort_keys: [brand, model, country, year]
+
+    ``layout`` is ``auto`` to choose everything, a dict of ``choose_layout`` arguments
+    to fix some choices, or ``None`` to save with the ``pandas.ParquetDataset`` defaults.
+    ``save_args`` apply in every mode: ``compression``, ``row_group_size``,
+    ``use_dictionary`` and other ``pyarrow.parquet.write_table`` arguments override the
+    chosen layout, ``partition_cols`` is only supported without a layout.
+    """
+
+    def __init__(self, *, layout: Union[str, Dict[str, Any], None] = "auto", **kwargs: Any) -> None:
+        """Creates a new instance of ``TunedParquetDataset``.
+
+        Args:
+            layout: ``auto``, overrides of the ``choose_layout`` arguments, or None.
+            **kwargs: Passed on to ``pandas.ParquetDataset``.
+        """
+        super().__init__(**kwargs)
+        self._layout = {} if layout == "auto" else layout
+        unsupported = UNSUPPORTED_SAVE_ARGS.intersection(self._save_args)
+        if self._layout is not None and unsupported:
+            raise DatasetError(f"{self.__class__.__name__} does not support save_args {sorted(unsupported)} with a layout.")
+
+    def _describe(self) -> Dict[str, Any]:
+        return {**super()._describe(), "layout": "auto" if self._layout == {} else self._layout}
+
+    def _save(self, data: pd.DataFrame) -> None:
+        save_path = get_filepath_str(self._get_save_path(), self._protocol)
+        if Path(save_path).is_dir():
+            raise DatasetError(f"Saving {self.__class__.__name__} to a directory is not supported.")
+
+        bytes_buffer = BytesIO()
+        if self._layout is None:
+            data.to_parquet(bytes_buffer, **self._save_args)
+        else:
+            write_args = {key: value for key, value in self._save_args.items() if key not in ("index", "engine")}
+            table = pa.Table.from_pandas(data, preserve_index=self._save_args.get("index"))
+            layout = choose_layout(table, **self._layout)
+            layout.write(table, bytes_buffer, **write_args)
+            logger.info(
+                f"Writing {save_path} sorted by {layout.sort_keys}, {layout.row_group_size} rows per row group, "
+                f"dictionary encoded {layout.dictionary_columns}"
+                + (f", with save_args {write_args}." if write_args else ".")
+            )
+        with self._fs.open(save_path, **self._fs_open_args_save) as fs_file:
+            fs_file.write(bytes_buffer.getvalue())
+        self._invalidate_cache()
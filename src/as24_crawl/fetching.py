@@ -0,0 +1,269 @@
+"""Fetch layer shared by the crawlers.
+
+URLs are normalised (sorted query parameters, cache-busting parameters dropped) before
+they are compared. Concurrent requests for the same URL share a single in-flight fetch,
+so overlapping pagination and retried tasks running at the same time do not hit the
+site twice. Completed pages are not kept by default: the crawler rarely asks for a page
+again, and every pool worker would hold its own copies.
+
+``get`` only returns 200 responses. Throttling (429), server errors and network errors
+count towards a circuit breaker per host and status class; once a circuit is open,
+requests to that host fail immediately with ``CircuitOpenError`` until ``reset_timeout``
+has passed, so callers can defer their work instead of waiting out retries. A
+``RetryBudget`` caps retries at a fraction of all requests, so a degraded site does not
+get a multiple of the normal load.
+
+Like ``scraping``, this module avoids pandas and Kedro imports.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+# Query parameters that do not change the response
+CACHE_BUSTING_PARAMS = frozenset({"_", "cb", "ts", "search_id", "source"})
+
+
+class FetchError(Exception):
+    """A page could not be fetched. ``status`` is None for network errors."""
+
+    def __init__(self, url: str, status: Optional[int] = None, message: str = ""):
+        super().__init__(f"Fetching {url} failed: {message or status}")
+        self.url = url
+        self.status = status
+        self.message = message
+
+    def __reduce__(self):
+        # keeps the attributes when raised in a pool worker
+        return type(self), (self.url, self.status, self.message)
+
+
+class RetryableFetchError(FetchError):
+    """Throttling, server or network error, worth retrying later."""
+
+
+class CircuitOpenError(FetchError):
+    """The host's circuit is open, ``retry_after`` seconds until it accepts a probe."""
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(url, message=f"circuit open for another {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return type(self), (self.url, self.retry_after)
+
+
+def status_class(status: Optional[int]) -> str:
+    """Circuit of a failed response: ``network``, ``429`` or e.g. ``5xx``."""
+    if status is None:
+        return "network"
+    return "429" if status == 429 else f"{status // 100}xx"
+
+
+class RetryBudget:
+    """Allows a retry while retries stay below ``min_retries`` plus ``ratio`` of all requests."""
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10):
+        self._ratio = ratio
+        self._min_retries = min_retries
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_retry(self) -> bool:
+        """Takes a retry from the budget, False if it is exhausted."""
+        with self._lock:
+            if self.retries >= self._min_retries + self._ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
+
+
+class CircuitBreaker:
+    """Circuit per host and status class.
+
+    A circuit opens after ``failure_threshold`` consecutive failures of its class. While
+    any circuit of a host is open its requests are rejected; after ``reset_timeout``
+    seconds one probe request is let through, which closes the host's circuits when it
+    succeeds and reopens them when it fails.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, clock: Callable[[], float] = time.monotonic):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: Dict[Tuple[str, str], int] = {}
+        self._opened_at: Dict[Tuple[str, str], float] = {}
+        self._probing: Dict[str, bool] = {}
+
+    def check(self, url: str) -> None:
+        """Raises ``CircuitOpenError`` if a request to the host of ``url`` must not be sent."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened = [opened_at for (circuit_host, _), opened_at in self._opened_at.items() if circuit_host == host]
+            if not opened:
+                return
+            retry_after = max(opened) + self._reset_timeout - self._clock()
+            if retry_after > 0 or self._probing.get(host):
+                raise CircuitOpenError(url, max(retry_after, 1.0))
+            self._probing[host] = True
+
+    def record_success(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            for key in [key for key in self._failures if key[0] == host]:
+                del self._failures[key]
+            for key in [key for key in self._opened_at if key[0] == host]:
+                del self._opened_at[key]
+            self._probing.pop(host, None)
+
+    def record_failure(self, url: str, status: Optional[int]) -> None:
+        host = urlsplit(url).netloc
+        key = (host, status_class(status))
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._probing.pop(host, False) or self._failures[key] >= self._failure_threshold:
+                self._opened_at[key] = self._clock()
+
+
+def get(
+    url: str,
+    breaker: CircuitBreaker,
+    budget: RetryBudget,
+    timeout: float = 30,
+    session: Optional[requests.Session] = None,
+    method: str = "GET",
+    **kwargs: Any,
+) -> str:
+    """Fetches ``url`` once and returns its text.
+
+    ``kwargs`` are passed on to ``requests``, e.g. ``json`` and ``headers`` of a POST.
+
+    Raises:
+        CircuitOpenError: The host's circuit is open, nothing was sent.
+        RetryableFetchError: Throttled, server or network error.
+        FetchError: Any other non-200 response.
+    """
+    breaker.check(url)
+    budget.record_request()
+    try:
+        response = (session or requests).request(method, url, timeout=timeout, **kwargs)
+    except requests.exceptions.RequestException as e:
+        breaker.record_failure(url, None)
+        raise RetryableFetchError(url, message=str(e)) from e
+
+    if response.status_code == 429 or response.status_code >= 500:
+        breaker.record_failure(url, response.status_code)
+        raise RetryableFetchError(url, response.status_code)
+    # any other answer shows the host is up
+    breaker.record_success(url)
+    if response.status_code != 200:
+        raise FetchError(url, response.status_code)
+    return response.text
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of ``url``, used as the key for coalescing and caching."""
+    parts = urlsplit(url)
+    query = sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in CACHE_BUSTING_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", urlencode(query), ""))
+
+
+class CoalescingFetcher:
+    """Deduplicates fetches of the same normalised URL within a process.
+
+    The first caller of a URL runs ``fetch``; callers arriving while it is in flight wait
+    for and share its result, including its exception. With a ``ttl`` successful results
+    are also cached for that many seconds, up to ``max_bytes`` of page text; expired
+    pages are dropped whenever one is added. ``stats`` counts ``fetches``, ``coalesced``
+    and ``cache_hits``.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], str],
+        ttl: float = 0,
+        max_bytes: int = 8 * 2**20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._cache_bytes = 0
+        self.stats = Counter()
+
+    def fetch(self, url: str) -> str:
+        key = normalize_url(url)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and self._clock() - cached[0] < self._ttl:
+                self.stats["cache_hits"] += 1
+                return cached[1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.stats["fetches"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            text = self._fetch(url)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if self._ttl > 0:
+                self._add_to_cache(key, text)
+        future.set_result(text)
+        return text
+
+    def _add_to_cache(self, key: str, text: str) -> None:
+        """Caches ``text`` and evicts expired, then oldest, pages beyond ``max_bytes``. Holds the lock."""
+        now = self._clock()
+        if key in self._cache:
+            self._cache_bytes -= len(self._cache.pop(key)[1])
+        if len(text) > self._max_bytes:
+            return
+        self._cache[key] = (now, text)
+        self._cache_bytes += len(text)
+        # entries are in insertion order, so the expired ones come first
+        while self._cache:
+            stored_at, oldest = next(iter(self._cache.values()))
+            if now - stored_at < self._ttl and self._cache_bytes <= self._max_bytes:
+                break
+            self._cache.popitem(last=False)
+            self._cache_bytes -= len(oldest)
+
+    def configure(self, ttl: float, max_bytes: int) -> None:
+        """Changes ``ttl`` and ``max_bytes``, dropping the pages cached so far."""
+        with self._lock:
+            self._ttl = ttl
+            self._max_bytes = max_bytes
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def clear(self) -> None:
+        """Drops all cached responses."""
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
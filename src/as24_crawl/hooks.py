@@ -0,0 +1,80 @@
+"""Project hooks."""
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from kedro.framework.context import KedroContext
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline.node import Node
+
+from as24_crawl.profiling import RunProfiler, enabled_by_env
+
+
+class _RunState:
+    """State of the active run, set by ``RunParametersHooks``."""
+
+    parameters: Optional[Dict[str, Any]] = None
+
+
+_run_state = _RunState()
+
+
+def run_parameters() -> Optional[Dict[str, Any]]:
+    """Parameters of the active Kedro context, None before one was created.
+
+    They include the ``--env`` configuration and ``--params`` overrides of the run.
+    """
+    return _run_state.parameters
+
+
+class RunParametersHooks:
+    """Exposes the parameters of the run to pipeline factories through ``run_parameters``.
+
+    Kedro creates the context before it builds the pipelines, but does not pass it to
+    ``register_pipelines``.
+    """
+
+    @hook_impl
+    def after_context_created(self, context: KedroContext) -> None:
+        _run_state.parameters = context.params
+
+
+class ProfilingHooks:
+    """Profiles a run with ``kedro run --params profile=true`` or ``AS24_PROFILE=1``.
+
+    See ``as24_crawl.profiling`` for what is recorded. Nodes run by the
+    ``ParallelRunner`` execute in its own processes and are not covered.
+    """
+
+    def __init__(self, output_dir: str = "data/08_reporting/profiles"):
+        self._output_dir = Path(output_dir)
+        self._profiler: Optional[RunProfiler] = None
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any]) -> None:
+        extra_params = run_params.get("extra_params") or {}
+        if extra_params.get("profile") or enabled_by_env():
+            self._profiler = RunProfiler(self._output_dir)
+            self._profiler.start()
+
+    @hook_impl
+    def before_node_run(self, node: Node) -> None:
+        if self._profiler:
+            self._profiler.node_started(node.name)
+
+    @hook_impl
+    def after_node_run(self, node: Node) -> None:
+        if self._profiler:
+            self._profiler.node_finished(node.name)
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        self._stop()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        self._stop()
+
+    def _stop(self) -> None:
+        if self._profiler:
+            self._profiler.stop()
+            self._profiler = None
@@ -4,6 +4,9 @@ from typing import Dict
 from kedro.framework.project import find_pipelines
 from kedro.pipeline import Pipeline
 
+# Pipelines only run on request, e.g. ``kedro run --pipeline multi_source``
+EXCLUDED_FROM_DEFAULT = {"multi_source"}
+
 
 def register_pipelines() -> Dict[str, Pipeline]:
     """Register the project's pipelines.
@@ -12,5 +15,5 @@ def register_pipelines() -> Dict[str, Pipeline]:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
-    pipelines["__default__"] = sum(pipelines.values())
+    pipelines["__default__"] = sum(pipeline for name, pipeline in pipelines.items() if name not in EXCLUDED_FROM_DEFAULT)
     return pipelines
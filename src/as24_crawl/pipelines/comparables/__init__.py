@@ -0,0 +1,3 @@
+"""Comparable listings index and deal scores"""
+
+from .pipeline import create_pipeline  # NOQA
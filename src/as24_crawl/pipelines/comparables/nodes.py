@@ -0,0 +1,189 @@
+"""k-nearest-neighbour index of comparable listings per brand/model.
+
+Listings are compared on mileage, registration date and engine power (standardised
+per segment) plus one-hot fuel type and transmission. A listing's price residual is
+its price relative to the median price of its comparables; the residual percentile
+ranks that against the rest of its segment, so a low percentile marks a cheap car.
+"""
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import NearestNeighbors
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FEATURES = ["mileage", "registration_month", "engine_power"]
+CATEGORICAL_FEATURES = ["fuel_type", "transmission"]
+REQUIRED_COLUMNS = ["price", "mileage", "first_registration", "engine_power", *CATEGORICAL_FEATURES]
+LISTING_COLUMNS = ["url", "country", *REQUIRED_COLUMNS]
+# parameters/comparables.yml entries a segment index depends on
+INDEX_PARAMETERS = ["n_neighbors", "categorical_weight", "min_listings"]
+
+
+def _segment_key(brand: str, model: str) -> str:
+    return f"{brand}/{model}"
+
+
+def _prepare_listings(data: pd.DataFrame) -> pd.DataFrame:
+    """Keeps complete listings with numpy dtypes and adds ``registration_month``."""
+    listings = data[["brand", "model", *LISTING_COLUMNS]].dropna(subset=REQUIRED_COLUMNS)
+    first_registration = pd.to_datetime(listings["first_registration"])
+    return listings.assign(
+        price=listings["price"].astype("float64"),
+        mileage=listings["mileage"].astype("float64"),
+        engine_power=listings["engine_power"].astype("float64"),
+        registration_month=(first_registration.dt.year * 12 + first_registration.dt.month).astype("float64"),
+        fuel_type=listings["fuel_type"].astype(str),
+        transmission=listings["transmission"].astype(str),
+    ).drop_duplicates("url", keep="last")
+
+
+def _feature_matrix(listings: pd.DataFrame, segment: Dict[str, Any]) -> np.ndarray:
+    numeric = (listings[NUMERIC_FEATURES].to_numpy() - segment["center"]) / segment["scale"]
+    one_hot = [
+        (listings[column].to_numpy()[:, None] == np.asarray(categories)[None, :]) * segment["categorical_weight"]
+        for column, categories in segment["categories"].items()
+    ]
+    return np.hstack([numeric, *one_hot])
+
+
+def _fingerprint(listings: pd.DataFrame, parameters: Dict) -> int:
+    """Changes with the listings of a segment and with the parameters its index is built with."""
+    data_hash = int(pd.util.hash_pandas_object(listings[LISTING_COLUMNS], index=False).sum())
+    key = repr((data_hash, [parameters[name] for name in INDEX_PARAMETERS]))
+    return int(hashlib.sha1(key.encode()).hexdigest()[:15], 16)
+
+
+def build_segment_index(listings: pd.DataFrame, parameters: Dict) -> Dict[str, Any]:
+    """Fits the neighbour index of one brand/model segment.
+
+    Args:
+        listings: Prepared listings of the segment.
+        parameters: Parameters defined in parameters/comparables.yml.
+    Returns:
+        The segment index: listings, feature scaling, fitted ``NearestNeighbors`` and
+        the comparable median price and residual of every listing.
+    """
+    listings = listings.reset_index(drop=True)
+    scale = listings[NUMERIC_FEATURES].std(ddof=0).to_numpy()
+    segment = {
+        "fingerprint": _fingerprint(listings, parameters),
+        "center": listings[NUMERIC_FEATURES].mean().to_numpy(),
+        "scale": np.where(scale > 0, scale, 1.0),
+        "categories": {column: sorted(listings[column].unique()) for column in CATEGORICAL_FEATURES},
+        "categorical_weight": parameters["categorical_weight"],
+    }
+    X = _feature_matrix(listings, segment)
+    n_neighbors = min(parameters["n_neighbors"] + 1, len(listings))
+    neighbors = NearestNeighbors(n_neighbors=n_neighbors).fit(X)
+
+    # every listing is among its own neighbours, but identical listings can come in any
+    # order, so it is removed by index; with more identical listings than neighbours it
+    # may not be returned at all, and the farthest neighbour is dropped instead
+    _, indices = neighbors.kneighbors(X)
+    own = indices == np.arange(len(listings))[:, None]
+    own[~own.any(axis=1), -1] = True
+    comparables = indices[~own].reshape(len(listings), n_neighbors - 1)
+    prices = listings["price"].to_numpy()
+    comparable_median = np.median(prices[comparables], axis=1)
+    residual = prices / comparable_median - 1
+
+    return {
+        **segment,
+        "listings": listings,
+        "neighbors": neighbors,
+        "comparable_median_price": comparable_median,
+        "price_residual": residual,
+        "sorted_residuals": np.sort(residual),
+    }
+
+
+def update_comparables_index(
+    cleaned_results: pd.DataFrame, comparables_index: Optional[Dict[str, Dict]], parameters: Dict
+) -> Dict[str, Dict]:
+    """Builds the comparables index, refitting only segments whose listings or index
+    parameters changed.
+
+    Args:
+        cleaned_results: Cleaned listings.
+        comparables_index: Index of the previous run, empty on the first run.
+        parameters: Parameters defined in parameters/comparables.yml.
+    Returns:
+        Mapping of ``brand/model`` to segment index.
+    """
+    comparables_index = comparables_index or {}
+    updated, refitted = {}, 0
+    for (brand, model), listings in _prepare_listings(cleaned_results).groupby(["brand", "model"]):
+        if len(listings) < parameters["min_listings"]:
+            continue
+        key = _segment_key(brand, model)
+        previous = comparables_index.get(key)
+        if previous is not None and previous["fingerprint"] == _fingerprint(listings.reset_index(drop=True), parameters):
+            updated[key] = previous
+        else:
+            updated[key] = build_segment_index(listings, parameters)
+            refitted += 1
+    logger.info(f"Refitted {refitted} of {len(updated)} comparables segments.")
+    return updated
+
+
+def score_listings(comparables_index: Dict[str, Dict]) -> pd.DataFrame:
+    """Price residual and residual percentile of every indexed listing.
+
+    Returns:
+        One row per listing, cheapest relative to its comparables first.
+    """
+    scores = []
+    for key, segment in comparables_index.items():
+        residual = segment["price_residual"]
+        ranks = np.searchsorted(segment["sorted_residuals"], residual, side="right")
+        brand, model = key.split("/", 1)
+        scores.append(
+            segment["listings"][["url", "country", "price"]].assign(
+                brand=brand,
+                model=model,
+                comparable_median_price=segment["comparable_median_price"],
+                price_residual=residual,
+                residual_percentile=ranks / len(residual),
+            )
+        )
+    if not scores:
+        return pd.DataFrame()
+    return pd.concat(scores, ignore_index=True).sort_values("price_residual", ignore_index=True)
+
+
+def find_comparables(comparables_index: Dict[str, Dict], listing: Dict[str, Any], k: Optional[int] = None) -> Dict[str, Any]:
+    """Comparable listings and price-residual percentile of a single cleaned listing.
+
+    Args:
+        comparables_index: Output of ``update_comparables_index``.
+        listing: Cleaned listing with brand, model, price and the feature columns.
+        k: Number of comparables, defaults to the number the index was built with. An
+            indexed listing with the same ``url`` is not its own comparable.
+    Returns:
+        ``comparables`` (DataFrame with distances), ``comparable_median_price``,
+        ``price_residual`` and ``residual_percentile``.
+    """
+    segment = comparables_index[_segment_key(listing["brand"], listing["model"])]
+    prepared = _prepare_listings(pd.DataFrame([{"url": "", "country": "", **listing}]))
+    indexed = segment["listings"]
+    # the index was built with one extra neighbour for the listing itself
+    k = k or segment["neighbors"].n_neighbors - 1
+    distances, indices = segment["neighbors"].kneighbors(
+        _feature_matrix(prepared, segment), n_neighbors=min(k + 1, len(indexed))
+    )
+
+    comparables = indexed.iloc[indices[0]].assign(distance=distances[0])
+    comparables = comparables[comparables["url"] != prepared["url"].iloc[0]].head(k)
+    comparable_median = float(comparables["price"].median())
+    residual = float(prepared["price"].iloc[0]) / comparable_median - 1
+    rank = np.searchsorted(segment["sorted_residuals"], residual, side="right")
+    return {
+        "comparables": comparables.reset_index(drop=True),
+        "comparable_median_price": comparable_median,
+        "price_residual": residual,
+        "residual_percentile": rank / len(segment["sorted_residuals"]),
+    }
@@ -0,0 +1,22 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import score_listings, update_comparables_index
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=update_comparables_index,
+                inputs=["cleaned_results", "comparables_index_previous", "params:comparables"],
+                outputs="comparables_index",
+                name="update_comparables_index_node",
+            ),
+            node(
+                func=score_listings,
+                inputs="comparables_index",
+                outputs="deal_scores",
+                name="score_listings_node",
+            ),
+        ]
+    )
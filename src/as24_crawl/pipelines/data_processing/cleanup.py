@@ -12,11 +12,8 @@ def clean_data(crawling_data: pd.DataFrame) -> pd.DataFrame:
         pandas.DataFrame: The cleaned DataFrame.
     """
 
-    crawling_data['price'] = crawling_data['price'].apply(process_price)
-    crawling_data['mileage'] = crawling_data['mileage'].apply(process_mileage)
-    crawling_data['first_registration'] = crawling_data['first_registration'].apply(process_first_registration)
-    crawling_data['engine_power'] = crawling_data['engine_power'].apply(process_engine_power)
-    crawling_data['co2_emission'] = crawling_data['co2_emission'].apply(process_co2_emission)
+    for column, process in COLUMN_PROCESSORS.items():
+        crawling_data[column] = crawling_data[column].apply(process)
 
     return crawling_data
 
@@ -103,3 +100,13 @@ def process_co2_emission(co2_emission):
         except ValueError:
             return None
     return None
+
+
+# Raw column -> function applied by clean_data, shared with the prediction service
+COLUMN_PROCESSORS = {
+    'price': process_price,
+    'mileage': process_mileage,
+    'first_registration': process_first_registration,
+    'engine_power': process_engine_power,
+    'co2_emission': process_co2_emission,
+}
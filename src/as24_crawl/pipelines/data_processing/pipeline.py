@@ -1,18 +1,113 @@
+import hashlib
+import os
+import re
+from collections import defaultdict
+from functools import partial, update_wrapper
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from kedro.config import OmegaConfigLoader
+from kedro.framework.project import settings
 from kedro.pipeline import Pipeline, node, pipeline
 
+from as24_crawl.hooks import run_parameters
+
 from .cleanup import clean_data
 
-from .crawl_nodes import crawl_node
+from .crawl_nodes import concat_partitions, crawl_segment
+
+CRAWL_PARAMETERS = {"params:base_url", "params:year_range", "params:url_params", "params:crawl"}
+
+
+def segment_namespace(country: str, brand_model: str) -> str:
+    """
+    Namespace of the crawl pipeline for one segment, e.g. ``crawl.NL.ford_fiesta``.
+
+    Allows ``kedro run --namespace crawl.NL`` to restrict a run to one country.
+    """
+    return f"crawl.{country}.{re.sub(r'[^0-9a-zA-Z]+', '_', brand_model).strip('_')}"
 
 
-def create_pipeline(**kwargs) -> Pipeline:
+def segment_namespaces(segments: List[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+    """
+    ``segment_namespace`` of every segment, with a short hash of the brand_model appended
+    where several brand_models sanitise to the same name, e.g. ``1er-(alle)`` and ``1er_alle``.
+    """
+    by_namespace = defaultdict(list)
+    for country, brand_model in segments:
+        by_namespace[segment_namespace(country, brand_model)].append((country, brand_model))
+
+    namespaces = {}
+    for namespace, colliding in by_namespace.items():
+        for country, brand_model in colliding:
+            suffix = f"_{hashlib.sha1(brand_model.encode()).hexdigest()[:6]}" if len(colliding) > 1 else ""
+            namespaces[(country, brand_model)] = namespace + suffix
+    return namespaces
+
+
+def _load_crawl_parameters() -> Dict:
+    """
+    Reads the crawl grid from the parameters of the run.
+
+    ``create_pipeline`` is not passed a context, so the parameters come from
+    ``RunParametersHooks``, including ``kedro run --env`` and ``--params``. Without a
+    context (e.g. ``find_pipelines`` outside a session) the config is loaded directly
+    from the ``KEDRO_ENV`` environment, without any ``--params`` overrides.
+    """
+    parameters = run_parameters()
+    if parameters is not None:
+        return parameters
+
+    conf_source = Path.cwd() / settings.CONF_SOURCE
+    if not conf_source.is_dir():
+        return {}
+    config_loader = OmegaConfigLoader(
+        conf_source=str(conf_source),
+        base_env="base",
+        default_run_env=os.getenv("KEDRO_ENV", "local"),
+    )
+    return config_loader["parameters"]
+
+
+def create_segment_pipeline(country: str, brand_model: str, namespace: Optional[str] = None) -> Pipeline:
+    """
+    Modular pipeline crawling one country / brand_model segment into its own partition.
+    """
+    segment_crawl = update_wrapper(partial(crawl_segment, country=country, brand_model=brand_model), crawl_segment)
     return pipeline(
         [
             node(
-                func=crawl_node,
-                inputs=["params:base_url", "params:year_range", "params:url_params", "params:countries", "params:brand_model"],
+                func=segment_crawl,
+                inputs=["params:base_url", "params:year_range", "params:url_params", "params:crawl"],
+                outputs="crawling_partition",
+                name="crawl_segment",
+            )
+        ],
+        namespace=namespace or segment_namespace(country, brand_model),
+        parameters=CRAWL_PARAMETERS,
+    )
+
+
+def create_pipeline(countries: Optional[List[str]] = None, brand_model: Optional[List[str]] = None, **kwargs) -> Pipeline:
+    if countries is None or brand_model is None:
+        parameters = _load_crawl_parameters()
+        countries = parameters.get("countries", []) if countries is None else countries
+        brand_model = parameters.get("brand_model", []) if brand_model is None else brand_model
+
+    segments = list(dict.fromkeys((country, bm) for country in countries for bm in brand_model))
+    namespaces = segment_namespaces(segments)
+    crawl_pipeline = sum(
+        (create_segment_pipeline(country, bm, namespaces[(country, bm)]) for country, bm in segments),
+        start=Pipeline([]),
+    )
+
+    return crawl_pipeline + pipeline(
+        [
+            node(
+                func=concat_partitions,
+                inputs=[f"{namespaces[segment]}.crawling_partition" for segment in segments],
                 outputs="crawling_results",
-                name="crawl_node",
+                name="concat_partitions",
             ),
             node(
                 func=clean_data,
@@ -1,3 +1,3 @@
-"""Complete Data Science pipeline for the spaceflights tutorial"""
+"""Price model trained on the cleaned listings"""
 
-# from .pipeline import create_pipeline  # NOQA
+from .pipeline import create_pipeline  # NOQA
@@ -0,0 +1,76 @@
+import logging
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COEFFICIENTS = ["intercept", "age", "mileage_10k"]
+
+
+def _design_matrix(data: pd.DataFrame, reference_date: pd.Timestamp) -> np.ndarray:
+    first_registration = pd.to_datetime(data["first_registration"]).astype("datetime64[ns]")
+    age = (reference_date - first_registration).dt.days.to_numpy() / 365.25
+    return np.column_stack([np.ones(len(data)), age, data["mileage"].to_numpy(dtype="float64") / 10_000])
+
+
+def fit_depreciation_curves(cleaned_results: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Fits ``log(price) = intercept + age * b_age + mileage / 10k * b_mileage`` per segment.
+
+    All segments are solved at once: the normal equations ``X'X b = X'y`` of every segment
+    are accumulated with one ``np.bincount`` per matrix entry and solved as a single
+    batched ``np.linalg.solve``, so the cost is linear in the number of listings and
+    independent of the number of segments.
+
+    Args:
+        cleaned_results: Cleaned listings.
+        parameters: Parameters defined in parameters/data_science.yml.
+    Returns:
+        One row per segment with its coefficients, the implied yearly and per 10k km
+        depreciation rates, and the fit's R^2 and RMSE (in log price).
+    """
+    keys = parameters["segment_keys"]
+    reference_date = pd.Timestamp(parameters.get("reference_date") or pd.Timestamp.now().normalize())
+
+    data = cleaned_results[[*keys, "price", "mileage", "first_registration"]].dropna()
+    data = data[data["price"].astype("float64") > 0]
+    segment = data.groupby(keys, sort=True).ngroup().to_numpy()
+    counts = np.bincount(segment)
+    keep = counts[segment] >= parameters["min_listings"]
+    data, segment = data[keep], np.unique(segment[keep], return_inverse=True)[1]
+
+    X = _design_matrix(data, reference_date)
+    y = np.log(data["price"].to_numpy(dtype="float64"))
+    n_segments = int(segment.max()) + 1 if len(segment) else 0
+    n_coefficients = X.shape[1]
+
+    XtX = np.empty((n_segments, n_coefficients, n_coefficients))
+    Xty = np.empty((n_segments, n_coefficients))
+    for i in range(n_coefficients):
+        Xty[:, i] = np.bincount(segment, weights=X[:, i] * y, minlength=n_segments)
+        for j in range(i, n_coefficients):
+            XtX[:, i, j] = XtX[:, j, i] = np.bincount(segment, weights=X[:, i] * X[:, j], minlength=n_segments)
+
+    # a small ridge on the slopes keeps segments with a single age or mileage solvable
+    ridge = np.diag([0.0] + [parameters["ridge"]] * (n_coefficients - 1))
+    beta = np.linalg.solve(XtX + ridge, Xty[..., None])[..., 0]
+
+    residuals = y - np.einsum("ij,ij->i", X, beta[segment])
+    n = np.bincount(segment, minlength=n_segments)
+    sse = np.bincount(segment, weights=residuals**2, minlength=n_segments)
+    y_mean = np.bincount(segment, weights=y, minlength=n_segments) / n
+    sst = np.bincount(segment, weights=(y - y_mean[segment]) ** 2, minlength=n_segments)
+
+    first_rows = np.unique(segment, return_index=True)[1]
+    curves = data.iloc[first_rows][keys].reset_index(drop=True)
+    curves["n_listings"] = n
+    for k, name in enumerate(COEFFICIENTS):
+        curves[name] = beta[:, k]
+    curves["yearly_depreciation"] = 1 - np.exp(beta[:, 1])
+    curves["depreciation_per_10k_km"] = 1 - np.exp(beta[:, 2])
+    curves["r2"] = 1 - sse / np.where(sst > 0, sst, np.nan)
+    curves["rmse_log_price"] = np.sqrt(sse / n)
+
+    logger.info(f"Fitted depreciation curves for {n_segments} segments on {len(data)} listings.")
+    return curves
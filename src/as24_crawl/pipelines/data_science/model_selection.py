@@ -0,0 +1,118 @@
+"""Cross-validated comparison of candidate regressors and feature sets.
+
+The design matrix of every feature set, the target and the fold assignment are built
+once and dumped with joblib; every (candidate, feature set, fold) job then runs in its
+own process and memory-maps them read-only instead of receiving a copy.
+"""
+import importlib
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, dump, load
+from sklearn.compose import TransformedTargetRegressor
+from sklearn.model_selection import GroupKFold, KFold
+
+from .nodes import prepare_features
+
+logger = logging.getLogger(__name__)
+
+METRICS = ["r2", "mae", "rmse", "fit_seconds"]
+
+
+def design_matrix(data: pd.DataFrame, features: List[str]) -> np.ndarray:
+    """Numeric features as is, string features one-hot encoded, as one float32 matrix."""
+    X = prepare_features(data, features)
+    categorical = [column for column in features if X[column].dtype == object]
+    return pd.get_dummies(X, columns=categorical, dtype="float32").to_numpy(dtype="float32")
+
+
+def assign_folds(data: pd.DataFrame, parameters: Dict) -> np.ndarray:
+    """Fold number of every row, with all rows of a ``group_by`` value in the same fold."""
+    folds = np.empty(len(data), dtype="int8")
+    if parameters.get("group_by"):
+        splits = GroupKFold(n_splits=parameters["n_splits"]).split(data, groups=data[parameters["group_by"]])
+    else:
+        splits = KFold(n_splits=parameters["n_splits"], shuffle=True, random_state=parameters["random_state"]).split(data)
+    for fold, (_, test) in enumerate(splits):
+        folds[test] = fold
+    return folds
+
+
+def build_estimator(candidate: Dict[str, Any]) -> Any:
+    """Instantiates ``candidate["class"]`` with ``kwargs``, on a log scale target if ``log_target``."""
+    module, _, name = candidate["class"].rpartition(".")
+    estimator = getattr(importlib.import_module(module), name)(**candidate.get("kwargs", {}))
+    if candidate.get("log_target"):
+        estimator = TransformedTargetRegressor(regressor=estimator, func=np.log1p, inverse_func=np.expm1)
+    return estimator
+
+
+def score_fold(X_path: str, y_path: str, folds_path: str, fold: int, candidate: Dict[str, Any]) -> Dict[str, float]:
+    """Fits ``candidate`` on all other folds and scores it on ``fold``. Runs in the pool workers."""
+    X, y, folds = (load(path, mmap_mode="r") for path in (X_path, y_path, folds_path))
+    train, test = folds != fold, folds == fold
+
+    estimator = build_estimator(candidate)
+    start = time.perf_counter()
+    estimator.fit(X[train], y[train])
+    fit_seconds = time.perf_counter() - start
+
+    residuals = y[test] - estimator.predict(X[test])
+    return {
+        "r2": 1 - np.sum(residuals**2) / np.sum((y[test] - y[test].mean()) ** 2),
+        "mae": np.mean(np.abs(residuals)),
+        "rmse": np.sqrt(np.mean(residuals**2)),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def select_model(model_input_table: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Cross-validates every candidate regressor on every feature set.
+
+    Args:
+        model_input_table: Features and price of every listing.
+        parameters: Parameters defined in parameters/data_science.yml.
+    Returns:
+        Mean and standard deviation of the fold metrics per candidate and feature
+        set, best (lowest mean absolute error) first.
+    """
+    candidates, feature_sets = parameters["candidates"], parameters["feature_sets"]
+    n_splits = parameters["n_splits"]
+    cache_dir = parameters.get("cache_dir")
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as tmp_dir:
+        paths = {"y": str(Path(tmp_dir) / "y.joblib"), "folds": str(Path(tmp_dir) / "folds.joblib")}
+        dump(model_input_table["price"].to_numpy(dtype="float64"), paths["y"])
+        dump(assign_folds(model_input_table, parameters), paths["folds"])
+        for name, features in feature_sets.items():
+            paths[name] = str(Path(tmp_dir) / f"X_{name}.joblib")
+            dump(design_matrix(model_input_table, features), paths[name])
+
+        jobs = [
+            (candidate, feature_set, fold)
+            for candidate in candidates
+            for feature_set in feature_sets
+            for fold in range(n_splits)
+        ]
+        logger.info(f"Cross-validating {len(candidates)} candidates on {len(feature_sets)} feature sets in {n_splits} folds.")
+        scores = Parallel(n_jobs=parameters.get("n_jobs", -1))(
+            delayed(score_fold)(paths[feature_set], paths["y"], paths["folds"], fold, candidates[candidate])
+            for candidate, feature_set, fold in jobs
+        )
+
+    folds = pd.DataFrame(
+        [{"candidate": candidate, "feature_set": feature_set, "fold": fold, **score} for (candidate, feature_set, fold), score in zip(jobs, scores)]
+    )
+    results = folds.groupby(["candidate", "feature_set"])[METRICS].agg(["mean", "std"])
+    results.columns = [f"{metric}_{statistic}" for metric, statistic in results.columns]
+    results = results.sort_values("mae_mean").reset_index()
+    best = results.iloc[0]
+    logger.info(f"Best model: {best['candidate']} on {best['feature_set']} with a mean absolute error of {best['mae_mean']:.0f}.")
+    return results
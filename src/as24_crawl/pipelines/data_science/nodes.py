@@ -1,10 +1,51 @@
 import logging
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
+from sklearn.compose import make_column_selector, make_column_transformer
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import max_error, mean_absolute_error, r2_score
 from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+
+def prepare_features(data: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+    """Selects the model features from cleaned listings.
+
+    Derives ``registration_year`` from ``first_registration`` and converts columns to
+    plain numpy dtypes: numeric features to float, everything else to strings.
+
+    Args:
+        data: Cleaned listings, as returned by ``clean_data``.
+        features: Names of the feature columns.
+    Returns:
+        The feature columns.
+    """
+    if "registration_year" in features and "registration_year" not in data:
+        data = data.assign(registration_year=pd.to_datetime(data["first_registration"]).dt.year)
+    X = data[features]
+    return pd.DataFrame(
+        {
+            column: X[column].astype("float64") if pd.api.types.is_numeric_dtype(X[column]) else X[column].astype("object")
+            for column in features
+        },
+        index=X.index,
+    )
+
+
+def create_model_input_table(cleaned_results: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Builds the model input table from cleaned listings.
+
+    Args:
+        cleaned_results: Cleaned listings.
+        parameters: Parameters defined in parameters/data_science.yml.
+    Returns:
+        Features and price of every listing without missing values.
+    """
+    model_input = prepare_features(cleaned_results, parameters["features"])
+    model_input["price"] = cleaned_results["price"].astype("float64")
+    return model_input.dropna().reset_index(drop=True)
 
 
 def split_data(data: pd.DataFrame, parameters: Dict) -> Tuple:
@@ -24,9 +65,12 @@ def split_data(data: pd.DataFrame, parameters: Dict) -> Tuple:
     return X_train, X_test, y_train, y_test
 
 
-def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> LinearRegression:
+def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> Pipeline:
     """Trains the linear regression model.
 
+    String columns are one-hot encoded, categories not seen during training are
+    ignored at prediction time.
+
     Args:
         X_train: Training data of independent features.
         y_train: Training data for price.
@@ -34,13 +78,19 @@ def train_model(X_train: pd.DataFrame, y_train: pd.Series) -> LinearRegression:
     Returns:
         Trained model.
     """
-    regressor = LinearRegression()
+    regressor = make_pipeline(
+        make_column_transformer(
+            (OneHotEncoder(handle_unknown="ignore"), make_column_selector(dtype_include=object)),
+            remainder="passthrough",
+        ),
+        LinearRegression(),
+    )
     regressor.fit(X_train, y_train)
     return regressor
 
 
 def evaluate_model(
-    regressor: LinearRegression, X_test: pd.DataFrame, y_test: pd.Series
+    regressor: Pipeline, X_test: pd.DataFrame, y_test: pd.Series
 ) -> Dict[str, float]:
     """Calculates and logs the coefficient of determination.
 
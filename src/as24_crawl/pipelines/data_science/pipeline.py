@@ -1,28 +1,48 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import evaluate_model, split_data, train_model
+from .depreciation import fit_depreciation_curves
+from .model_selection import select_model
+from .nodes import create_model_input_table, evaluate_model, split_data, train_model
 
 
-# def create_pipeline(**kwargs) -> Pipeline:
-#     return pipeline(
-#         [
-#             node(
-#                 func=split_data,
-#                 inputs=["model_input_table", "params:model_options"],
-#                 outputs=["X_train", "X_test", "y_train", "y_test"],
-#                 name="split_data_node",
-#             ),
-#             node(
-#                 func=train_model,
-#                 inputs=["X_train", "y_train"],
-#                 outputs="regressor",
-#                 name="train_model_node",
-#             ),
-#             node(
-#                 func=evaluate_model,
-#                 inputs=["regressor", "X_test", "y_test"],
-#                 name="evaluate_model_node",
-#                 outputs="metrics",
-#             ),
-#         ]
-#     )
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=create_model_input_table,
+                inputs=["cleaned_results", "params:model_options"],
+                outputs="model_input_table",
+                name="create_model_input_table_node",
+            ),
+            node(
+                func=split_data,
+                inputs=["model_input_table", "params:model_options"],
+                outputs=["X_train", "X_test", "y_train", "y_test"],
+                name="split_data_node",
+            ),
+            node(
+                func=train_model,
+                inputs=["X_train", "y_train"],
+                outputs="regressor",
+                name="train_model_node",
+            ),
+            node(
+                func=evaluate_model,
+                inputs=["regressor", "X_test", "y_test"],
+                name="evaluate_model_node",
+                outputs="metrics",
+            ),
+            node(
+                func=select_model,
+                inputs=["model_input_table", "params:model_selection"],
+                outputs="model_selection_results",
+                name="select_model_node",
+            ),
+            node(
+                func=fit_depreciation_curves,
+                inputs=["cleaned_results", "params:depreciation"],
+                outputs="depreciation_curves",
+                name="fit_depreciation_curves_node",
+            ),
+        ]
+    )
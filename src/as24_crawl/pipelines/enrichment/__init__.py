@@ -0,0 +1,3 @@
+"""Detail page enrichment of crawled listings"""
+
+from .pipeline import create_pipeline  # NOQA
@@ -0,0 +1,137 @@
+"""Detail page enrichment of crawled listings.
+
+The result pages only show a summary of each ad; equipment, location, seller type and
+accident history are on its detail page. Detail pages are only fetched for ads that are
+new or whose summary row changed since the previous run, everything else is carried
+over from ``listing_details_previous``; ads missing from the current crawl are dropped. New ads are fetched before changed ones and the
+number of requests per run is capped, ads over the budget are picked up by the next run.
+"""
+import heapq
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from as24_crawl.scraping import DETAIL_FIELDS, fetch_page, parse_detail_page
+
+logger = logging.getLogger(__name__)
+
+# Fields of the result page row, a change in any of them triggers a new detail fetch
+SUMMARY_COLUMNS = [
+    "price",
+    "mileage",
+    "first_registration",
+    "subtitle",
+    "engine_power",
+    "fuel_type",
+    "transmission",
+    "vat_deductible",
+]
+PAGE_FIELDS = ["location", *DETAIL_FIELDS.values(), "equipment"]
+DETAIL_COLUMNS = ["ad_id", "url", "summary_hash", "enriched_at", *PAGE_FIELDS, "details"]
+
+# Fetch order: new ads first, then ads whose summary changed
+NEW, CHANGED = 0, 1
+
+
+def ad_id(url: str) -> str:
+    """Id of an ad, the last path segment of its URL."""
+    return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+
+
+def summary_hash(listings: pd.DataFrame) -> pd.Series:
+    """Hex hash of the summary fields of every listing, ignoring the raw ``html``."""
+    columns = [column for column in SUMMARY_COLUMNS if column in listings]
+    return pd.util.hash_pandas_object(listings[columns].astype(str), index=False).map("{:016x}".format)
+
+
+def select_for_enrichment(listings: pd.DataFrame, previous: pd.DataFrame) -> List[Tuple[int, int, str, str]]:
+    """Priority queue of the listings whose detail page needs to be (re)fetched.
+
+    Args:
+        listings: Current listings with ``ad_id``, ``url`` and ``summary_hash``.
+        previous: Details of the previous run.
+    Returns:
+        A heap of ``(priority, position, ad_id, url)``.
+    """
+    known = dict(zip(previous["ad_id"], previous["summary_hash"])) if not previous.empty else {}
+    queue = []
+    for position, (listing_id, url, hash_) in enumerate(listings[["ad_id", "url", "summary_hash"]].itertuples(index=False)):
+        if listing_id not in known:
+            queue.append((NEW, position, listing_id, url))
+        elif known[listing_id] != hash_:
+            queue.append((CHANGED, position, listing_id, url))
+    heapq.heapify(queue)
+    return queue
+
+
+def fetch_details(queue: List[Tuple[int, int, str, str]], base_url: str, max_concurrency: int, max_requests: int) -> Dict[str, Dict[str, Any]]:
+    """Fetches and parses up to ``max_requests`` detail pages in priority order.
+
+    At most ``max_concurrency`` requests are in flight. Failed pages are logged and
+    skipped, so they are retried by the next run.
+
+    Returns:
+        Parsed details per ad id.
+    """
+    batch = [heapq.heappop(queue) for _ in range(min(max_requests, len(queue)))]
+
+    def fetch(item: Tuple[int, int, str, str]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        _, _, listing_id, url = item
+        try:
+            return listing_id, parse_detail_page(fetch_page(base_url + url))
+        except Exception as e:
+            logger.warning(f"Failed to enrich {url}: {e}")
+            return listing_id, None
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = executor.map(fetch, batch)
+        return {listing_id: details for listing_id, details in results if details is not None}
+
+
+def enrich_listings(crawling_results: pd.DataFrame, listing_details_previous: Optional[pd.DataFrame], parameters: Dict) -> pd.DataFrame:
+    """Updates the detail page data of all crawled listings.
+
+    Args:
+        crawling_results: Raw crawl results.
+        listing_details_previous: Output of the previous run, None on the first run.
+        parameters: Parameters defined in parameters/enrichment.yml.
+    Returns:
+        One row per ad of ``crawling_results`` that has details, with its detail page
+        fields and the summary hash they belong to.
+    """
+    previous = listing_details_previous if listing_details_previous is not None else pd.DataFrame(columns=DETAIL_COLUMNS)
+    listings = crawling_results.dropna(subset=["url"])
+    listings = listings.assign(ad_id=listings["url"].map(ad_id), summary_hash=summary_hash(listings).to_numpy())
+    listings = listings.drop_duplicates("ad_id", keep="last")
+
+    queue = select_for_enrichment(listings, previous)
+    pending = len(queue)
+    fetched = fetch_details(queue, parameters["detail_base_url"], parameters["max_concurrency"], parameters["max_requests_per_run"])
+
+    enriched_at = datetime.now().isoformat(timespec="seconds")
+    current = listings.set_index("ad_id")
+    rows = [
+        {
+            "ad_id": listing_id,
+            "url": current.at[listing_id, "url"],
+            "summary_hash": current.at[listing_id, "summary_hash"],
+            "enriched_at": enriched_at,
+            **{field: details[field] for field in PAGE_FIELDS},
+            "details": json.dumps(details["details"], ensure_ascii=False),
+        }
+        for listing_id, details in fetched.items()
+    ]
+    # ads that were not refetched keep their previous details and summary hash, ads that
+    # are no longer listed are dropped
+    carried = previous[previous["ad_id"].isin(current.index) & ~previous["ad_id"].isin(fetched.keys())]
+    updated = pd.concat([carried, pd.DataFrame(rows, columns=DETAIL_COLUMNS)], ignore_index=True)
+    logger.info(
+        f"Enriched {len(fetched)} of {pending} new or changed listings "
+        f"({len(listings) - pending} unchanged, {len(updated)} listings with details, "
+        f"{(~previous['ad_id'].isin(current.index)).sum()} delisted dropped)."
+    )
+    return updated[DETAIL_COLUMNS]
@@ -0,0 +1,16 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import enrich_listings
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=enrich_listings,
+                inputs=["crawling_results", "listing_details_previous", "params:enrichment"],
+                outputs="listing_details",
+                name="enrich_listings_node",
+            ),
+        ]
+    )
@@ -0,0 +1,3 @@
+"""Crawl of all configured marketplaces in one shared scheduler"""
+
+from .pipeline import create_pipeline  # NOQA
@@ -0,0 +1,39 @@
+import logging
+from typing import Any, Dict
+
+import pandas as pd
+
+from as24_crawl.scraping import build_url_template
+from as24_crawl.sources import RECORD_FIELDS, SOURCES, AutoScout24Source, SourceCrawler
+
+logger = logging.getLogger(__name__)
+
+
+def crawl_sources(parameters: Dict, base_url: str, url_params: Dict[str, Any]) -> pd.DataFrame:
+    """Crawls every source configured under ``sources`` concurrently.
+
+    Args:
+        parameters: Parameters defined in parameters/multi_source.yml.
+        base_url: Search URL of the autoscout24 crawl, see parameters/data_processing.yml.
+        url_params: Query parameters of the autoscout24 crawl.
+    Returns:
+        The records of all sources with the columns of ``RECORD_FIELDS``.
+    """
+    adapters = []
+    for name, options in parameters["sources"].items():
+        if name == AutoScout24Source.name:
+            adapters.append(AutoScout24Source(build_url_template(base_url, url_params), **options))
+        else:
+            adapters.append(SOURCES[name](**options))
+
+    records = pd.DataFrame(SourceCrawler(parameters).run(adapters), columns=RECORD_FIELDS)
+    records["first_registration"] = pd.to_datetime(records["first_registration"], errors="coerce")
+    for column in ["price", "mileage", "engine_power"]:
+        records[column] = pd.to_numeric(records[column], errors="coerce")
+    for source, source_records in records.groupby("source"):
+        # usually a field mapping that does not match the source's responses
+        missing = source_records.columns[source_records.isna().all()].tolist()
+        if missing:
+            logger.warning(f"Records of {source} have no {', '.join(missing)}.")
+    logger.info(f"Crawled {records.groupby('source').size().to_dict()} records per source.")
+    return records
@@ -0,0 +1,16 @@
+from kedro.pipeline import Pipeline, node, pipeline
+
+from .nodes import crawl_sources
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    return pipeline(
+        [
+            node(
+                func=crawl_sources,
+                inputs=["params:multi_source", "params:base_url", "params:url_params"],
+                outputs="multi_source_results",
+                name="crawl_sources_node",
+            ),
+        ]
+    )
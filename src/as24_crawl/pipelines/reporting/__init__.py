@@ -1,4 +1,4 @@
-"""Complete reporting pipeline for the spaceflights tutorial"""
+"""Reports on the cleaned listings"""
 
 from .pipeline import create_pipeline
 
@@ -0,0 +1,72 @@
+import logging
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_KEYS = ["brand", "model", "year", "mileage_band"]
+
+
+def compute_price_arbitrage(cleaned_results: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Ranks price gaps between countries for comparable cars.
+
+    Listings are bucketed by brand, model, registration year and mileage band. One
+    groupby computes count, mean and variance of the price per bucket and country, then
+    every pair of countries within a bucket is compared. The gap between mean prices gets
+    a normal-approximation confidence interval; pairs are ranked by its lower bound, so
+    large gaps backed by few or scattered listings rank below smaller but certain ones.
+
+    Args:
+        cleaned_results: Cleaned listings.
+        parameters: Parameters defined in parameters/reporting.yml.
+    Returns:
+        One row per bucket and (buy_country, sell_country) pair where the car is cheaper
+        in ``buy_country``, best opportunity first.
+    """
+    band = parameters["mileage_band_km"]
+    data = cleaned_results[["brand", "model", "year", "mileage", "price", "country"]].dropna()
+    data = pd.DataFrame(
+        {
+            "brand": data["brand"].astype(str),
+            "model": data["model"].astype(str),
+            "year": data["year"].astype("int64"),
+            "mileage_band": (data["mileage"].astype("int64") // band) * band,
+            "country": data["country"].astype(str),
+            "price": data["price"].astype("float64"),
+        }
+    )
+
+    stats = data.groupby([*SEGMENT_KEYS, "country"], sort=False)["price"].agg(["count", "mean", "var"]).reset_index()
+    stats = stats[stats["count"] >= parameters["min_listings"]]
+
+    pairs = stats.merge(stats, on=SEGMENT_KEYS, suffixes=("_buy", "_sell"))
+    pairs = pairs[pairs["mean_sell"] > pairs["mean_buy"]]
+
+    gap = (pairs["mean_sell"] - pairs["mean_buy"]).to_numpy()
+    standard_error = np.sqrt(pairs["var_buy"] / pairs["count_buy"] + pairs["var_sell"] / pairs["count_sell"]).to_numpy()
+    margin = parameters["confidence_z"] * standard_error
+
+    arbitrage = pd.DataFrame(
+        {
+            **{key: pairs[key].to_numpy() for key in SEGMENT_KEYS},
+            "buy_country": pairs["country_buy"].to_numpy(),
+            "sell_country": pairs["country_sell"].to_numpy(),
+            "buy_mean_price": pairs["mean_buy"].to_numpy(),
+            "sell_mean_price": pairs["mean_sell"].to_numpy(),
+            "buy_listings": pairs["count_buy"].to_numpy(),
+            "sell_listings": pairs["count_sell"].to_numpy(),
+            "price_gap": gap,
+            "price_gap_ci_low": gap - margin,
+            "price_gap_ci_high": gap + margin,
+            "relative_gap": gap / pairs["mean_buy"].to_numpy(),
+        }
+    )
+    arbitrage = arbitrage.sort_values(["price_gap_ci_low", "price_gap"], ascending=False, ignore_index=True)
+    arbitrage["rank"] = np.arange(1, len(arbitrage) + 1)
+
+    logger.info(
+        f"Found {int((arbitrage['price_gap_ci_low'] > 0).sum())} significant price gaps in {len(arbitrage)} country pairs."
+    )
+    return arbitrage
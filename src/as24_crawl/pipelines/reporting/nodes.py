@@ -1,46 +1,153 @@
-import matplotlib.pyplot as plt
+"""Price vs mileage charts for every model and every country.
+
+Listings are aggregated into 2D histograms in the main process; the process pool only
+receives these fixed-size rasters and the binned median lines, so rendering time does
+not depend on the number of listings. Countries are shaded by blending their colours
+weighted by their share of each pixel, the opacity follows the log of the density.
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
 import pandas as pd
-import plotly.express as px  # noqa:  F401
-import plotly.graph_objs as go
-import seaborn as sn
 
+from as24_crawl.profiling import start_worker_profiling
+
+logger = logging.getLogger(__name__)
+
+# Colours of the countries, in the order they appear in the data
+COUNTRY_COLOURS = ["#440154", "#21918c", "#fde725", "#e6550d", "#3182bd", "#31a354"]
+
+
+def _aggregate(data: pd.DataFrame, countries: List[str], parameters: Dict) -> Dict[str, Any]:
+    """Density raster per country and median price per mileage bin."""
+    x_bins, y_bins = parameters["bins"]
+    extent = [0, parameters["max_mileage"], 0, parameters["max_price"]]
+    codes = pd.Categorical(data["country"], categories=countries).codes
 
-# This function uses plotly.express
-def compare_passenger_capacity_exp(preprocessed_shuttles: pd.DataFrame):
-    return (
-        preprocessed_shuttles.groupby(["shuttle_type"])
-        .mean(numeric_only=True)
+    density = np.stack(
+        [
+            np.histogram2d(
+                data["price"].to_numpy()[codes == code],
+                data["mileage"].to_numpy()[codes == code],
+                bins=[y_bins, x_bins],
+                range=[extent[2:], extent[:2]],
+            )[0]
+            for code in range(len(countries))
+        ]
+    )
+
+    mileage_bin = parameters["mileage_bin_km"]
+    medians = (
+        data.assign(mileage_bin=(data["mileage"] // mileage_bin) * mileage_bin + mileage_bin / 2)
+        .groupby(["country", "mileage_bin"])["price"]
+        .agg(["median", "count"])
         .reset_index()
     )
+    medians = medians[medians["count"] >= parameters["min_bin_listings"]]
+    return {
+        "density": density,
+        "extent": extent,
+        "countries": countries,
+        "medians": {country: (group["mileage_bin"].to_numpy(), group["median"].to_numpy()) for country, group in medians.groupby("country")},
+        "listings": len(data),
+    }
 
 
-# This function uses plotly.graph_objects
-def compare_passenger_capacity_go(preprocessed_shuttles: pd.DataFrame):
+def _shade(density: np.ndarray, colours: List[str]) -> np.ndarray:
+    """Blends per-country densities into an RGBA image."""
+    from matplotlib.colors import to_rgb
 
-    data_frame = (
-        preprocessed_shuttles.groupby(["shuttle_type"])
-        .mean(numeric_only=True)
-        .reset_index()
+    total = density.sum(axis=0)
+    rgb = np.array([to_rgb(colour) for colour in colours])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        blended = np.einsum("chw,cr->hwr", density, rgb) / total[..., None]
+    alpha = np.log1p(total) / max(np.log1p(total.max()), 1e-9)
+    return np.nan_to_num(np.dstack([blended, alpha]))
+
+
+def render_chart(chart: Dict[str, Any]) -> str:
+    """Renders one aggregated chart to ``chart["path"]``. Runs in the pool workers."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+    from matplotlib.ticker import StrMethodFormatter
+
+    colours = [COUNTRY_COLOURS[i % len(COUNTRY_COLOURS)] for i in range(len(chart["countries"]))]
+    fig, ax = plt.subplots(figsize=(12, 8))
+    ax.imshow(
+        _shade(chart["density"], colours), extent=chart["extent"], origin="lower", aspect="auto", interpolation="nearest"
     )
-    fig = go.Figure(
-        [
-            go.Bar(
-                x=data_frame["shuttle_type"],
-                y=data_frame["passenger_capacity"],
-            )
-        ]
+    for country, colour in zip(chart["countries"], colours):
+        if country in chart["medians"]:
+            ax.plot(*chart["medians"][country], color=colour, linewidth=2)
+
+    ax.set_title(f"{chart['title']}: Price vs Mileage of Vehicle by Country ({chart['listings']:,} listings)")
+    ax.set_xlabel("Mileage (km)")
+    ax.set_ylabel("Price (€)")
+    ax.xaxis.set_major_formatter(StrMethodFormatter("{x:,.0f}"))
+    ax.grid(True, alpha=0.3)
+    ax.legend(
+        [Line2D([], [], color=colour, linewidth=2) for colour in colours],
+        [f"{country} (median)" for country in chart["countries"]],
+        title="Country",
+    )
+    fig.savefig(chart["path"], dpi=100)
+    plt.close(fig)
+    return chart["path"]
+
+
+def render_price_vs_mileage_reports(cleaned_results: pd.DataFrame, parameters: Dict) -> pd.DataFrame:
+    """Renders a price vs mileage chart per model and per country in a process pool.
+
+    Args:
+        cleaned_results: Cleaned listings.
+        parameters: Parameters defined in parameters/reporting.yml.
+    Returns:
+        Manifest of the rendered charts.
+    """
+    data = cleaned_results[["model", "country", "mileage", "price"]].dropna()
+    data = pd.DataFrame(
+        {
+            "model": data["model"].astype(str),
+            "country": data["country"].astype(str),
+            "mileage": data["mileage"].astype("float64"),
+            "price": data["price"].astype("float64"),
+        }
     )
+    data = data[data["mileage"] <= parameters["max_mileage"]]
+    countries = sorted(data["country"].unique())
+    output_dir = Path(parameters["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    return fig
+    charts = []
+    for kind, column in [("model", "model"), ("country", "country")]:
+        for key, group in data.groupby(column):
+            if len(group) < parameters["min_listings"]:
+                continue
+            name = f"price_vs_mileage_{key}.png" if kind == "model" else f"price_vs_mileage_country_{key}.png"
+            chart_countries = countries if kind == "model" else [key]
+            charts.append(
+                {
+                    **_aggregate(group, chart_countries, parameters),
+                    "kind": kind,
+                    "key": key,
+                    "title": str(key).capitalize() if kind == "model" else f"All models in {key}",
+                    "path": str(output_dir / name),
+                }
+            )
 
+    max_workers = parameters.get("max_workers") or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=start_worker_profiling) as executor:
+        list(executor.map(render_chart, charts))
+    logger.info(f"Rendered {len(charts)} charts to {output_dir}.")
 
-def create_confusion_matrix(companies: pd.DataFrame):
-    actuals = [0, 1, 0, 0, 1, 1, 1, 0, 1, 0, 1]
-    predicted = [1, 1, 0, 1, 0, 1, 0, 0, 0, 1, 1]
-    data = {"y_Actual": actuals, "y_Predicted": predicted}
-    df = pd.DataFrame(data, columns=["y_Actual", "y_Predicted"])
-    confusion_matrix = pd.crosstab(
-        df["y_Actual"], df["y_Predicted"], rownames=["Actual"], colnames=["Predicted"]
+    return pd.DataFrame(
+        [{"kind": chart["kind"], "key": chart["key"], "path": chart["path"], "listings": chart["listings"]} for chart in charts],
+        columns=["kind", "key", "path", "listings"],
     )
-    sn.heatmap(confusion_matrix, annot=True)
-    return plt
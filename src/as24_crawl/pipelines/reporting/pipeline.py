@@ -1,30 +1,24 @@
 from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import (
-    compare_passenger_capacity_exp,
-    compare_passenger_capacity_go,
-    create_confusion_matrix,
-)
+from .arbitrage import compute_price_arbitrage
+from .nodes import render_price_vs_mileage_reports
 
 
-# def create_pipeline(**kwargs) -> Pipeline:
-#     """This is a simple pipeline which generates a pair of plots"""
-#     return pipeline(
-#         [
-#              node(
-#                  func=compare_passenger_capacity_exp,
-#                  inputs="preprocessed_shuttles",
-#                  outputs="shuttle_passenger_capacity_plot_exp",
-#              ),
-#              node(
-#                  func=compare_passenger_capacity_go,
-#                  inputs="preprocessed_shuttles",
-#                  outputs="shuttle_passenger_capacity_plot_go",
-#              ),
-#              node(
-#                  func=create_confusion_matrix,
-#                  inputs="companies",
-#                  outputs="dummy_confusion_matrix",
-#              ),
-#         ]
-#     )
+def create_pipeline(**kwargs) -> Pipeline:
+    """Reports computed from the cleaned listings"""
+    return pipeline(
+        [
+            node(
+                func=compute_price_arbitrage,
+                inputs=["cleaned_results", "params:arbitrage"],
+                outputs="price_arbitrage",
+                name="compute_price_arbitrage_node",
+            ),
+            node(
+                func=render_price_vs_mileage_reports,
+                inputs=["cleaned_results", "params:reports"],
+                outputs="report_manifest",
+                name="render_price_vs_mileage_reports_node",
+            ),
+        ]
+    )
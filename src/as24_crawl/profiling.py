@@ -0,0 +1,207 @@
+"""Sampling profiler for pipeline runs and crawl workers.
+
+A profiled run samples the stacks of all threads of the main process and of every pool
+worker started with ``start_worker_profiling`` as initializer, and records the memory
+allocated by each node with ``tracemalloc``. At the end of the run it writes to
+``<output_dir>/<timestamp>/``:
+
+- ``<process>-<pid>.folded``: stack samples per process, in the folded format read by
+  ``flamegraph.pl`` and speedscope,
+- ``merged.folded`` and ``flamegraph.svg``: the samples of all processes,
+- ``allocations.txt``: peak and net allocations per node with the top allocating lines.
+
+Only the standard library is imported, so workers do not pay for it on startup.
+"""
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+import zlib
+from collections import Counter
+from datetime import datetime
+from html import escape
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set by the user to profile a run, e.g. AS24_PROFILE=1 kedro run
+PROFILE_ENV = "AS24_PROFILE"
+# Set by the profiler for the workers: the directory to write their samples to
+PROFILE_DIR_ENV = "AS24_PROFILE_DIR"
+TRACEMALLOC_FRAMES = 10
+
+
+def enabled_by_env() -> bool:
+    return os.environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no")
+
+
+class StackSampler:
+    """Samples the stacks of all other threads every ``interval`` seconds into folded stacks."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="as24-stack-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    self.stacks[_fold(names.get(ident, "thread"), frame)] += 1
+
+    def write(self, path: Path) -> None:
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.stacks.items()))
+
+
+def _fold(thread_name: str, frame) -> str:
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join([thread_name, *reversed(frames)])
+
+
+def _stop_worker(sampler: StackSampler, path: Path) -> None:
+    sampler.stop()
+    sampler.write(path)
+
+
+def start_worker_profiling() -> None:
+    """Pool initializer: samples the worker while its parent run is profiled.
+
+    The samples are written when the worker exits normally, so pools must be closed and
+    joined rather than terminated.
+    """
+    directory = os.environ.get(PROFILE_DIR_ENV)
+    if not directory:
+        return
+    sampler = StackSampler().start()
+    Finalize(sampler, _stop_worker, args=(sampler, Path(directory) / f"worker-{os.getpid()}.folded"), exitpriority=10)
+
+
+def merge_folded(paths: List[Path]) -> Counter:
+    """Sums the samples of several folded stack files, prefixing stacks with their process."""
+    merged = Counter()
+    for path in paths:
+        for line in path.read_text().splitlines():
+            stack, _, count = line.rpartition(" ")
+            merged[f"{path.stem};{stack}"] += int(count)
+    return merged
+
+
+def write_flamegraph(stacks: Counter, path: Path, width: int = 1200, row_height: int = 16) -> None:
+    """Renders folded stacks as a static SVG flame graph."""
+    tree: Dict = {}
+    for stack, count in stacks.items():
+        node = tree
+        for frame in stack.split(";"):
+            node = node.setdefault(frame, {"count": 0, "children": {}})
+            node["count"] += count
+            node = node["children"]
+
+    total = sum(stacks.values()) or 1
+    rects: List[Tuple[int, float, float, str, int]] = []
+
+    def layout(children: Dict, depth: int, x: float) -> int:
+        max_depth = depth
+        for frame, node in sorted(children.items()):
+            frame_width = node["count"] / total * width
+            rects.append((depth, x, frame_width, frame, node["count"]))
+            max_depth = max(max_depth, layout(node["children"], depth + 1, x))
+            x += frame_width
+        return max_depth
+
+    height = (layout(tree, 0, 0.0) + 1) * row_height
+    elements = []
+    for depth, x, frame_width, frame, count in rects:
+        if frame_width < 0.1:
+            continue
+        y = height - (depth + 1) * row_height
+        hue = zlib.crc32(frame.split(" (")[0].encode()) % 60
+        label = escape(frame)
+        text = (
+            f'<text x="{x + 2:.1f}" y="{y + row_height - 4}" font-size="11">{escape(frame[: int(frame_width / 7)])}</text>'
+            if frame_width > 30
+            else ""
+        )
+        elements.append(
+            f'<g><title>{label} ({count} samples, {count / total:.1%})</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{frame_width:.1f}" height="{row_height - 1}" fill="hsl({hue},80%,60%)"/>{text}</g>'
+        )
+    path.write_text(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace">'
+        + "".join(elements)
+        + "</svg>"
+    )
+
+
+class RunProfiler:
+    """Profiles one run: samples this process and its workers, traces allocations per node."""
+
+    def __init__(self, output_dir: Path, interval: float = 0.005, top_allocations: int = 10):
+        self.run_dir = Path(output_dir) / datetime.now().strftime("%Y-%m-%dT%H.%M.%S")
+        self._interval = interval
+        self._top_allocations = top_allocations
+        self._sampler: Optional[StackSampler] = None
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._allocations: List[str] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        os.environ[PROFILE_DIR_ENV] = str(self.run_dir)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._sampler = StackSampler(self._interval).start()
+        logger.info(f"Profiling run to {self.run_dir}")
+
+    def node_started(self, name: str) -> None:
+        tracemalloc.reset_peak()
+        snapshot = tracemalloc.take_snapshot()
+        with self._lock:
+            self._snapshots[name] = snapshot
+
+    def node_finished(self, name: str) -> None:
+        peak = tracemalloc.get_traced_memory()[1]
+        with self._lock:
+            before = self._snapshots.pop(name, None)
+        if before is None:
+            return
+        # the snapshots themselves are allocated by tracemalloc
+        without_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = tracemalloc.take_snapshot().filter_traces(without_tracemalloc).compare_to(
+            before.filter_traces(without_tracemalloc), "lineno"
+        )
+        net = sum(stat.size_diff for stat in stats)
+        lines = [f"{name}: peak {peak / 2**20:.1f} MiB, net {net / 2**20:+.1f} MiB"]
+        lines += [f"    {stat}" for stat in sorted(stats, key=lambda stat: stat.size_diff, reverse=True)[: self._top_allocations]]
+        with self._lock:
+            self._allocations.append("\n".join(lines))
+
+    def stop(self) -> Path:
+        """Writes the profiles of the run and returns its directory."""
+        self._sampler.stop()
+        self._sampler.write(self.run_dir / f"main-{os.getpid()}.folded")
+        tracemalloc.stop()
+        os.environ.pop(PROFILE_DIR_ENV, None)
+
+        stacks = merge_folded(sorted(self.run_dir.glob("*-*.folded")))
+        (self.run_dir / "merged.folded").write_text("".join(f"{stack} {count}\n" for stack, count in stacks.items()))
+        write_flamegraph(stacks, self.run_dir / "flamegraph.svg")
+        (self.run_dir / "allocations.txt").write_text("\n\n".join(self._allocations) + "\n")
+        logger.info(f"Wrote profiles of {len(list(self.run_dir.glob('*-*.folded')))} processes to {self.run_dir}")
+        return self.run_dir
@@ -0,0 +1,98 @@
+"""SQL over the crawl datasets with DuckDB.
+
+Queries run directly on the parquet files, out-of-core and on all cores, and only the
+(small) result is materialised in pandas:
+
+    from as24_crawl.query import query
+
+    query(
+        "SELECT country, median(price) FROM cleaned_results WHERE model = ? GROUP BY country",
+        ["golf"],
+    )
+
+Each name in ``TABLES`` is registered as a view. Versioned Kedro datasets resolve to
+their newest version, globs (such as the per-segment crawl partitions) are read as one
+table.
+"""
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import duckdb
+import pandas as pd
+
+TABLES = {
+    "crawling_results": "data/01_raw/crawling_results.parquet",
+    "crawl_partitions": "data/01_raw/crawl/*/*.parquet",
+    "cleaned_results": "data/02_intermediate/cleaned_results.parquet",
+}
+
+
+def resolve_parquet_path(filepath: str) -> str:
+    """Returns the newest version's file for a versioned dataset, otherwise ``filepath``.
+
+    Kedro stores versions as ``<filepath>/<version>/<filename>`` with version strings
+    that sort chronologically.
+    """
+    path = Path(filepath)
+    if not path.is_dir():
+        return filepath
+    versions = sorted(version for version in path.iterdir() if (version / path.name).exists())
+    if not versions:
+        raise FileNotFoundError(f"No versions of {filepath} found.")
+    return str(versions[-1] / path.name)
+
+
+def connect(
+    tables: Optional[Dict[str, str]] = None,
+    threads: Optional[int] = None,
+    memory_limit: Optional[str] = None,
+) -> duckdb.DuckDBPyConnection:
+    """Opens an in-memory DuckDB connection with a view per table.
+
+    Args:
+        tables: Mapping of view names to parquet paths or globs, defaults to ``TABLES``.
+        threads: Worker threads, DuckDB defaults to the number of cores.
+        memory_limit: e.g. ``"4GB"``; DuckDB spills to disk beyond it.
+
+    Returns:
+        The connection, to run several queries against the same views.
+    """
+    connection = duckdb.connect()
+    if threads:
+        connection.execute(f"SET threads = {int(threads)}")
+    if memory_limit:
+        connection.execute(f"SET memory_limit = '{memory_limit}'")
+    for name, filepath in (TABLES if tables is None else tables).items():
+        if "*" not in filepath and not Path(filepath).exists():
+            continue
+        source = resolve_parquet_path(filepath).replace("'", "''")
+        connection.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{source}', union_by_name = true)")
+    return connection
+
+
+def query(sql: str, parameters: Optional[Sequence[Any]] = None, **kwargs: Any) -> pd.DataFrame:
+    """Runs ``sql`` with ``?`` placeholders bound to ``parameters`` and returns the result.
+
+    ``kwargs`` are passed on to ``connect``.
+    """
+    with connect(**kwargs) as connection:
+        return connection.execute(sql, parameters or []).df()
+
+
+def median_price_by_country(model: str, year: int, max_mileage: int, **kwargs: Any) -> pd.DataFrame:
+    """Median price and number of listings per country for one model and registration year.
+
+    Example:
+        ``median_price_by_country("golf", 2015, 150_000)``
+    """
+    return query(
+        """
+        SELECT country, median(price) AS median_price, count(*) AS listings
+        FROM cleaned_results
+        WHERE model = ? AND year = ? AND mileage < ?
+        GROUP BY country
+        ORDER BY country
+        """,
+        [model, year, max_mileage],
+        **kwargs,
+    )
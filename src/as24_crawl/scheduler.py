@@ -0,0 +1,241 @@
+"""Continuous re-crawl scheduler, ``as24-crawl-daemon``.
+
+Instead of re-crawling every (country, brand_model, year) segment with equal priority,
+the daemon learns how fast each segment changes (new ads plus price changes per hour,
+as an exponentially weighted average) and always crawls the segment with the most
+expected changes per request. Requests are paced by a global token bucket, so the
+request volume is fixed by ``requests_per_hour`` and fast moving segments get a larger
+share of it. ``max_interval_hours`` bounds how stale any segment can get.
+
+Every crawl is written as JSON lines to ``output_dir``; the learned state is kept in
+``state_path`` so a restarted daemon resumes where it stopped.
+"""
+import argparse
+import json
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from as24_crawl.crawl import load_parameters, write_results
+from as24_crawl.fetching import CircuitOpenError, FetchError
+
+logger = logging.getLogger("as24_crawl.scheduler")
+
+RESULTS_PER_PAGE = 20
+
+
+@dataclass
+class SegmentState:
+    country: str
+    brand_model: str
+    year: int
+    # time of the last successful crawl
+    last_crawled: Optional[float] = None
+    change_rate: float = 0.0
+    pages: int = 1
+    prices: Dict[str, Optional[str]] = field(default_factory=dict)
+    # consecutive failed crawls and the time before which the segment is not retried
+    failures: int = 0
+    retry_after: Optional[float] = None
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return (self.country, self.brand_model, self.year)
+
+
+class TokenBucket:
+    """Global request budget: ``rate_per_hour`` tokens per hour, at most ``burst`` saved up.
+
+    Crawls are charged their estimated number of requests before they start, failed ones
+    included, and corrected by their actual number afterwards; the balance may go
+    negative, which delays the next crawl accordingly.
+    """
+
+    def __init__(self, rate_per_hour: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self._rate = rate_per_hour / 3600
+        self._burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float) -> float:
+        """Seconds until ``tokens`` are available."""
+        self._refill()
+        return max(0.0, (min(tokens, self._burst) - self._tokens) / self._rate)
+
+    def consume(self, tokens: float) -> None:
+        self._refill()
+        self._tokens -= tokens
+
+
+class Scheduler:
+    """Picks segments by expected changes per request and learns their change rates."""
+
+    def __init__(self, segments: List[SegmentState], parameters: Dict[str, Any], clock: Callable[[], float] = time.time):
+        self.segments = {segment.key: segment for segment in segments}
+        self._parameters = parameters
+        self._clock = clock
+
+    def priority(self, segment: SegmentState, now: float) -> float:
+        if segment.retry_after is not None and now < segment.retry_after:
+            return -math.inf
+        if segment.last_crawled is None:
+            return math.inf
+        hours = (now - segment.last_crawled) / 3600
+        if hours < self._parameters["min_interval_minutes"] / 60:
+            return -math.inf
+        if hours > self._parameters["max_interval_hours"]:
+            return math.inf
+        return segment.change_rate * hours / max(segment.pages, 1)
+
+    def next_segment(self) -> Optional[SegmentState]:
+        """Segment to crawl next, ``None`` if all were crawled within ``min_interval_minutes``."""
+        now = self._clock()
+        segment = max(self.segments.values(), key=lambda segment: self.priority(segment, now))
+        return None if self.priority(segment, now) == -math.inf else segment
+
+    def record_crawl(self, segment: SegmentState, results: List[Dict[str, Any]]) -> int:
+        """Updates the segment with a fresh crawl and returns its number of changes."""
+        now = self._clock()
+        prices = {result["url"].split("/")[-1]: result.get("price") for result in results if result.get("url")}
+        changes = sum(1 for ad_id, price in prices.items() if segment.prices.get(ad_id, object()) != price)
+
+        if segment.last_crawled is not None:
+            hours = max((now - segment.last_crawled) / 3600, 1 / 60)
+            alpha = self._parameters["ewma_alpha"]
+            segment.change_rate = alpha * changes / hours + (1 - alpha) * segment.change_rate
+        segment.last_crawled = now
+        segment.pages = max(1, math.ceil(len(results) / RESULTS_PER_PAGE))
+        segment.prices = prices
+        segment.failures, segment.retry_after = 0, None
+        return changes
+
+    def record_failure(self, segment: SegmentState) -> None:
+        """Postpones a segment that failed to crawl, keeping what was learned about it.
+
+        The delay starts at ``min_interval_minutes`` and doubles with every consecutive
+        failure, up to ``max_interval_hours``. ``last_crawled`` is left alone, so the next
+        successful crawl credits its changes to the whole time since the last one.
+        """
+        segment.failures += 1
+        delay = min(
+            self._parameters["min_interval_minutes"] * 60 * 2 ** (segment.failures - 1),
+            self._parameters["max_interval_hours"] * 3600,
+        )
+        segment.retry_after = self._clock() + delay
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps([asdict(segment) for segment in self.segments.values()]))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, segments: List[SegmentState], parameters: Dict[str, Any], **kwargs: Any) -> "Scheduler":
+        """Creates a scheduler for ``segments``, restoring the state of those found in ``path``."""
+        scheduler = cls(segments, parameters, **kwargs)
+        if path.exists():
+            for saved in json.loads(path.read_text()):
+                segment = SegmentState(**saved)
+                if segment.key in scheduler.segments:
+                    scheduler.segments[segment.key] = segment
+        return scheduler
+
+
+def crawl_segment(url_template: str, segment: SegmentState) -> List[Dict[str, Any]]:
+    """Crawls one segment, bypassing the daily joblib cache of ``scrape_job``."""
+    from as24_crawl.scraping import ScrapeInterrupted, annotate_results, scrape_autoscout24
+
+    try:
+        results = scrape_autoscout24(url_template, segment.country, segment.brand_model, segment.year, cache=None)
+    except ScrapeInterrupted as e:
+        # the daemon re-crawls the whole segment later instead of resuming it
+        raise e.__cause__ from None
+    return annotate_results(results, segment.country, segment.brand_model, segment.year)
+
+
+def run(parameters: Dict[str, Any], max_crawls: Optional[int] = None, sleep: Callable[[float], None] = time.sleep) -> None:
+    """Crawls segments by priority until interrupted or ``max_crawls`` is reached."""
+    from as24_crawl.scraping import build_url_template, configure_crawler
+
+    if parameters.get("crawl"):
+        # paced by the token bucket below, a request cap would stop the daemon for good
+        configure_crawler({**parameters["crawl"], "max_requests": None})
+    settings = parameters["scheduler"]
+    url_template = build_url_template(parameters["base_url"], parameters["url_params"])
+    year_range = parameters["year_range"]
+    segments = [
+        SegmentState(country, brand_model, year)
+        for country in parameters["countries"]
+        for brand_model in dict.fromkeys(parameters["brand_model"])
+        for year in range(year_range[0], year_range[1] + 1)
+    ]
+    state_path, output_dir = Path(settings["state_path"]), Path(settings["output_dir"])
+    scheduler = Scheduler.load(state_path, segments, settings)
+    bucket = TokenBucket(settings["requests_per_hour"], settings["burst"])
+
+    crawls = 0
+    while max_crawls is None or crawls < max_crawls:
+        segment = scheduler.next_segment()
+        if segment is None:
+            sleep(60)
+            continue
+        sleep(bucket.wait_time(segment.pages))
+        # charged up front, so crawls failing part way still count against the budget
+        estimate = segment.pages
+        bucket.consume(estimate)
+
+        try:
+            results = crawl_segment(url_template, segment)
+        except CircuitOpenError as e:
+            logger.warning(f"Site unavailable, pausing for {e.retry_after:.0f}s: {e}")
+            sleep(e.retry_after)
+            continue
+        except FetchError as e:
+            logger.error(f"Failed to crawl {segment.brand_model} in {segment.country} for {segment.year}: {e}")
+            scheduler.record_failure(segment)
+            scheduler.save(state_path)
+            continue
+        changes = scheduler.record_crawl(segment, results)
+        bucket.consume(segment.pages - estimate)
+        scheduler.save(state_path)
+
+        country, brand_model, year = segment.key
+        name = f"{country}_{brand_model.replace('/', '_')}_{year}_{datetime.now():%Y-%m-%dT%H.%M.%S}.jsonl"
+        write_results(results, output_dir / f"{datetime.now():%Y-%m-%d}" / name)
+        logger.info(
+            f"Crawled {brand_model} in {country} for {year}: {len(results)} ads, {changes} changes, "
+            f"{segment.change_rate:.2f} changes/hour."
+        )
+        crawls += 1
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="as24-crawl-daemon", description="Continuously re-crawl the fastest changing segments.")
+    parser.add_argument("--conf-source", type=Path, default=Path("conf"), help="Kedro configuration directory.")
+    parser.add_argument("--env", default="local", help="Configuration environment overlaid on base.")
+    parser.add_argument("--requests-per-hour", type=float, help="Overrides params:scheduler.requests_per_hour.")
+    parser.add_argument("--max-crawls", type=int, help="Stop after this many segment crawls.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parameters = load_parameters(args.conf_source, args.env)
+    if args.requests_per_hour:
+        parameters["scheduler"]["requests_per_hour"] = args.requests_per_hour
+    try:
+        run(parameters, args.max_crawls)
+    except KeyboardInterrupt:
+        logger.info("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
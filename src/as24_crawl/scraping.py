@@ -0,0 +1,340 @@
+"""Fetching and parsing of autoscout24 result pages.
+
+Pages are fetched by this process's ``page_crawler``, a ``SourceCrawler`` paging through
+``AutoScout24Source`` queries, so the crawl shares its retries, circuit breaker, request
+budget and rate limits with the ``multi_source`` pipeline.
+
+Kept free of pandas and Kedro imports: this, ``fetching`` and ``sources`` are the only
+project modules that crawl pool workers import, so they determine how fast they start.
+"""
+import itertools
+import logging
+import re
+import threading
+import time
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from as24_crawl.fetching import CircuitOpenError, FetchError, RetryableFetchError
+
+# Directory setup to store cached data
+cache_dir = 'joblib_cache'
+
+logger = logging.getLogger(__name__)
+
+
+# Fields of the records returned by scrape_job: parse_listing's plus the segment of annotate_results
+LISTING_FIELDS = [
+    'url', 'subtitle', 'price', 'mileage', 'first_registration', 'fuel_type', 'transmission', 'engine_power',
+    'co2_emission', 'fuel_consumption', 'vat_deductible', 'html', 'brand', 'model', 'year', 'country',
+]
+
+
+def build_url_template(base_url: str, url_params: Dict[str, Any]) -> str:
+    """Appends the configured query parameters to the base search URL.
+
+    The result still contains the ``{country}``, ``{brand_model}``, ``{page}`` and ``{year}``
+    placeholders that are filled in per request.
+    """
+    params_str = "&".join([f"{key}={value}" for key, value in url_params.items()])
+    return f"{base_url}&{params_str}"
+
+
+def crawl_tasks(url_template: str, countries: List, brand_model_combinations: List, years: List[int], cache: str) -> List[Tuple]:
+    """
+    Builds the ``scrape_job`` arguments for every distinct country / brand_model / year combination.
+    """
+    return [
+        (url_template, country, brand_model, year, cache, 1)
+        for country, brand_model, year in itertools.product(dict.fromkeys(countries), dict.fromkeys(brand_model_combinations), dict.fromkeys(years))
+    ]
+
+
+def annotate_results(results: List[Dict[str, Any]], country: str, brand_model: str, year: int) -> List[Dict[str, Any]]:
+    # add brand, model, year, and country to each result
+    for res in results:
+        res['brand'] = brand_model.split("/")[0]
+        res['model'] = brand_model.split("/")[1]
+        res['year'] = year
+        res['country'] = country
+
+    return results
+
+
+@lru_cache(maxsize=1)
+def cached_scrape_autoscout24() -> Callable[..., List]:
+    """``scrape_autoscout24`` memoised on disk by its arguments, including the ``cache`` key.
+
+    joblib (and with it numpy) is imported on first use rather than with this module.
+    """
+    from joblib import Memory
+
+    return Memory(cache_dir, verbose=0).cache(scrape_autoscout24)
+
+
+def scrape_job(args):
+    """Scrapes one task of ``crawl_tasks``, through the disk cache unless its ``cache`` key is None.
+
+    The last element of a task is the page to start at, the failed page once it was requeued.
+    """
+    url_template, country, brand_model, year, cache, start_page = args
+    scrape = scrape_autoscout24 if cache is None else cached_scrape_autoscout24()
+    try:
+        results = scrape(url_template, country, brand_model, year, cache=cache, start_page=start_page)
+    except ScrapeInterrupted as e:
+        annotate_results(e.results, country, brand_model, year)
+        raise
+    return annotate_results(results, country, brand_model, year)
+
+
+# Seconds before a task that ran out of retries is tried again
+DEFER_SECONDS = 30.0
+
+
+class ScrapeInterrupted(FetchError):
+    """A page of a task failed transiently; ``results`` holds the records of the pages before it."""
+
+    def __init__(self, url: str, results: List[Dict[str, Any]], next_page: int, retry_after: float = DEFER_SECONDS):
+        super().__init__(url, message=f"interrupted at page {next_page}")
+        self.results = results
+        self.next_page = next_page
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        return type(self), (self.url, self.results, self.next_page, self.retry_after)
+
+
+def run_job(job: Callable[[Tuple], List], args: Tuple) -> Tuple[Tuple, List, Optional[Tuple], float]:
+    """
+    Runs ``job`` without blocking on an open circuit or a struggling site.
+
+    Returns the task, its results, the task to requeue (None unless it was deferred) and
+    the seconds until it may be retried. Tasks are deferred when the circuit is open or
+    a page still failed transiently after its retries (or without any, once the retry
+    budget is spent); a ``ScrapeInterrupted`` task keeps the results it already has and
+    is requeued with its last element, the page to start at, set to the failed page.
+    Tasks that failed for good are logged and return no results.
+    """
+    try:
+        return args, job(args), None, 0.0
+    except ScrapeInterrupted as e:
+        return args, e.results, (*args[:-1], e.next_page), e.retry_after
+    except CircuitOpenError as e:
+        return args, [], args, e.retry_after
+    except RetryableFetchError:
+        return args, [], args, DEFER_SECONDS
+    except FetchError as e:
+        logger.error(f"Giving up on task {args[1:4]}: {e}")
+        return args, [], None, 0.0
+
+
+def run_deferrable(
+    job: Callable[[Tuple], List],
+    tasks: Iterable[Tuple],
+    map_fn: Callable = map,
+    max_rounds: int = 5,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Tuple[Tuple, List]]:
+    """
+    Yields ``(task, results)`` for every task, requeueing tasks that ``run_job`` deferred.
+
+    Deferred tasks are collected while the remaining tasks keep running, and are retried
+    in a new round once the circuit accepts requests again, at most ``max_rounds`` rounds.
+    The results a deferred task already has are yielded right away, so a task can be
+    yielded more than once. ``map_fn`` runs the tasks, e.g. ``pool.imap_unordered``.
+    """
+    pending = list(tasks)
+    for _ in range(max_rounds):
+        deferred, wait = [], 0.0
+        for task, results, requeue, retry_after in map_fn(partial(run_job, job), pending):
+            if requeue is None or results:
+                yield task, results
+            if requeue is not None:
+                deferred.append(requeue)
+                wait = max(wait, retry_after)
+        if not deferred:
+            return
+        logger.warning(f"Deferred {len(deferred)} tasks, retrying in {wait:.0f}s.")
+        sleep(wait)
+        pending = deferred
+    logger.error(f"Dropped {len(pending)} tasks still deferred after {max_rounds} rounds.")
+
+
+MAX_FETCH_ATTEMPTS = 4
+
+# Used until configure_crawler applies params:crawl, no request budget or rate limit
+DEFAULT_CRAWL_PARAMETERS = {
+    "max_workers": 10,
+    "max_requests": None,
+    "retry_ratio": 0.1,
+    "rate_limits": {},
+    "default_rate_limit": None,
+    "burst": 1,
+    "page_cache": {"ttl_seconds": 0, "max_bytes": 8 * 2**20},
+}
+
+
+class _CrawlerState:
+    parameters = DEFAULT_CRAWL_PARAMETERS
+    crawler = None
+
+
+_crawler_state = _CrawlerState()
+_crawler_lock = threading.Lock()
+
+
+def configure_crawler(parameters: Optional[Dict[str, Any]]) -> None:
+    """Applies ``params:crawl`` to this process's ``page_crawler``.
+
+    The crawler, and with it its request budget, circuit breaker and page cache, is only
+    replaced when the parameters change, so all segments of a run share one.
+    """
+    with _crawler_lock:
+        if parameters and parameters != _crawler_state.parameters:
+            _crawler_state.parameters = parameters
+            _crawler_state.crawler = None
+
+
+def page_crawler():
+    """The ``SourceCrawler`` fetching autoscout24 pages in this process, created on first use."""
+    # sources imports this module
+    from as24_crawl.sources import SourceCrawler
+
+    with _crawler_lock:
+        if _crawler_state.crawler is None:
+            _crawler_state.crawler = SourceCrawler(_crawler_state.parameters)
+        return _crawler_state.crawler
+
+
+def fetch_page(url):
+    # duplicate and concurrent requests of this process are served by one fetch
+    from as24_crawl.sources import SourceRequest
+
+    return page_crawler().fetch(SourceRequest(url))
+
+
+def parse_listing(listing):
+    try:
+        data = {}
+        try:
+            url_element = listing.find_all('a', re.compile(r'ListItem_title__.*'))
+            data['url'] = url_element[0]['href'] if url_element else None
+
+            if len(url_element) >= 1:
+                subtitle_element = url_element[0].find_all('span', re.compile(r'ListItem_version__.*'))
+                data['subtitle'] = subtitle_element[0].get_text(strip=True) if subtitle_element else None
+
+            price_element = listing.find_all('p', re.compile(r'Price_price__.*'))
+            data['price'] = price_element[0].get_text(strip=True) if price_element else None
+
+        except IndexError as e:
+            logger.error(f"Error extracting key metadata from: {listing}")
+            logger.error(f"HTML: {listing.prettify()}")
+            logger.error(f"Exception: {e}")
+            raise
+
+        # Find all 'span' elements with class matching the pattern
+        details = listing.find_all('span', class_=re.compile(r'VehicleDetailTable_item__.*'))
+
+        for detail in details:
+            # Extract the `data-testid` attribute
+            testid = detail.get('data-testid', '')
+
+            # Map each `data-testid` to the appropriate field in the dictionary
+            # Based on the SVG icon it contains.
+            if 'mileage_road' in testid:
+                data['mileage'] = detail.get_text(strip=True)
+            elif 'calendar' in testid:
+                data['first_registration'] = detail.get_text(strip=True)
+            elif 'gas_pump' in testid:
+                data['fuel_type'] = detail.get_text(strip=True)
+            elif 'transmission' in testid:
+                data['transmission'] = detail.get_text(strip=True)
+            elif 'speedometer' in testid:
+                data['engine_power'] = detail.get_text(strip=True)
+            elif 'leaf' in testid:
+                data['co2_emission'] = detail.get_text(strip=True)
+            elif 'water_drop' in testid:
+                data['fuel_consumption'] = detail.get_text(strip=True)
+
+        
+        vat = listing.find('div', class_='Price_vat__iUxNT')
+        if vat and 'inkl. MwSt' in vat.get_text(strip=True):
+            data['vat_deductible'] = True
+        else:
+            data['vat_deductible'] = False
+        
+        # Fail early if required attributes are missing
+        required_attrs = ['url', 'price', 'mileage', 'first_registration', 'fuel_type', 'transmission', 'engine_power']
+        for attr in required_attrs:
+            if attr not in data:
+                raise ValueError(f'Missing {attr} in listing')
+        
+        data['html'] = str(listing)
+
+        return data
+    except Exception as e:
+        logger.error(f"Parsing error: {e}")
+        raise
+
+
+
+# Detail page labels (German site) mapped to the enrichment fields
+DETAIL_FIELDS = {
+    'Unfallfrei': 'accident_free',
+    'Verkäufer': 'seller_type',
+    'Fahrzeughalter': 'previous_owners',
+    'Karosserieform': 'body_type',
+    'Farbe': 'colour',
+    'HU': 'inspection_due',
+}
+
+
+def parse_detail_page(page_html: str) -> Dict[str, Any]:
+    """
+    Extracts the fields only shown on an ad's detail page.
+
+    The specification grid is read as ``dt``/``dd`` pairs into ``details``; the labels in
+    ``DETAIL_FIELDS`` are also exposed as top level fields. ``accident_free`` is a bool,
+    or None when the ad does not say.
+    """
+    soup = BeautifulSoup(page_html, 'html.parser')
+
+    details = {}
+    for term in soup.find_all('dt'):
+        value = term.find_next_sibling('dd')
+        if value is not None:
+            details[term.get_text(strip=True)] = value.get_text(' ', strip=True)
+
+    data = {field: details.get(label) for label, field in DETAIL_FIELDS.items()}
+    if data['accident_free'] is not None:
+        data['accident_free'] = data['accident_free'].lower() in ('ja', 'yes')
+
+    location = soup.find('a', class_=re.compile(r'LocationWithPin_locationItem__.*'))
+    data['location'] = location.get_text(' ', strip=True) if location else None
+    data['equipment'] = sorted({
+        item.get_text(strip=True)
+        for section in soup.find_all(class_=re.compile(r'Equipment_.*'))
+        for item in section.find_all('li')
+    })
+    data['details'] = details
+    return data
+
+
+def scrape_autoscout24(url_template: str, country: str, brand_model: str, year: int, cache, start_page: int = 1) -> List:
+    """
+    Crawls the listings of one country / brand_model / year segment from ``start_page`` on.
+
+    Pages through an ``AutoScout24Source`` query with this process's ``page_crawler``,
+    until the last page or a page whose ads were mostly seen already. ``cache`` is
+    only used as part of the key of ``cached_scrape_autoscout24``.
+
+    Raises:
+        ScrapeInterrupted: A page failed transiently or the site's circuit is open.
+    """
+    from as24_crawl.sources import AutoScout24Source
+
+    query = {"country": country, "brand_model": brand_model, "year": year}
+    return page_crawler().crawl_query((AutoScout24Source(url_template, raw=True), query, start_page))
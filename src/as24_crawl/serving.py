@@ -0,0 +1,150 @@
+"""Batch price prediction for raw listings, ``as24-predict``.
+
+Loads the latest ``regressor`` from the catalog once and scores batches of raw records
+as returned by ``parse_listing``, either from Python:
+
+    predictor = PricePredictor.from_project()
+    predictor.predict([{"price": ..., "mileage": "78.500 km", "brand": "ford", ...}])
+
+or over HTTP:
+
+    as24-predict --port 8000
+    curl -X POST localhost:8000/predict -d '{"listings": [...]}'
+"""
+import argparse
+import json
+import logging
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from as24_crawl.pipelines.data_processing.cleanup import COLUMN_PROCESSORS
+from as24_crawl.pipelines.data_science.nodes import prepare_features
+
+logger = logging.getLogger(__name__)
+
+# Cached cleaned values per column before the cache is reset
+MAX_CACHED_VALUES = 100_000
+
+
+class PricePredictor:
+    """Scores raw listings with a regressor trained by the data_science pipeline.
+
+    Raw fields are cleaned with the same ``process_*`` functions as ``clean_data``.
+    Results are cached per distinct raw string, because most values ("Benzin",
+    "03/2017", "74 kW (101 PS)") repeat across listings and requests, so a warm
+    predictor only runs the pandas encoding and one vectorised ``predict`` per batch.
+    """
+
+    def __init__(self, regressor: Any, features: List[str]):
+        self._regressor = regressor
+        self._features = features
+        self._cleaned: Dict[str, Dict[Any, Any]] = {column: {} for column in COLUMN_PROCESSORS}
+
+    @classmethod
+    def from_project(cls, project_path: Optional[Path] = None, env: Optional[str] = None) -> "PricePredictor":
+        """Loads the latest ``regressor`` version and the model features of a Kedro project."""
+        from kedro.framework.session import KedroSession
+        from kedro.framework.startup import bootstrap_project
+
+        project_path = project_path or Path.cwd()
+        bootstrap_project(project_path)
+        with KedroSession.create(project_path=project_path, env=env) as session:
+            context = session.load_context()
+            return cls(context.catalog.load("regressor"), context.params["model_options"]["features"])
+
+    def encode(self, records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+        """Cleans raw records and returns their model features."""
+        data = pd.DataFrame.from_records(list(records))
+        for column, process in COLUMN_PROCESSORS.items():
+            if column in data:
+                data[column] = self._clean_column(column, process, data[column])
+        return prepare_features(data, self._features)
+
+    def predict(self, records: Iterable[Dict[str, Any]]) -> np.ndarray:
+        """Predicts prices, NaN for records with missing features."""
+        X = self.encode(records)
+        predictions = np.full(len(X), np.nan)
+        complete = X.notna().all(axis=1).to_numpy()
+        if complete.any():
+            predictions[complete] = self._regressor.predict(X[complete])
+        return predictions
+
+    def _clean_column(self, column: str, process: Callable, values: pd.Series) -> list:
+        cache = self._cleaned[column]
+        if len(cache) > MAX_CACHED_VALUES:
+            cache.clear()
+        cleaned = []
+        for value in values:
+            try:
+                cleaned.append(cache[value])
+            except KeyError:
+                missing = value is None or (isinstance(value, float) and math.isnan(value))
+                cache[value] = None if missing else process(value)
+                cleaned.append(cache[value])
+        return cleaned
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """``POST /predict`` with ``{"listings": [...]}`` or a plain list, ``GET /health``."""
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            records = body["listings"] if isinstance(body, dict) else body
+            predictions = self.server.predictor.predict(records)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, {"predictions": [None if math.isnan(p) else p for p in predictions.tolist()]})
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(predictor: PricePredictor, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    server.predictor = predictor
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="as24-predict", description="Serve price predictions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--env", help="Kedro configuration environment.")
+    args = parser.parse_args(argv)
+
+    server = create_server(PricePredictor.from_project(env=args.env), args.host, args.port)
+    logger.info(f"Serving predictions on http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,19 +7,36 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # from pandas_viz.hooks import ProjectHooks
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+from as24_crawl.hooks import ProfilingHooks, RunParametersHooks  # noqa: E402
+
+HOOKS = (ProfilingHooks(), RunParametersHooks())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
 
 # Class that manages storing KedroSession data.
+# kedro-viz is only needed for experiment tracking; environments that just crawl
+# (see as24_crawl.crawl) can skip installing it and fall back to Kedro's default store.
+# It is imported when a session creates its store, not with the settings.
+from importlib.util import find_spec  # noqa: E402
 from pathlib import Path  # noqa: E402
 
-from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore  # noqa: E402
+from kedro.framework.session.store import BaseSessionStore  # noqa: E402
+
+
+class LazySQLiteStore(BaseSessionStore):
+    """kedro-viz's ``SQLiteStore``, imported on first use."""
+
+    def __new__(cls, *args, **kwargs):
+        from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore
+
+        return SQLiteStore(*args, **kwargs)
+
 
-SESSION_STORE_CLASS = SQLiteStore
-# Keyword arguments to pass to the `SESSION_STORE_CLASS` constructor.
-SESSION_STORE_ARGS = {"path": str(Path(__file__).parents[2])}
+if find_spec("kedro_viz") is not None:
+    SESSION_STORE_CLASS = LazySQLiteStore
+    # Keyword arguments to pass to the `SESSION_STORE_CLASS` constructor.
+    SESSION_STORE_ARGS = {"path": str(Path(__file__).parents[2])}
 
 # Directory that holds configuration.
 # CONF_SOURCE = "conf"
@@ -0,0 +1,41 @@
+"""Marketplaces crawled by the ``multi_source`` pipeline.
+
+Adding a marketplace means implementing a ``SourceAdapter`` and registering it in
+``SOURCES``; scheduling, fetching and the output schema are shared. The segments of the
+``data_processing`` pipeline are crawled with ``AutoScout24Source`` too, see
+``as24_crawl.scraping.scrape_autoscout24``.
+"""
+from .auto1 import Auto1Source
+from .autoscout24 import AutoScout24Source
+from .base import (
+    COUNTRY_CODES,
+    RECORD_FIELDS,
+    SourceAdapter,
+    SourcePage,
+    SourceRequest,
+    normalise_country,
+    normalise_name,
+)
+from .runner import RateLimiter, RequestBudgetExhausted, SourceCrawler
+
+# Name in parameters/multi_source.yml -> adapter
+SOURCES = {
+    AutoScout24Source.name: AutoScout24Source,
+    Auto1Source.name: Auto1Source,
+}
+
+__all__ = [
+    "COUNTRY_CODES",
+    "RECORD_FIELDS",
+    "SOURCES",
+    "Auto1Source",
+    "AutoScout24Source",
+    "RateLimiter",
+    "RequestBudgetExhausted",
+    "SourceAdapter",
+    "SourceCrawler",
+    "SourcePage",
+    "SourceRequest",
+    "normalise_country",
+    "normalise_name",
+]
@@ -0,0 +1,109 @@
+import json
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from as24_crawl.fetching import FetchError
+
+from .base import SourceAdapter, SourcePage, SourceRequest, normalise_country, normalise_name
+
+GRAPHQL_ENDPOINT = "https://api-customer.prod.retail.auto1.cloud/v1/retail-customer-gateway/graphql"
+HEADERS = {
+    "accept": "*/*",
+    "accept-language": "en-US,en;q=0.9",
+    "content-type": "application/json",
+    "origin": "https://www.autohero.com",
+    "referer": "https://www.autohero.com/",
+    "user-agent": "Mozilla/5.0",
+}
+BATCH_SIZE = 24
+QUERY_TEMPLATE = {
+    "operationName": "searchAdV9AdsV2",
+    "variables": {
+        "search": {
+            "offset": 0,
+            "limit": BATCH_SIZE,
+            "sort": "most_popular",
+            "filter": {"field": "countryCode", "op": "eq", "value": "NL"},
+            "aggs": [],
+            "postFilter": None,
+            "fields": ["registration"],
+            "properties": {
+                "firstPublishedDays": 30,
+                "shuffleCategoryBResults": True,
+                "resultsCombiner": "abbabbc",
+                "filterByEligibleDate": True,
+            },
+        }
+    },
+    "query": "query searchAdV9AdsV2($search: EsSearchRequestProjectionInput!, $tradeInId: UUID) {\n  searchAdV9AdsV2(search: $search, tradeInId: $tradeInId)\n}",
+}
+# Record field -> path of the value in an ad of the search response. Not checked against
+# a captured response yet, see ``Auto1Source``
+AD_FIELDS = {
+    "url": ("url",),
+    "brand": ("manufacturer",),
+    "model": ("model",),
+    "price": ("price",),
+    "mileage": ("mileage", "distance"),
+    "first_registration": ("firstRegistrationDate",),
+    "fuel_type": ("fuelType",),
+    "transmission": ("gearType",),
+    "engine_power": ("powerKw",),
+}
+
+
+def _lookup(ad: Dict[str, Any], path: tuple) -> Any:
+    value = ad
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+@dataclass
+class Auto1Source(SourceAdapter):
+    """Ads of auto1's retail shop (autohero) from its GraphQL search API, one query per country.
+
+    Experimental: the request follows the old auto1 crawler, but the field names in
+    ``AD_FIELDS`` are assumed, since no search response was ever captured. Check the
+    ``multi_source_results`` of a first run (fields missing from every ad are logged)
+    and correct ``AD_FIELDS`` before relying on them.
+
+    Args:
+        countries: ISO 3166 country codes, as expected by the search API.
+    """
+
+    name = "auto1"
+
+    countries: List[str]
+
+    def queries(self) -> List[Dict[str, Any]]:
+        return [{"country": country} for country in dict.fromkeys(self.countries)]
+
+    def request(self, query: Dict[str, Any], page: int) -> SourceRequest:
+        body = deepcopy(QUERY_TEMPLATE)
+        body["variables"]["search"]["filter"]["value"] = query["country"]
+        body["variables"]["search"]["offset"] = page * BATCH_SIZE
+        return SourceRequest(GRAPHQL_ENDPOINT, method="POST", json=body, headers=HEADERS)
+
+    def parse(self, text: str, query: Dict[str, Any]) -> SourcePage:
+        response = json.loads(text)
+        if response.get("errors"):
+            raise FetchError(GRAPHQL_ENDPOINT, 200, f"GraphQL errors: {response['errors']}")
+        ads = response["data"]["searchAdV9AdsV2"]["data"]
+        return SourcePage(ads, has_next=len(ads) == BATCH_SIZE)
+
+    def item_id(self, item: Dict[str, Any]) -> str:
+        return str(item["id"])
+
+    def to_record(self, item: Dict[str, Any], query: Dict[str, Any]) -> Dict[str, Any]:
+        record = {field: _lookup(item, path) for field, path in AD_FIELDS.items()}
+        return {
+            **record,
+            "ad_id": self.item_id(item),
+            "country": normalise_country(query["country"]),
+            "brand": normalise_name(record["brand"]),
+            "model": normalise_name(record["model"]),
+        }
@@ -0,0 +1,82 @@
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from bs4 import BeautifulSoup
+
+from as24_crawl.scraping import parse_listing
+
+from .base import SourceAdapter, SourcePage, SourceRequest, normalise_country, normalise_name
+
+
+@dataclass
+class AutoScout24Source(SourceAdapter):
+    """autoscout24 result pages, one query per country / brand_model / registration year.
+
+    Also crawls the segments of the ``data_processing`` pipeline, see ``scrape_autoscout24``.
+
+    Args:
+        url_template: Search URL with ``{country}``, ``{brand_model}``, ``{page}`` and
+            ``{year}`` placeholders, see ``build_url_template``.
+        countries: autoscout24 country codes.
+        brand_model: ``brand/model`` pairs as in autoscout24 URLs.
+        year_range: First and last registration year.
+        raw: Keep the items as ``parse_listing`` returns them instead of mapping them to
+            ``RECORD_FIELDS``.
+    """
+
+    name = "autoscout24"
+    first_page = 1
+
+    url_template: str
+    countries: List[str] = field(default_factory=list)
+    brand_model: List[str] = field(default_factory=list)
+    year_range: List[int] = field(default_factory=list)
+    raw: bool = False
+
+    def queries(self) -> List[Dict[str, Any]]:
+        years = range(self.year_range[0], self.year_range[1] + 1)
+        return [
+            {"country": country, "brand_model": brand_model, "year": year}
+            for country, brand_model, year in itertools.product(dict.fromkeys(self.countries), dict.fromkeys(self.brand_model), years)
+        ]
+
+    def request(self, query: Dict[str, Any], page: int) -> SourceRequest:
+        return SourceRequest(self.url_template.format(page=page, **query))
+
+    def parse(self, text: str, query: Dict[str, Any]) -> SourcePage:
+        soup = BeautifulSoup(text, "html.parser")
+        items = []
+        for listing in soup.find_all("article", class_="cldt-summary-full-item"):
+            try:
+                items.append(parse_listing(listing))
+            except Exception:
+                # logged by parse_listing
+                continue
+        next_page = soup.find_all("li", class_="prev-next")
+        has_next = len(next_page) > 1 and "pagination-item--disabled" not in next_page[1].get("class", [])
+        return SourcePage(items, has_next)
+
+    def item_id(self, item: Dict[str, Any]) -> str:
+        return item["url"].split("?")[0].rstrip("/").split("/")[-1]
+
+    def to_record(self, item: Dict[str, Any], query: Dict[str, Any]) -> Dict[str, Any]:
+        if self.raw:
+            return item
+        # imported here, the raw crawl runs in pool workers that do not load pandas
+        from as24_crawl.pipelines.data_processing.cleanup import COLUMN_PROCESSORS
+
+        brand, model = query["brand_model"].split("/")
+        return {
+            "ad_id": self.item_id(item),
+            "url": item["url"],
+            "country": normalise_country(query["country"]),
+            "brand": normalise_name(brand),
+            "model": normalise_name(model),
+            "price": COLUMN_PROCESSORS["price"](item["price"]),
+            "mileage": COLUMN_PROCESSORS["mileage"](item["mileage"]),
+            "first_registration": COLUMN_PROCESSORS["first_registration"](item["first_registration"]),
+            "fuel_type": item["fuel_type"],
+            "transmission": item["transmission"],
+            "engine_power": COLUMN_PROCESSORS["engine_power"](item["engine_power"]),
+        }
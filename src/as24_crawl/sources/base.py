@@ -0,0 +1,94 @@
+"""Interface implemented by every marketplace crawled by ``SourceCrawler``."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Columns of the records of all sources, values cleaned to the units and spelling of
+# ``cleaned_results``: autoscout24 country codes, lowercase brands and models
+RECORD_FIELDS = [
+    "source",
+    "ad_id",
+    "url",
+    "country",
+    "brand",
+    "model",
+    "price",
+    "mileage",
+    "first_registration",
+    "fuel_type",
+    "transmission",
+    "engine_power",
+]
+# ISO 3166 country code -> autoscout24's
+COUNTRY_CODES = {"AT": "A", "BE": "B", "DE": "D", "ES": "E", "FR": "F", "IT": "I", "LU": "L", "NL": "NL"}
+
+
+def normalise_country(code: str) -> str:
+    """The autoscout24 code of an ISO 3166 country code, codes without one are upper cased."""
+    code = code.strip().upper()
+    return COUNTRY_CODES.get(code, code)
+
+
+def normalise_name(name: Optional[str]) -> Optional[str]:
+    """Brand or model name as in autoscout24 URLs, e.g. ``"Range Rover"`` -> ``"range-rover"``."""
+    if name is None:
+        return None
+    return "-".join(name.lower().split())
+
+
+@dataclass
+class SourceRequest:
+    url: str
+    method: str = "GET"
+    json: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class SourcePage:
+    """Items parsed from one response and whether the source reports another page."""
+
+    items: List[Dict[str, Any]]
+    has_next: bool = True
+
+
+class SourceAdapter(ABC):
+    """A marketplace: which queries to crawl, how to request and parse their pages and
+    how to map its items to ``RECORD_FIELDS``.
+
+    A query is one unit of work, e.g. a country or a country / model / year segment, and
+    is paged through until ``should_stop``.
+    """
+
+    name = ""
+    # number of a query's first page
+    first_page = 0
+    # stop paging once this share of a page's items was already seen
+    seen_threshold = 0.5
+
+    @abstractmethod
+    def queries(self) -> List[Dict[str, Any]]:
+        """All queries to crawl."""
+
+    @abstractmethod
+    def request(self, query: Dict[str, Any], page: int) -> SourceRequest:
+        """Request of page ``page`` (counting from ``first_page``) of ``query``."""
+
+    @abstractmethod
+    def parse(self, text: str, query: Dict[str, Any]) -> SourcePage:
+        """Parses a response body."""
+
+    @abstractmethod
+    def item_id(self, item: Dict[str, Any]) -> str:
+        """Id of an item, used to detect repeated items across pages."""
+
+    @abstractmethod
+    def to_record(self, item: Dict[str, Any], query: Dict[str, Any]) -> Dict[str, Any]:
+        """Maps an item to ``RECORD_FIELDS``, except ``source``, using ``normalise_country``
+        and ``normalise_name`` for the country, brand and model."""
+
+    def should_stop(self, page: SourcePage, new_items: List[Dict[str, Any]]) -> bool:
+        """Whether paging ``query`` is done after ``page``, of which ``new_items`` were not seen before."""
+        if not page.items or not page.has_next:
+            return True
+        return len(page.items) - len(new_items) >= self.seen_threshold * len(page.items)
@@ -0,0 +1,221 @@
+"""Crawls any number of sources concurrently under one budget.
+
+All queries of all sources share a thread pool, one ``requests.Session`` (so
+connections are reused per host), a token bucket per host, a circuit breaker and retry
+budget (see ``as24_crawl.fetching``) and a cap on the number of requests, retries
+included. Concurrent GET requests of the same URL share one fetch.
+Queries hitting an open circuit or running out of retries are deferred like crawl tasks,
+see ``run_deferrable``, and resume at the page that failed.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import RetryCallState, Retrying, stop_after_attempt, wait_exponential
+
+from as24_crawl import fetching
+from as24_crawl.fetching import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CoalescingFetcher,
+    FetchError,
+    RetryableFetchError,
+    RetryBudget,
+)
+from as24_crawl.scheduler import TokenBucket
+from as24_crawl.scraping import MAX_FETCH_ATTEMPTS, ScrapeInterrupted, run_deferrable
+
+from .base import SourceAdapter, SourceRequest
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBudgetExhausted(Exception):
+    """Raised instead of sending a request once ``max_requests`` were sent."""
+
+
+class RateLimiter:
+    """A token bucket per host, ``rates`` in requests per hour, ``default_rate`` for other hosts.
+
+    Hosts without a rate are not limited.
+    """
+
+    def __init__(
+        self,
+        rates: Dict[str, float],
+        default_rate: Optional[float],
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._rates = rates
+        self._default_rate = default_rate
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> None:
+        """Blocks until a request to the host of ``url`` may be sent."""
+        host = urlsplit(url).netloc
+        rate = self._rates.get(host, self._default_rate)
+        if rate is None:
+            return
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(rate, self._burst, self._clock)
+            # the token is reserved right away, so concurrent callers queue up behind it
+            wait = self._buckets[host].wait_time(1)
+            self._buckets[host].consume(1)
+        if wait > 0:
+            self._sleep(wait)
+
+
+class SourceCrawler:
+    """Fetches and pages through the queries of source adapters.
+
+    Args:
+        parameters: Parameters defined in parameters/multi_source.yml, or ``params:crawl``
+            of parameters/data_processing.yml for autoscout24 segments. ``max_requests``
+            and ``default_rate_limit`` may be None for no cap, ``page_cache`` configures
+            the ``CoalescingFetcher`` of GET requests.
+        session: HTTP session, a pooled ``requests.Session`` by default.
+        sleep: Used to wait for rate limits, between retries and for deferred queries.
+    """
+
+    def __init__(
+        self,
+        parameters: Dict[str, Any],
+        session: Optional[requests.Session] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._parameters = parameters
+        if session is None:
+            session = requests.Session()
+            pool = HTTPAdapter(pool_maxsize=parameters["max_workers"])
+            session.mount("https://", pool)
+            session.mount("http://", pool)
+        self.session = session
+        self._sleep = sleep
+        self.rate_limiter = RateLimiter(
+            parameters.get("rate_limits") or {}, parameters.get("default_rate_limit"), parameters["burst"], sleep=sleep
+        )
+        self.breaker = CircuitBreaker()
+        self.retry_budget = RetryBudget(ratio=parameters["retry_ratio"])
+        page_cache = parameters.get("page_cache") or {}
+        self.pages = CoalescingFetcher(self._get, ttl=page_cache.get("ttl_seconds", 0), max_bytes=page_cache.get("max_bytes", 8 * 2**20))
+        self._requests_left = parameters.get("max_requests")
+        self._lock = threading.Lock()
+
+    def _take_request(self) -> bool:
+        with self._lock:
+            if self._requests_left is None:
+                return True
+            if self._requests_left <= 0:
+                return False
+            self._requests_left -= 1
+            return True
+
+    def _should_retry(self, retry_state: RetryCallState) -> bool:
+        # the budget is only asked once another attempt will actually follow
+        return (
+            isinstance(retry_state.outcome.exception(), RetryableFetchError)
+            and retry_state.attempt_number < MAX_FETCH_ATTEMPTS
+            and self.retry_budget.try_retry()
+        )
+
+    def _send(self, request: SourceRequest) -> str:
+        for attempt in Retrying(
+            stop=stop_after_attempt(MAX_FETCH_ATTEMPTS),
+            wait=wait_exponential(multiplier=1, min=1, max=8),
+            retry=self._should_retry,
+            sleep=self._sleep,
+            reraise=True,
+        ):
+            with attempt:
+                if not self._take_request():
+                    raise RequestBudgetExhausted(request.url)
+                self.rate_limiter.acquire(request.url)
+                return fetching.get(
+                    request.url,
+                    self.breaker,
+                    self.retry_budget,
+                    session=self.session,
+                    method=request.method,
+                    json=request.json,
+                    headers=request.headers,
+                )
+
+    def _get(self, url: str) -> str:
+        return self._send(SourceRequest(url))
+
+    def fetch(self, request: SourceRequest) -> str:
+        """Sends ``request`` with retries, every attempt counting toward ``max_requests``.
+
+        Plain GET requests go through ``pages``, so concurrent requests of a URL share one.
+
+        Raises:
+            RequestBudgetExhausted: If ``max_requests`` were sent before an attempt.
+            FetchError: See ``as24_crawl.fetching.get``.
+        """
+        if request.method == "GET" and request.json is None and not request.headers:
+            return self.pages.fetch(request.url)
+        return self._send(request)
+
+    def crawl_query(self, task: Tuple[SourceAdapter, Dict[str, Any], int]) -> List[Dict[str, Any]]:
+        """Pages through a query of a source, starting at the given page, and returns its records.
+
+        Paging stops early, keeping the records, once ``max_requests`` were sent or a page
+        failed for good. The records do not have a ``source`` yet.
+
+        Raises:
+            ScrapeInterrupted: A page failed transiently or the host's circuit is open;
+                carries the records of the pages before it and the page to resume at.
+        """
+        adapter, query, page = task
+        seen, records = set(), []
+        while True:
+            request = adapter.request(query, page)
+            try:
+                text = self.fetch(request)
+            except RequestBudgetExhausted:
+                logger.warning(f"Request budget exhausted, stopping {adapter.name} query {query}.")
+                break
+            except CircuitOpenError as e:
+                raise ScrapeInterrupted(request.url, records, page, e.retry_after) from e
+            except RetryableFetchError as e:
+                # retries or the retry budget ran out, keep what we have and resume here later
+                raise ScrapeInterrupted(request.url, records, page) from e
+            except FetchError as e:
+                logger.error(f"Giving up on {adapter.name} query {query} at page {page}: {e}")
+                break
+            try:
+                result = adapter.parse(text, query)
+            except Exception as e:
+                logger.error(f"Failed to parse page {page} of {adapter.name} query {query}: {e}")
+                break
+            new_items = [item for item in result.items if adapter.item_id(item) not in seen]
+            seen.update(adapter.item_id(item) for item in new_items)
+            records.extend(adapter.to_record(item, query) for item in new_items)
+            if adapter.should_stop(result, new_items):
+                break
+            page += 1
+        return records
+
+    def run(self, adapters: List[SourceAdapter]) -> List[Dict[str, Any]]:
+        """Crawls all queries of ``adapters`` in a thread pool of ``max_workers``."""
+        tasks = [(adapter, query, adapter.first_page) for adapter in adapters for query in adapter.queries()]
+        records = []
+        with ThreadPoolExecutor(max_workers=self._parameters["max_workers"]) as executor:
+            crawled = run_deferrable(self.crawl_query, tasks, executor.map, sleep=self._sleep)
+            for (adapter, query, _), query_records in crawled:
+                records.extend({"source": adapter.name, **record} for record in query_records)
+                logger.info(f"Crawled {len(query_records)} records from {adapter.name} for {query}.")
+        logger.info(f"Finished crawling {len(records)} records from {len(tasks)} queries of {len(adapters)} sources.")
+        return records
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from kedro.io.core import DatasetError, Version
+
+from as24_crawl.datasets import ArrowCachedParquetDataset
+
+
+@pytest.fixture
+def cleaned_results():
+    return pd.DataFrame(
+        {
+            "price": [9490, 6250, None],
+            "country": ["NL", "D", "I"],
+            "first_registration": pd.to_datetime(["2017-03-01", "2012-11-01", None]),
+        }
+    )
+
+
+def versioned_dataset(tmp_path, version=None, **kwargs):
+    return ArrowCachedParquetDataset(
+        filepath=str(tmp_path / "cleaned_results.parquet"),
+        cache_dir=str(tmp_path / "arrow_cache"),
+        version=Version(version, version),
+        **kwargs,
+    )
+
+
+def test_load_writes_and_reuses_mirror(tmp_path, cleaned_results):
+    dataset = versioned_dataset(tmp_path, "2024-06-01T00.00.00.000Z", arrow_backed=True)
+    dataset.save(cleaned_results)
+
+    loaded = dataset.load()
+    mirrors = list((tmp_path / "arrow_cache").glob("cleaned_results-*/*.arrow"))
+    assert [mirror.name for mirror in mirrors] == ["2024-06-01T00.00.00.000Z.arrow"]
+    assert isinstance(loaded["price"].dtype, pd.ArrowDtype)
+    assert loaded["first_registration"].dt.year.tolist()[:2] == [2017, 2012]
+
+    mtime = mirrors[0].stat().st_mtime_ns
+    pd.testing.assert_frame_equal(dataset.load(), loaded)
+    assert mirrors[0].stat().st_mtime_ns == mtime
+
+
+def test_new_version_gets_new_mirror(tmp_path, cleaned_results):
+    for version in ["2024-06-01T00.00.00.000Z", "2024-06-02T00.00.00.000Z", "2024-06-03T00.00.00.000Z"]:
+        versioned_dataset(tmp_path, version).save(cleaned_results.assign(price=len(version)))
+        versioned_dataset(tmp_path, version, keep_mirrors=2).load()
+
+    latest = versioned_dataset(tmp_path, keep_mirrors=2).load()
+    mirrors = sorted(path.name for path in (tmp_path / "arrow_cache").glob("cleaned_results-*/*.arrow"))
+    assert mirrors == ["2024-06-02T00.00.00.000Z.arrow", "2024-06-03T00.00.00.000Z.arrow"]
+    assert latest["price"].tolist() == [24, 24, 24]
+
+
+def test_numpy_backed_columns_by_default(tmp_path, cleaned_results):
+    dataset = ArrowCachedParquetDataset(
+        filepath=str(tmp_path / "cleaned_results.parquet"),
+        cache_dir=str(tmp_path / "arrow_cache"),
+        load_args={"columns": ["country", "price"], "filters": [("price", ">", 7000)]},
+    )
+    dataset.save(cleaned_results)
+
+    loaded = dataset.load()
+    assert list(loaded.columns) == ["country", "price"]
+    assert loaded["country"].tolist() == ["NL"]
+    assert loaded["price"].dtype == "float64"
+
+
+def test_unsupported_load_args(tmp_path):
+    with pytest.raises(DatasetError, match="engine"):
+        ArrowCachedParquetDataset(filepath=str(tmp_path / "cleaned_results.parquet"), load_args={"engine": "fastparquet"})
+
+
+def test_same_file_name_in_different_directories(tmp_path, cleaned_results):
+    datasets = [
+        ArrowCachedParquetDataset(filepath=str(tmp_path / name / "cleaned_results.parquet"), cache_dir=str(tmp_path / "arrow_cache"))
+        for name in ("a", "b")
+    ]
+    datasets[0].save(cleaned_results)
+    datasets[1].save(cleaned_results.iloc[:1])
+
+    assert len(datasets[0].load()) == 3
+    assert len(datasets[1].load()) == 1
+    assert len(list((tmp_path / "arrow_cache").glob("cleaned_results-*"))) == 2
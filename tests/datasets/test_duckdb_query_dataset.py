@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+from kedro.io import DatasetError
+
+from as24_crawl.datasets import DuckDBQueryDataset
+
+
+def test_load_runs_query(tmp_path):
+    filepath = tmp_path / "cleaned_results.parquet"
+    pd.DataFrame({"country": ["NL", "D", "NL"], "price": [1, 2, 3]}).to_parquet(filepath)
+    dataset = DuckDBQueryDataset(
+        sql="SELECT country, sum(price) AS total FROM cleaned_results WHERE price > ? GROUP BY country ORDER BY country",
+        parameters=[1],
+        tables={"cleaned_results": str(filepath)},
+    )
+
+    assert dataset.load().to_dict("records") == [{"country": "D", "total": 2}, {"country": "NL", "total": 3}]
+
+
+def test_save_is_not_supported():
+    with pytest.raises(DatasetError, match="read-only"):
+        DuckDBQueryDataset(sql="SELECT 1").save(pd.DataFrame())
@@ -0,0 +1,13 @@
+from as24_crawl.datasets import OptionalDataset
+
+
+def test_loads_default_until_saved(tmp_path):
+    dataset = OptionalDataset(
+        dataset={"type": "pickle.PickleDataset", "filepath": str(tmp_path / "index.pickle"), "versioned": True},
+        default={},
+    )
+    assert dataset.load() == {}
+    assert not dataset.exists()
+
+    dataset.save({"ford/fiesta": 1})
+    assert dataset.load() == {"ford/fiesta": 1}
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from kedro.io.core import DatasetError
+
+from as24_crawl.datasets import TunedParquetDataset
+from as24_crawl.datasets.tuned_parquet_dataset import choose_layout
+
+
+@pytest.fixture
+def crawling_results():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame(
+        {
+            "url": [f"/angebote/vw-golf-{i}" for i in range(n)],
+            "price": [f"€ {price:,}" for price in rng.integers(1000, 40000, n)],
+            "brand": rng.choice(["vw", "bmw"], n),
+            "model": rng.choice(["golf", "polo", "3er"], n),
+            "country": rng.choice(["D", "NL", "I", "F"], n),
+            "year": rng.integers(2010, 2020, n),
+        }
+    )
+
+
+def test_save_sorts_and_compresses(tmp_path, crawling_results):
+    dataset = TunedParquetDataset(
+        filepath=str(tmp_path / "crawling_results.parquet"), layout={"sort_keys": ["model", "year"], "row_group_bytes": 1}
+    )
+    dataset.save(crawling_results)
+
+    metadata = pq.ParquetFile(tmp_path / "crawling_results.parquet").metadata
+    columns = {metadata.schema.column(i).name: metadata.row_group(0).column(i) for i in range(metadata.num_columns)}
+    assert {column.compression for column in columns.values()} == {"ZSTD"}
+    assert "RLE_DICTIONARY" in columns["model"].encodings
+    assert "RLE_DICTIONARY" not in columns["url"].encodings
+    # the minimum row group size applies
+    assert metadata.num_row_groups == 1
+
+    loaded = dataset.load()
+    assert loaded[["model", "year"]].equals(loaded[["model", "year"]].sort_values(["model", "year"]))
+    expected = crawling_results.sort_values(["model", "year"], kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(loaded, expected)
+
+
+def test_save_without_layout(tmp_path, crawling_results):
+    dataset = TunedParquetDataset(filepath=str(tmp_path / "crawling_results.parquet"), layout=None)
+    dataset.save(crawling_results)
+
+    metadata = pq.ParquetFile(tmp_path / "crawling_results.parquet").metadata
+    assert metadata.row_group(0).column(0).compression == "SNAPPY"
+    pd.testing.assert_frame_equal(dataset.load(), crawling_results)
+
+
+def test_choose_layout(crawling_results):
+    crawling_results["html"] = "<article>" + crawling_results["url"] + "x" * 500 + "</article>"
+    layout = choose_layout(pa.Table.from_pandas(crawling_results, preserve_index=False))
+
+    # fewest distinct values first, at most three
+    assert layout.sort_keys == ["brand", "model", "country"]
+    # url, html and price are (nearly) unique
+    assert set(layout.dictionary_columns) == {"brand", "model", "country"}
+    assert layout.compression_level["html"] == 9
+    assert layout.compression_level["url"] == 3
+    # about 32 MiB of rows of about 600 bytes
+    assert 45_000 < layout.row_group_size < 65_000
+
+
+def test_save_args_override_layout(tmp_path, crawling_results):
+    dataset = TunedParquetDataset(
+        filepath=str(tmp_path / "crawling_results.parquet"),
+        layout={"sort_keys": ["model"]},
+        save_args={"compression": "gzip", "row_group_size": 1000},
+    )
+    dataset.save(crawling_results)
+
+    metadata = pq.ParquetFile(tmp_path / "crawling_results.parquet").metadata
+    assert metadata.row_group(0).column(0).compression == "GZIP"
+    assert metadata.num_row_groups == 5
+    # the layout still applies where save_args leave it be
+    assert "RLE_DICTIONARY" in metadata.row_group(0).column(2).encodings
+    assert dataset.load()["model"].is_monotonic_increasing
+
+
+def test_partition_cols_need_layout_none(tmp_path):
+    with pytest.raises(DatasetError, match="partition_cols"):
+        TunedParquetDataset(filepath=str(tmp_path / "crawling_results.parquet"), save_args={"partition_cols": ["model"]})
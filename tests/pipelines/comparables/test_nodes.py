@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.comparables.nodes import find_comparables, score_listings, update_comparables_index
+
+
+@pytest.fixture
+def parameters():
+    return {"n_neighbors": 5, "categorical_weight": 2.0, "min_listings": 5}
+
+
+@pytest.fixture
+def cleaned_results():
+    rng = np.random.default_rng(3)
+    n = 60
+    mileage = rng.integers(10_000, 200_000, n)
+    year = rng.integers(2012, 2022, n)
+    data = pd.DataFrame(
+        {
+            "url": [f"/angebote/fiesta-{i}" for i in range(n)],
+            "brand": "ford",
+            "model": "fiesta",
+            "country": rng.choice(["NL", "D"], n),
+            "price": 30_000 - mileage * 0.05 - (2022 - year) * 800,
+            "mileage": mileage,
+            "first_registration": pd.to_datetime({"year": year, "month": 6, "day": 1}),
+            "engine_power": 74,
+            "fuel_type": "Benzin",
+            "transmission": "Schaltgetriebe",
+        }
+    )
+    # one bargain and a segment too small to index
+    data.loc[0, "price"] = data.loc[0, "price"] * 0.4
+    small = data.head(3).assign(model="puma", url=lambda df: df["url"] + "-puma")
+    return pd.concat([data, small], ignore_index=True)
+
+
+def test_score_listings_finds_bargain(cleaned_results, parameters):
+    index = update_comparables_index(cleaned_results, {}, parameters)
+    scores = score_listings(index)
+
+    assert list(index) == ["ford/fiesta"]
+    assert len(scores) == 60
+    assert scores.loc[0, "url"] == "/angebote/fiesta-0"
+    assert scores.loc[0, "residual_percentile"] == pytest.approx(1 / 60)
+
+
+def test_unchanged_segments_are_reused(cleaned_results, parameters):
+    index = update_comparables_index(cleaned_results, {}, parameters)
+    assert update_comparables_index(cleaned_results, index, parameters)["ford/fiesta"] is index["ford/fiesta"]
+
+    changed = cleaned_results.assign(price=cleaned_results["price"] + 1)
+    assert update_comparables_index(changed, index, parameters)["ford/fiesta"] is not index["ford/fiesta"]
+
+    for name, value in [("n_neighbors", 3), ("categorical_weight", 1.0), ("min_listings", 10)]:
+        assert update_comparables_index(cleaned_results, index, {**parameters, name: value})["ford/fiesta"] is not index["ford/fiesta"]
+
+
+def test_find_comparables_excludes_the_listing(cleaned_results, parameters):
+    index = update_comparables_index(cleaned_results, {}, parameters)
+    listing = cleaned_results.iloc[1].to_dict()
+
+    result = find_comparables(index, listing, k=3)
+    assert len(result["comparables"]) == 3
+    assert listing["url"] not in result["comparables"]["url"].tolist()
+
+    default = find_comparables(index, listing)
+    assert len(default["comparables"]) == parameters["n_neighbors"]
+    assert listing["url"] not in default["comparables"]["url"].tolist()
+
+    # a listing that is not in the index keeps its nearest neighbour
+    new = find_comparables(index, {**listing, "url": "/angebote/fiesta-new"}, k=3)
+    assert new["comparables"].loc[0, "url"] == listing["url"]
+
+
+def test_identical_listings_are_not_their_own_comparables(cleaned_results, parameters):
+    # same features, different prices: every one's comparables are exactly the others
+    twins = cleaned_results.head(6).assign(
+        mileage=50_000, first_registration=pd.Timestamp("2018-06-01"), price=[1000.0, 2000, 3000, 4000, 5000, 6000]
+    )
+    index = update_comparables_index(twins, {}, parameters)["ford/fiesta"]
+
+    prices = twins["price"].to_numpy()
+    expected = [np.median(np.delete(prices, row)) for row in range(len(prices))]
+    assert index["comparable_median_price"].tolist() == expected
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.data_processing.cleanup import COLUMN_PROCESSORS, clean_data
+
+RAW_FIELDS = json.loads((Path(__file__).parents[2] / "fixtures" / "autoscout24" / "raw_fields.json").read_text())
+
+
+
+def test_raw_fields_cover_every_processor():
+    assert set(RAW_FIELDS) == set(COLUMN_PROCESSORS)
+
+
+@pytest.mark.parametrize(
+    "column, raw, expected",
+    [(column, raw, expected) for column, cases in RAW_FIELDS.items() for raw, expected in cases],
+)
+def test_process_field(column, raw, expected):
+    result = COLUMN_PROCESSORS[column](raw)
+    if column == "first_registration":
+        assert (pd.isna(result) and expected is None) or result == pd.Timestamp(expected)
+    else:
+        assert result == expected
+
+
+def test_clean_data():
+    crawling_data = pd.DataFrame(
+        {
+            "price": ["€ 9.490,-", "Preis auf Anfrage"],
+            "mileage": ["78.500 km", "- km"],
+            "first_registration": ["03/2017", "-"],
+            "engine_power": ["74 kW (101 PS)", "- kW (- PS)"],
+            "co2_emission": ["104 g/km (komb.)", "-"],
+        }
+    )
+    cleaned = clean_data(crawling_data)
+
+    assert cleaned.loc[0, ["price", "mileage", "engine_power", "co2_emission"]].tolist() == [9490, 78500, 74, 104]
+    assert cleaned.loc[1, ["price", "mileage", "engine_power", "co2_emission", "first_registration"]].isna().all()
@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.runner import ThreadRunner
+
+from as24_crawl.datasets import TunedParquetDataset
+from as24_crawl.hooks import RunParametersHooks
+from as24_crawl.pipelines.data_processing import create_pipeline
+from as24_crawl.pipelines.data_processing.cleanup import clean_data
+from as24_crawl.pipelines.data_processing.crawl_nodes import concat_partitions
+from as24_crawl.pipelines.data_processing.pipeline import segment_namespace, segment_namespaces
+
+
+@pytest.fixture
+def crawl_parameters():
+    return {
+        "params:base_url": "https://www.autoscout24.de/lst/{brand_model}?cy={country}&page={page}",
+        "params:year_range": [2010, 2011],
+        "params:url_params": {"fregfrom": "{year}", "fregto": "{year}"},
+        "params:crawl": {"max_workers": 1, "max_requests": None, "retry_ratio": 0.1, "burst": 1},
+    }
+
+
+def fake_scrape_job(args):
+    url_template, country, brand_model, year, cache, start_page = args
+    return [{"url": f"/angebote/{brand_model}-{country}-{year}", "price": "€ 1.000,-", "country": country, "year": year}]
+
+
+def test_segment_namespace():
+    assert segment_namespace("NL", "ford/fiesta") == "crawl.NL.ford_fiesta"
+    assert segment_namespace("D", "bmw/1er-(alle)") == "crawl.D.bmw_1er_alle"
+
+
+def test_segment_namespaces_disambiguate_collisions():
+    namespaces = segment_namespaces([("D", "bmw/1er-(alle)"), ("D", "bmw/1er_alle"), ("D", "ford/fiesta")])
+
+    assert namespaces[("D", "ford/fiesta")] == "crawl.D.ford_fiesta"
+    assert namespaces[("D", "bmw/1er-(alle)")] != namespaces[("D", "bmw/1er_alle")]
+    assert namespaces[("D", "bmw/1er_alle")].startswith("crawl.D.bmw_1er_alle_")
+    pipeline = create_pipeline(countries=["D"], brand_model=["bmw/1er-(alle)", "bmw/1er_alle"])
+    assert len([n for n in pipeline.nodes if n.name.endswith("crawl_segment")]) == 2
+
+
+def test_pipeline_uses_run_parameters(mocker):
+    context = mocker.Mock(params={"countries": ["NL"], "brand_model": ["ford/fiesta"]})
+    mocker.patch("as24_crawl.hooks._run_state.parameters", None)
+    RunParametersHooks().after_context_created(context)
+
+    pipeline = create_pipeline()
+    assert [n.namespace for n in pipeline.nodes if n.name.endswith("crawl_segment")] == ["crawl.NL.ford_fiesta"]
+
+
+def test_pipeline_has_one_node_per_segment():
+    pipeline = create_pipeline(countries=["NL", "D"], brand_model=["ford/fiesta", "kia/ceed", "ford/fiesta"])
+    crawl_nodes = [n for n in pipeline.nodes if n.name.endswith("crawl_segment")]
+
+    assert len(crawl_nodes) == 4
+    assert len(pipeline.only_nodes_with_namespace("crawl.NL").nodes) == 2
+    assert pipeline.inputs() == {"params:base_url", "params:year_range", "params:url_params", "params:crawl"}
+
+
+def test_concat_partitions_skips_empty():
+    merged = concat_partitions(pd.DataFrame({"price": [1]}), pd.DataFrame(), pd.DataFrame({"price": [2]}))
+    assert merged["price"].tolist() == [1, 2]
+    assert concat_partitions().empty
+
+
+def test_empty_crawl_keeps_schema(tmp_path):
+    cleaned = clean_data(concat_partitions(pd.DataFrame(), pd.DataFrame()))
+    assert {"brand", "model", "country", "year", "price"} <= set(cleaned.columns)
+
+    dataset = TunedParquetDataset(
+        filepath=str(tmp_path / "cleaned_results.parquet"), layout={"sort_keys": ["brand", "model", "country", "year"]}
+    )
+    dataset.save(cleaned)
+    assert dataset.load().empty
+
+
+def test_crawl_pipeline_runs_threaded(mocker, crawl_parameters):
+    mocker.patch("as24_crawl.pipelines.data_processing.crawl_nodes.scrape_job", side_effect=fake_scrape_job)
+    pipeline = create_pipeline(countries=["NL", "D"], brand_model=["ford/fiesta"]).to_outputs("crawling_results")
+
+    catalog = DataCatalog({"crawling_results": MemoryDataset()})
+    catalog.add_feed_dict(crawl_parameters)
+    ThreadRunner().run(pipeline, catalog)
+
+    results = catalog.load("crawling_results")
+    assert len(results) == 4
+    assert set(results["country"]) == {"NL", "D"}
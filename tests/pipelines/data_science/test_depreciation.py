@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.data_science.depreciation import fit_depreciation_curves
+
+
+@pytest.fixture
+def parameters():
+    return {
+        "segment_keys": ["brand", "model", "country"],
+        "min_listings": 10,
+        "ridge": 1e-6,
+        "reference_date": "2024-01-01",
+    }
+
+
+def segment_listings(rng, model, country, new_price, yearly, per_10k_km, n=200):
+    age = rng.uniform(1, 12, n)
+    mileage = rng.uniform(5_000, 200_000, n)
+    price = new_price * (1 - yearly) ** age * (1 - per_10k_km) ** (mileage / 10_000) * np.exp(rng.normal(0, 0.01, n))
+    return pd.DataFrame(
+        {
+            "brand": "ford",
+            "model": model,
+            "country": country,
+            "price": price,
+            "mileage": mileage,
+            "first_registration": pd.Timestamp("2024-01-01") - pd.to_timedelta(age * 365.25, unit="D"),
+        }
+    )
+
+
+def test_fit_depreciation_curves(parameters):
+    rng = np.random.default_rng(1)
+    cleaned_results = pd.concat(
+        [
+            segment_listings(rng, "fiesta", "NL", 20_000, 0.10, 0.02),
+            segment_listings(rng, "fiesta", "D", 18_000, 0.08, 0.03),
+            segment_listings(rng, "focus", "D", 25_000, 0.12, 0.01),
+            segment_listings(rng, "puma", "D", 25_000, 0.12, 0.01, n=5),
+        ],
+        ignore_index=True,
+    )
+
+    curves = fit_depreciation_curves(cleaned_results, parameters).set_index(["model", "country"])
+
+    assert len(curves) == 3
+    assert curves.loc[("fiesta", "NL"), "yearly_depreciation"] == pytest.approx(0.10, abs=0.005)
+    assert curves.loc[("fiesta", "D"), "depreciation_per_10k_km"] == pytest.approx(0.03, abs=0.005)
+    assert np.exp(curves.loc[("focus", "D"), "intercept"]) == pytest.approx(25_000, rel=0.02)
+    assert (curves["r2"] > 0.99).all()
+    assert (curves["n_listings"] == 200).all()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.data_science.model_selection import assign_folds, design_matrix, select_model
+
+
+@pytest.fixture
+def model_input_table():
+    rng = np.random.default_rng(0)
+    n = 600
+    data = pd.DataFrame(
+        {
+            "mileage": rng.uniform(0, 200_000, n),
+            "registration_year": rng.integers(2010, 2024, n).astype("float64"),
+            "model": rng.choice(["fiesta", "golf", "polo", "focus", "a3", "ceed"], n),
+            "fuel_type": rng.choice(["Benzin", "Diesel"], n),
+        }
+    )
+    premium = data["model"].map({"fiesta": 0, "golf": 4000, "polo": 1000, "focus": 2000, "a3": 6000, "ceed": 500})
+    data["price"] = 8000 + 900 * (data["registration_year"] - 2010) - 0.03 * data["mileage"] + premium + rng.normal(0, 300, n)
+    return data
+
+
+@pytest.fixture
+def parameters():
+    return {
+        "n_splits": 3,
+        "group_by": None,
+        "random_state": 3,
+        "n_jobs": 2,
+        "cache_dir": None,
+        "feature_sets": {"numeric": ["mileage", "registration_year"], "with_model": ["mileage", "registration_year", "model"]},
+        "candidates": {
+            "linear": {"class": "sklearn.linear_model.LinearRegression"},
+            "ridge_log_price": {"class": "sklearn.linear_model.Ridge", "kwargs": {"alpha": 1.0}, "log_target": True},
+        },
+    }
+
+
+def test_design_matrix_one_hot_encodes_strings(model_input_table):
+    X = design_matrix(model_input_table, ["mileage", "model", "fuel_type"])
+    assert X.dtype == np.float32
+    assert X.shape == (600, 1 + 6 + 2)
+
+
+def test_group_folds_keep_groups_together(model_input_table, parameters):
+    folds = assign_folds(model_input_table, {**parameters, "group_by": "model"})
+    assert model_input_table.assign(fold=folds).groupby("model")["fold"].nunique().eq(1).all()
+    assert set(folds) == {0, 1, 2}
+
+
+def test_select_model(model_input_table, parameters, tmp_path):
+    results = select_model(model_input_table, {**parameters, "cache_dir": str(tmp_path)})
+
+    assert len(results) == 4
+    assert {"r2_mean", "r2_std", "mae_mean", "rmse_mean", "fit_seconds_mean"} <= set(results.columns)
+    assert results.iloc[0]["feature_set"] == "with_model"
+    assert results["mae_mean"].is_monotonic_increasing
+    # the shared matrices are removed after the run
+    assert list(tmp_path.iterdir()) == []
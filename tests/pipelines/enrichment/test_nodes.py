@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.enrichment.nodes import DETAIL_COLUMNS, ad_id, enrich_listings
+
+DETAIL_PAGE = (Path(__file__).parents[2] / "fixtures" / "autoscout24" / "detail_page.html").read_text()
+
+
+@pytest.fixture
+def parameters():
+    return {"detail_base_url": "https://www.autoscout24.de", "max_concurrency": 2, "max_requests_per_run": 100}
+
+
+@pytest.fixture
+def crawling_results():
+    return pd.DataFrame(
+        {
+            "url": [f"/angebote/ford-fiesta-{i}" for i in range(5)],
+            "price": [f"€ {9 + i}.000,-" for i in range(5)],
+            "mileage": ["50.000 km"] * 5,
+            "html": [f"<article data-guid='{i}'></article>" for i in range(5)],
+        }
+    )
+
+
+@pytest.fixture
+def fetch_page(mocker):
+    return mocker.patch("as24_crawl.pipelines.enrichment.nodes.fetch_page", return_value=DETAIL_PAGE)
+
+
+def test_ad_id():
+    assert ad_id("/angebote/ford-fiesta-titanium-0a1b2c3d?source=list") == "ford-fiesta-titanium-0a1b2c3d"
+
+
+def test_enrich_listings_first_run(fetch_page, crawling_results, parameters):
+    details = enrich_listings(crawling_results, None, parameters)
+
+    assert fetch_page.call_count == 5
+    fetch_page.assert_any_call("https://www.autoscout24.de/angebote/ford-fiesta-0")
+    assert list(details.columns) == DETAIL_COLUMNS
+    assert details["accident_free"].all()
+    assert details["location"].eq("1012AB Amsterdam, NL").all()
+
+
+def test_enrich_listings_only_fetches_new_and_changed(fetch_page, crawling_results, parameters):
+    previous = enrich_listings(crawling_results, None, parameters)
+    fetch_page.reset_mock()
+
+    current = crawling_results.copy()
+    current.loc[1, "price"] = "€ 8.500,-"
+    current.loc[2, "html"] = "<article data-guid='tracking-changed'></article>"
+    current.loc[5] = ["/angebote/ford-fiesta-5", "€ 7.000,-", "10.000 km", "<article></article>"]
+
+    details = enrich_listings(current, previous, parameters)
+
+    assert sorted(call.args[0] for call in fetch_page.call_args_list) == [
+        "https://www.autoscout24.de/angebote/ford-fiesta-1",
+        "https://www.autoscout24.de/angebote/ford-fiesta-5",
+    ]
+    assert sorted(details["ad_id"]) == [f"ford-fiesta-{i}" for i in range(6)]
+
+
+def test_enrich_listings_budget_prefers_new_ads(fetch_page, crawling_results, parameters):
+    previous = enrich_listings(crawling_results, None, parameters)
+    fetch_page.reset_mock()
+
+    current = crawling_results.assign(price="€ 1,-")
+    current.loc[5] = ["/angebote/ford-fiesta-5", "€ 7.000,-", "10.000 km", "<article></article>"]
+    details = enrich_listings(current, previous, {**parameters, "max_requests_per_run": 2})
+
+    assert fetch_page.call_args_list[0].args[0].endswith("ford-fiesta-5")
+    assert fetch_page.call_count == 2
+    # changed ads over the budget keep their old hash and are fetched by the next run
+    fetch_page.reset_mock()
+    enrich_listings(current, details, parameters)
+    assert fetch_page.call_count == 4
+
+
+def test_enrich_listings_skips_failed_pages(fetch_page, crawling_results, parameters):
+    fetch_page.side_effect = [DETAIL_PAGE, ConnectionError("reset"), DETAIL_PAGE, DETAIL_PAGE, DETAIL_PAGE]
+
+    details = enrich_listings(crawling_results, None, {**parameters, "max_concurrency": 1})
+
+    assert len(details) == 4
+    assert "ford-fiesta-1" not in set(details["ad_id"])
+
+
+def test_enrich_listings_drops_delisted_ads(fetch_page, crawling_results, parameters):
+    previous = enrich_listings(crawling_results, None, parameters)
+    fetch_page.reset_mock()
+
+    details = enrich_listings(crawling_results.drop(index=[0, 3]), previous, parameters)
+
+    assert fetch_page.call_count == 0
+    assert sorted(details["ad_id"]) == ["ford-fiesta-1", "ford-fiesta-2", "ford-fiesta-4"]
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.reporting.arbitrage import compute_price_arbitrage
+
+
+@pytest.fixture
+def parameters():
+    return {"mileage_band_km": 25_000, "min_listings": 5, "confidence_z": 1.96}
+
+
+@pytest.fixture
+def cleaned_results():
+    rng = np.random.default_rng(0)
+
+    def listings(country, model, mean_price, n, spread=300):
+        return pd.DataFrame(
+            {
+                "brand": "volkswagen",
+                "model": model,
+                "year": 2015,
+                "mileage": rng.integers(100_000, 125_000, n),
+                "price": rng.normal(mean_price, spread, n),
+                "country": country,
+            }
+        )
+
+    return pd.concat(
+        [
+            listings("D", "golf", 10_000, 30),
+            listings("NL", "golf", 12_000, 30),
+            listings("I", "golf", 11_000, 3),  # too few listings
+            listings("D", "polo", 8_000, 10, spread=3_000),
+            listings("NL", "polo", 9_000, 10, spread=3_000),
+        ],
+        ignore_index=True,
+    )
+
+
+def test_compute_price_arbitrage(cleaned_results, parameters):
+    arbitrage = compute_price_arbitrage(cleaned_results, parameters)
+
+    assert len(arbitrage) == 2
+    best = arbitrage.iloc[0]
+    assert (best["model"], best["buy_country"], best["sell_country"], best["mileage_band"]) == ("golf", "D", "NL", 100_000)
+    assert best["price_gap"] == pytest.approx(2_000, rel=0.1)
+    assert best["price_gap_ci_low"] > 0
+    # the noisy polo gap has a wide interval and ranks last
+    assert arbitrage.iloc[1]["model"] == "polo"
+    assert arbitrage.iloc[1]["price_gap_ci_high"] - arbitrage.iloc[1]["price_gap_ci_low"] > 2_000
+    assert arbitrage["rank"].tolist() == [1, 2]
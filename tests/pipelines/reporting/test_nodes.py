@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.reporting.nodes import render_price_vs_mileage_reports
+
+
+@pytest.fixture
+def parameters(tmp_path):
+    return {
+        "output_dir": str(tmp_path / "images"),
+        "max_mileage": 300_000,
+        "max_price": 30_000,
+        "bins": [60, 40],
+        "mileage_bin_km": 10_000,
+        "min_bin_listings": 5,
+        "min_listings": 50,
+        "max_workers": 2,
+    }
+
+
+def test_render_price_vs_mileage_reports(parameters):
+    rng = np.random.default_rng(0)
+    n = 2_000
+    mileage = rng.uniform(0, 250_000, n)
+    cleaned_results = pd.DataFrame(
+        {
+            "model": rng.choice(["fiesta", "focus"], n, p=[0.98, 0.02]),
+            "country": rng.choice(["NL", "D", "I"], n),
+            "mileage": mileage,
+            "price": 20_000 - mileage * 0.06 + rng.normal(0, 1_000, n),
+        }
+    )
+
+    manifest = render_price_vs_mileage_reports(cleaned_results, parameters)
+
+    assert sorted(manifest["key"]) == ["D", "I", "NL", "fiesta"]
+    for path in manifest["path"]:
+        with open(path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"
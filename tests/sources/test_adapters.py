@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from as24_crawl.fetching import FetchError
+from as24_crawl.scraping import build_url_template
+from as24_crawl.sources import Auto1Source, AutoScout24Source, SourcePage, normalise_country, normalise_name
+from as24_crawl.sources.auto1 import BATCH_SIZE, GRAPHQL_ENDPOINT
+
+FIXTURES = Path(__file__).parents[1] / "fixtures" / "autoscout24"
+RESULT_PAGE = (FIXTURES / "result_page.html").read_text()
+
+
+@pytest.fixture
+def autoscout24():
+    return AutoScout24Source(
+        build_url_template("https://www.autoscout24.de/lst/{brand_model}?cy={country}&page={page}", {"fregfrom": "{year}", "fregto": "{year}"}),
+        countries=["NL", "NL"],
+        brand_model=["ford/fiesta"],
+        year_range=[2016, 2017],
+    )
+
+
+def test_autoscout24_queries_and_requests(autoscout24):
+    queries = autoscout24.queries()
+
+    assert queries == [
+        {"country": "NL", "brand_model": "ford/fiesta", "year": 2016},
+        {"country": "NL", "brand_model": "ford/fiesta", "year": 2017},
+    ]
+    request = autoscout24.request(queries[0], autoscout24.first_page)
+    assert request.url == "https://www.autoscout24.de/lst/ford/fiesta?cy=NL&page=1&fregfrom=2016&fregto=2016"
+
+
+def test_autoscout24_parse_and_record(autoscout24):
+    query = {"country": "NL", "brand_model": "ford/fiesta", "year": 2017}
+    page = autoscout24.parse(RESULT_PAGE, query)
+    record = autoscout24.to_record(page.items[0], query)
+
+    # the fixture's last listing misses its mileage and is skipped
+    assert (len(page.items), page.has_next) == (5, True)
+    assert record["ad_id"] == "ford-fiesta-1-0-ecoboost-titanium-benzin-rot-0a1b2c3d"
+    assert (record["brand"], record["model"], record["price"], record["mileage"], record["engine_power"]) == ("ford", "fiesta", 9490, 78500, 74)
+    assert record["first_registration"] == pd.Timestamp("2017-03-01")
+
+
+def test_autoscout24_raw_items_are_kept(autoscout24):
+    raw = AutoScout24Source(autoscout24.url_template, raw=True)
+    item = raw.parse(RESULT_PAGE, {}).items[0]
+
+    assert raw.to_record(item, {"country": "NL", "brand_model": "ford/fiesta", "year": 2017}) is item
+
+
+def test_should_stop():
+    auto1 = Auto1Source(countries=["NL"])
+    items = [{"url": f"/angebote/{i}"} for i in range(4)]
+    assert auto1.should_stop(SourcePage([]), [])
+    assert auto1.should_stop(SourcePage(items, has_next=False), items)
+    assert auto1.should_stop(SourcePage(items), items[:2])
+    assert not auto1.should_stop(SourcePage(items), items[:3])
+
+
+def test_auto1_request_pages_by_offset():
+    request = Auto1Source(countries=["NL", "DE"]).request({"country": "DE"}, 2)
+
+    assert (request.url, request.method) == (GRAPHQL_ENDPOINT, "POST")
+    assert request.json["variables"]["search"]["filter"]["value"] == "DE"
+    assert request.json["variables"]["search"]["offset"] == 2 * BATCH_SIZE
+
+
+def test_auto1_parse_and_record():
+    auto1 = Auto1Source(countries=["NL"])
+    ad = {"id": 17, "manufacturer": "Ford", "model": "Fiesta", "price": 9990, "mileage": {"distance": 45000}, "powerKw": 74}
+    page = auto1.parse(json.dumps({"data": {"searchAdV9AdsV2": {"data": [ad]}}}), {"country": "NL"})
+
+    assert not page.has_next
+    record = auto1.to_record(page.items[0], {"country": "NL"})
+    assert (record["ad_id"], record["brand"], record["mileage"], record["engine_power"], record["url"]) == ("17", "ford", 45000, 74, None)
+
+    with pytest.raises(FetchError, match="GraphQL errors"):
+        auto1.parse(json.dumps({"errors": [{"message": "rate limited"}]}), {"country": "NL"})
+
+
+def test_auto1_records_use_autoscout24_spelling():
+    ad = {"id": 3, "manufacturer": "Land Rover", "model": "Range Rover Evoque"}
+    record = Auto1Source(countries=["DE"]).to_record(ad, {"country": "DE"})
+
+    assert (record["country"], record["brand"], record["model"]) == ("D", "land-rover", "range-rover-evoque")
+
+
+def test_normalise():
+    assert [normalise_country(code) for code in ["DE", "at", "NL", "PL"]] == ["D", "A", "NL", "PL"]
+    assert normalise_name(" Mercedes  Benz ") == "mercedes-benz"
+    assert normalise_name(None) is None
@@ -0,0 +1,180 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from as24_crawl.fetching import RetryableFetchError
+from as24_crawl.scraping import MAX_FETCH_ATTEMPTS, ScrapeInterrupted
+from as24_crawl.sources import RateLimiter, SourceAdapter, SourceCrawler, SourcePage, SourceRequest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """Serves ``pages[url]`` as a comma separated list of item ids."""
+
+    def __init__(self, pages: Dict[str, str], status_code: int = 200):
+        self.pages = pages
+        self.status_code = status_code
+        self.requests: List[str] = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append(url)
+        return FakeResponse(self.status_code, self.pages.get(url, ""))
+
+
+class FakeSource(SourceAdapter):
+    seen_threshold = 1.0
+
+    def __init__(self, name: str, host: str, queries: List[str]):
+        self.name = name
+        self._host = host
+        self._queries = queries
+
+    def queries(self) -> List[Dict[str, Any]]:
+        return [{"q": query} for query in self._queries]
+
+    def request(self, query, page):
+        return SourceRequest(f"https://{self._host}/{query['q']}?page={page}")
+
+    def parse(self, text, query):
+        return SourcePage([{"id": item} for item in text.split(",") if item])
+
+    def item_id(self, item):
+        return item["id"]
+
+    def to_record(self, item, query):
+        return {"ad_id": item["id"], "country": query["q"]}
+
+
+@pytest.fixture
+def parameters():
+    return {
+        "max_workers": 4,
+        "max_requests": 100,
+        "retry_ratio": 0.1,
+        "rate_limits": {"a.example.org": 3600},
+        "default_rate_limit": 7200,
+        "burst": 100,
+    }
+
+
+def test_crawls_all_sources_with_shared_session(parameters):
+    session = FakeSession(
+        {
+            "https://a.example.org/x?page=0": "1,2",
+            "https://a.example.org/x?page=1": "2,3",
+            "https://b.example.org/y?page=0": "7",
+        }
+    )
+    crawler = SourceCrawler(parameters, session=session)
+
+    records = crawler.run([FakeSource("a", "a.example.org", ["x"]), FakeSource("b", "b.example.org", ["y"])])
+
+    assert sorted((record["source"], record["ad_id"]) for record in records) == [("a", "1"), ("a", "2"), ("a", "3"), ("b", "7")]
+    # a stops on the empty third page, b on its empty second page
+    assert len(session.requests) == 5
+
+
+def test_global_request_budget(parameters):
+    session = FakeSession({f"https://a.example.org/x?page={page}": str(page) for page in range(10)})
+    crawler = SourceCrawler({**parameters, "max_requests": 3}, session=session)
+
+    assert len(crawler.run([FakeSource("a", "a.example.org", ["x"])])) == 3
+    assert len(session.requests) == 3
+
+
+class BrokenSource(FakeSource):
+    def parse(self, text, query):
+        raise ValueError("unexpected page layout")
+
+
+def test_failing_sources_do_not_stop_others(parameters):
+    session = FakeSession({"https://b.example.org/y?page=0": "7", "https://c.example.org/z?page=0": "1"})
+    sources = [BrokenSource("c", "c.example.org", ["z"]), FakeSource("b", "b.example.org", ["y"])]
+
+    assert [record["ad_id"] for record in SourceCrawler(parameters, session=session).run(sources)] == ["7"]
+
+
+def test_retries_count_toward_request_budget(parameters):
+    session = FakeSession({}, status_code=503)
+    crawler = SourceCrawler({**parameters, "max_requests": 3, "max_workers": 1}, session=session, sleep=lambda _: None)
+
+    assert crawler.run([FakeSource("a", "a.example.org", ["x", "y"])]) == []
+    assert len(session.requests) == 3
+
+
+def test_retries_stop_after_max_attempts(parameters):
+    session = FakeSession({}, status_code=503)
+    crawler = SourceCrawler(parameters, session=session, sleep=lambda _: None)
+
+    with pytest.raises(RetryableFetchError):
+        crawler.fetch(SourceRequest("https://a.example.org/x?page=0"))
+    # the last attempt takes nothing from the retry budget
+    assert len(session.requests) == MAX_FETCH_ATTEMPTS
+    assert crawler.retry_budget.retries == MAX_FETCH_ATTEMPTS - 1
+
+
+def test_error_statuses_are_not_parsed(parameters):
+    session = FakeSession({"https://a.example.org/x?page=0": "1"}, status_code=404)
+    assert SourceCrawler(parameters, session=session).run([FakeSource("a", "a.example.org", ["x"])]) == []
+
+
+class FlakySession(FakeSession):
+    """Answers 503 to the first ``failures`` requests of ``failing_url``."""
+
+    def __init__(self, pages: Dict[str, str], failing_url: str, failures: int):
+        super().__init__(pages)
+        self.failing_url = failing_url
+        self.failures = failures
+
+    def request(self, method, url, **kwargs):
+        if url == self.failing_url and self.failures > 0:
+            self.failures -= 1
+            self.requests.append(url)
+            return FakeResponse(503, "")
+        return super().request(method, url, **kwargs)
+
+
+def test_interrupted_query_keeps_its_records(parameters):
+    session = FlakySession({"https://a.example.org/x?page=0": "0"}, "https://a.example.org/x?page=1", MAX_FETCH_ATTEMPTS)
+    crawler = SourceCrawler(parameters, session=session, sleep=lambda _: None)
+
+    with pytest.raises(ScrapeInterrupted) as interrupted:
+        crawler.crawl_query((FakeSource("a", "a.example.org", ["x"]), {"q": "x"}, 0))
+    assert [record["ad_id"] for record in interrupted.value.results] == ["0"]
+    assert interrupted.value.next_page == 1
+
+
+def test_deferred_query_resumes_at_failed_page(parameters):
+    pages = {f"https://a.example.org/x?page={page}": str(page) for page in range(3)}
+    session = FlakySession(pages, "https://a.example.org/x?page=1", MAX_FETCH_ATTEMPTS)
+    crawler = SourceCrawler(parameters, session=session, sleep=lambda _: None)
+
+    assert sorted(record["ad_id"] for record in crawler.run([FakeSource("a", "a.example.org", ["x"])])) == ["0", "1", "2"]
+    # page 0 is not fetched, and charged to max_requests, again
+    assert session.requests.count("https://a.example.org/x?page=0") == 1
+    assert session.requests.count("https://a.example.org/x?page=1") == MAX_FETCH_ATTEMPTS + 1
+
+
+def test_rate_limiter_per_host():
+    clock, waits = FakeClock(), []
+    limiter = RateLimiter({"a.example.org": 3600}, default_rate=7200, burst=1, clock=clock, sleep=waits.append)
+
+    for _ in range(3):
+        limiter.acquire("https://a.example.org/x")
+    limiter.acquire("https://b.example.org/y")
+    limiter.acquire("https://b.example.org/y")
+
+    assert waits == [pytest.approx(1.0), pytest.approx(2.0), pytest.approx(0.5)]
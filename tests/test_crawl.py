@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from as24_crawl.crawl import load_parameters, main
+
+HEAVY_MODULES = ("pandas", "kedro", "typer", "tqdm", "loguru", "joblib", "numpy")
+
+
+def imported_heavy_modules(module):
+    code = f"import sys, {module}; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return output.strip()
+
+
+def test_worker_import_surface():
+    assert imported_heavy_modules("as24_crawl.scraping") == "[]"
+    assert imported_heavy_modules("as24_crawl.crawl") == "[]"
+
+def test_load_parameters_overlays_env():
+    parameters = load_parameters(Path.cwd() / "conf", "test")
+    assert parameters["countries"] == ["NL"]
+    assert parameters["brand_model"] == ["ford/fiesta"]
+    assert "base_url" in parameters
+
+
+def test_main_writes_jsonl(mocker, tmp_path):
+    run_crawl = mocker.patch("as24_crawl.crawl.run_crawl", return_value=[{"price": "€ 1.000,-"}])
+    output = tmp_path / "results.jsonl"
+
+    main(["--env", "test", "--years", "2015", "--brand-model", "kia/ceed", "--output", str(output)])
+
+    parameters = run_crawl.call_args.args[0]
+    assert parameters["year_range"] == [2015, 2015]
+    assert parameters["brand_model"] == ["kia/ceed"]
+    assert [json.loads(line) for line in output.read_text().splitlines()] == [{"price": "€ 1.000,-"}]
+
+
+def test_main_profile(mocker, tmp_path):
+    mocker.patch("as24_crawl.crawl.run_crawl", return_value=[{"price": "€ 1.000,-"}])
+    mocker.patch("as24_crawl.crawl.PROFILE_DIR", tmp_path / "profiles")
+
+    main(["--env", "test", "--profile", "--output", str(tmp_path / "results.jsonl")])
+
+    (run_dir,) = (tmp_path / "profiles").iterdir()
+    assert (run_dir / "flamegraph.svg").exists()
+    assert (run_dir / "allocations.txt").read_text().startswith("crawl: peak")
@@ -0,0 +1,225 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from as24_crawl.fetching import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CoalescingFetcher,
+    FetchError,
+    RetryableFetchError,
+    RetryBudget,
+    get,
+    normalize_url,
+)
+from as24_crawl.scraping import crawl_tasks, run_deferrable
+
+URL = "https://www.autoscout24.de/lst/ford/fiesta?page=1"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_url():
+    assert normalize_url("https://WWW.autoscout24.de/lst/ford/fiesta?page=2&cy=NL&search_id=abc") == normalize_url(
+        "https://www.autoscout24.de/lst/ford/fiesta?cy=NL&page=2&source=detailpage_back-to-list"
+    )
+    assert normalize_url("https://www.autoscout24.de/lst?cy=NL&page=2") != normalize_url("https://www.autoscout24.de/lst?cy=NL&page=3")
+
+
+def test_concurrent_requests_share_one_fetch():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch(url):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return "page"
+
+    fetcher = CoalescingFetcher(slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetcher.fetch("https://example.org/?b=2&a=1"))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while fetcher.stats["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["page"] * 5
+
+
+def test_completed_fetches_are_cached_until_ttl():
+    clock, calls = FakeClock(), []
+    fetcher = CoalescingFetcher(lambda url: calls.append(url) or "page", ttl=60, clock=clock)
+
+    fetcher.fetch("https://example.org/?a=1&cb=1")
+    fetcher.fetch("https://example.org/?cb=2&a=1")
+    clock.now = 61
+    fetcher.fetch("https://example.org/?a=1")
+
+    assert len(calls) == 2
+    assert fetcher.stats == {"fetches": 2, "cache_hits": 1}
+
+
+def test_completed_fetches_are_not_cached_by_default():
+    calls = []
+    fetcher = CoalescingFetcher(lambda url: calls.append(url) or "page")
+
+    fetcher.fetch("https://example.org/")
+    fetcher.fetch("https://example.org/")
+    assert len(calls) == 2
+
+
+def test_cache_is_bounded_by_bytes_and_purges_expired_pages():
+    clock = FakeClock()
+    fetcher = CoalescingFetcher(lambda url: url[-1] * 40, ttl=60, max_bytes=100, clock=clock)
+
+    for page in "abc":
+        fetcher.fetch(f"https://example.org/{page}")
+    # the oldest page made room for the third
+    assert list(fetcher._cache) == ["https://example.org/b", "https://example.org/c"]
+
+    clock.now = 61
+    fetcher.fetch("https://example.org/d")
+    assert list(fetcher._cache) == ["https://example.org/d"]
+    assert fetcher._cache_bytes == 40
+
+
+def test_failed_fetches_are_not_cached():
+    responses = iter([ConnectionError("reset"), "page"])
+
+    def flaky_fetch(url):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    fetcher = CoalescingFetcher(flaky_fetch)
+    with pytest.raises(ConnectionError):
+        fetcher.fetch("https://example.org/")
+    assert fetcher.fetch("https://example.org/") == "page"
+
+
+def test_crawl_tasks_are_distinct():
+    tasks = crawl_tasks("{country}{brand_model}{year}", ["NL", "NL"], ["ford/fiesta", "kia/ceed", "ford/fiesta"], [2015], "today")
+    assert [task[2] for task in tasks] == ["ford/fiesta", "kia/ceed"]
+
+
+def test_circuit_opens_per_host_and_recovers_after_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+    for _ in range(2):
+        breaker.record_failure(URL, 503)
+    breaker.record_failure(URL, 429)
+    breaker.check(URL)
+
+    breaker.record_failure(URL, 502)
+    with pytest.raises(CircuitOpenError) as e:
+        breaker.check(URL)
+    assert e.value.retry_after == 30
+    breaker.check("https://other.example.org/")
+
+    clock.now = 31
+    breaker.check(URL)
+    # only one probe while it is in flight
+    with pytest.raises(CircuitOpenError):
+        breaker.check(URL)
+    breaker.record_success(URL)
+    breaker.check(URL)
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure(URL, None)
+    clock.now = 31
+    breaker.check(URL)
+    breaker.record_failure(URL, None)
+    with pytest.raises(CircuitOpenError):
+        breaker.check(URL)
+
+
+def test_retry_budget():
+    budget = RetryBudget(ratio=0.1, min_retries=1)
+    for _ in range(20):
+        budget.record_request()
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+
+
+def test_get_raises_on_error_statuses(mocker):
+    breaker, budget = CircuitBreaker(failure_threshold=2), RetryBudget()
+    response = mocker.patch("as24_crawl.fetching.requests.request").return_value
+
+    response.status_code, response.text = 200, "page"
+    assert get(URL, breaker, budget) == "page"
+    response.status_code = 404
+    with pytest.raises(FetchError) as e:
+        get(URL, breaker, budget)
+    assert not isinstance(e.value, RetryableFetchError) and e.value.status == 404
+
+    response.status_code = 503
+    for _ in range(2):
+        with pytest.raises(RetryableFetchError):
+            get(URL, breaker, budget)
+    with pytest.raises(CircuitOpenError):
+        get(URL, breaker, budget)
+    assert budget.requests == 4
+
+
+def test_get_network_errors_are_retryable(mocker):
+    mocker.patch("as24_crawl.fetching.requests.request", side_effect=requests.exceptions.ConnectionError("reset"))
+    with pytest.raises(RetryableFetchError) as e:
+        get(URL, CircuitBreaker(), RetryBudget())
+    assert e.value.status is None
+
+
+def test_run_deferrable_requeues_tasks_on_open_circuit():
+    attempts, waits = {}, []
+
+    def job(args):
+        attempts[args] = attempts.get(args, 0) + 1
+        if args == "b" and attempts[args] == 1:
+            raise CircuitOpenError(URL, 12.0)
+        if args == "c":
+            raise FetchError(URL, 404)
+        return [args]
+
+    results = list(run_deferrable(job, ["a", "b", "c"], sleep=waits.append))
+
+    assert results == [("a", ["a"]), ("c", []), ("b", ["b"])]
+    assert waits == [12.0]
+
+
+def test_run_deferrable_gives_up_after_max_rounds():
+    def job(args):
+        raise CircuitOpenError(URL, 1.0)
+
+    waits = []
+    assert list(run_deferrable(job, ["a"], max_rounds=2, sleep=waits.append)) == []
+    assert waits == [1.0, 1.0]
+
+
+def test_run_deferrable_requeues_exhausted_retryable_errors():
+    attempts, waits = [], []
+
+    def job(args):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise RetryableFetchError(URL, 503)
+        return [args]
+
+    assert list(run_deferrable(job, ["a"], sleep=waits.append)) == [("a", ["a"])]
+    assert attempts == ["a", "a"]
@@ -0,0 +1,60 @@
+import time
+from multiprocessing import Pool
+
+from as24_crawl.hooks import ProfilingHooks
+from as24_crawl.profiling import PROFILE_DIR_ENV, StackSampler, merge_folded, start_worker_profiling
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return seconds
+
+
+class FakeNode:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_stack_sampler_records_folded_stacks(tmp_path):
+    sampler = StackSampler(interval=0.001).start()
+    busy(0.2)
+    sampler.stop()
+    sampler.write(tmp_path / "main-1.folded")
+
+    stacks = merge_folded([tmp_path / "main-1.folded"])
+    assert any(stack.startswith("main-1;MainThread;") and "busy (test_profiling.py" in stack for stack in stacks)
+
+
+def test_profiled_run_writes_worker_samples_and_allocations(tmp_path, monkeypatch):
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    hooks = ProfilingHooks(output_dir=str(tmp_path))
+    hooks.before_pipeline_run(run_params={"extra_params": {"profile": True}})
+
+    hooks.before_node_run(node=FakeNode("crawl_node"))
+    data = [bytearray(1024) for _ in range(1000)]
+    with Pool(2, initializer=start_worker_profiling) as pool:
+        assert pool.map(busy, [0.2, 0.2]) == [0.2, 0.2]
+        pool.close()
+        pool.join()
+    hooks.after_node_run(node=FakeNode("crawl_node"))
+    hooks.after_pipeline_run()
+
+    (run_dir,) = tmp_path.iterdir()
+    assert len(list(run_dir.glob("worker-*.folded"))) == 2
+    assert any("busy (test_profiling.py" in line and line.startswith("worker-") for line in (run_dir / "merged.folded").read_text().splitlines())
+    assert (run_dir / "flamegraph.svg").read_text().startswith("<svg")
+    assert (run_dir / "allocations.txt").read_text().startswith("crawl_node: peak")
+    assert "test_profiling.py" in (run_dir / "allocations.txt").read_text()
+    assert len(data) == 1000
+
+
+def test_profiling_is_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("AS24_PROFILE", raising=False)
+    hooks = ProfilingHooks(output_dir=str(tmp_path))
+    hooks.before_pipeline_run(run_params={"extra_params": {}})
+    hooks.before_node_run(node=FakeNode("clean_data"))
+    hooks.after_node_run(node=FakeNode("clean_data"))
+    hooks.after_pipeline_run()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from as24_crawl.query import median_price_by_country, query, resolve_parquet_path
+
+
+@pytest.fixture
+def tables(tmp_path):
+    versioned = tmp_path / "cleaned_results.parquet"
+    stale = pd.DataFrame({"model": ["golf"], "year": [2015], "mileage": [1000], "price": [1], "country": ["NL"]})
+    latest = pd.DataFrame(
+        {
+            "model": ["golf", "golf", "golf", "golf", "polo"],
+            "year": [2015, 2015, 2015, 2015, 2015],
+            "mileage": [90_000, 120_000, 140_000, 180_000, 50_000],
+            "price": [10_000, 12_000, 9_000, 5_000, 8_000],
+            "country": ["NL", "NL", "D", "D", "D"],
+        }
+    )
+    for version, data in [("2024-06-01T00.00.00.000Z", stale), ("2024-06-02T00.00.00.000Z", latest)]:
+        (versioned / version).mkdir(parents=True)
+        data.to_parquet(versioned / version / "cleaned_results.parquet")
+
+    for country in ["NL", "D"]:
+        (tmp_path / "crawl" / country).mkdir(parents=True)
+        pd.DataFrame({"country": [country], "price": ["€ 1.000,-"]}).to_parquet(tmp_path / "crawl" / country / "ford_fiesta.parquet")
+
+    return {"cleaned_results": str(versioned), "crawl_partitions": str(tmp_path / "crawl" / "*" / "*.parquet")}
+
+
+def test_resolve_parquet_path_picks_latest_version(tables):
+    assert resolve_parquet_path(tables["cleaned_results"]).endswith("2024-06-02T00.00.00.000Z/cleaned_results.parquet")
+
+
+def test_median_price_by_country(tables):
+    result = median_price_by_country("golf", 2015, 150_000, tables=tables, threads=2)
+    assert result.to_dict("records") == [
+        {"country": "D", "median_price": 9_000, "listings": 1},
+        {"country": "NL", "median_price": 11_000, "listings": 2},
+    ]
+
+
+def test_query_over_partitions(tables):
+    result = query("SELECT country FROM crawl_partitions ORDER BY country", tables=tables)
+    assert result["country"].tolist() == ["D", "NL"]
@@ -0,0 +1,119 @@
+import pytest
+
+from as24_crawl.fetching import FetchError
+from as24_crawl.scheduler import Scheduler, SegmentState, TokenBucket, run
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def parameters():
+    return {"min_interval_minutes": 30, "max_interval_hours": 48, "ewma_alpha": 1.0}
+
+
+def listings(*prices):
+    return [{"url": f"/angebote/ad-{i}", "price": price} for i, price in enumerate(prices)]
+
+
+def test_fast_changing_segment_is_crawled_first(parameters):
+    clock = FakeClock()
+    golf, fiesta = SegmentState("NL", "volkswagen/golf", 2015), SegmentState("NL", "ford/fiesta", 2015)
+    scheduler = Scheduler([golf, fiesta], parameters, clock=clock)
+
+    scheduler.record_crawl(golf, listings("€ 1", "€ 2"))
+    scheduler.record_crawl(fiesta, listings("€ 1", "€ 2"))
+    assert scheduler.next_segment() is None
+
+    clock.now += 3600
+    assert scheduler.record_crawl(golf, listings("€ 1", "€ 3", "€ 4")) == 2
+    assert scheduler.record_crawl(fiesta, listings("€ 1", "€ 2")) == 0
+    assert golf.change_rate == pytest.approx(2.0)
+
+    clock.now += 3600
+    assert scheduler.next_segment() is golf
+
+    clock.now += 49 * 3600
+    scheduler.record_crawl(golf, listings("€ 1", "€ 3", "€ 4"))
+    assert scheduler.next_segment() is fiesta
+
+
+def test_state_roundtrip(tmp_path, parameters):
+    golf = SegmentState("NL", "volkswagen/golf", 2015)
+    scheduler = Scheduler([golf], parameters)
+    scheduler.record_crawl(golf, listings("€ 1"))
+    scheduler.save(tmp_path / "state.json")
+
+    restored = Scheduler.load(tmp_path / "state.json", [SegmentState("NL", "volkswagen/golf", 2015)], parameters)
+    assert restored.segments[golf.key] == golf
+
+
+def test_token_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_hour=3600, burst=10, clock=clock)
+
+    assert bucket.wait_time(10) == 0
+    bucket.consume(15)
+    assert bucket.wait_time(5) == pytest.approx(10)
+    clock.now += 10
+    assert bucket.wait_time(5) == 0
+
+
+def test_run_charges_failed_crawls(mocker, tmp_path, parameters):
+    settings = {
+        **parameters,
+        "requests_per_hour": 3600,
+        "burst": 10,
+        "state_path": str(tmp_path / "state.json"),
+        "output_dir": str(tmp_path / "daemon"),
+    }
+    run_parameters = {
+        "scheduler": settings,
+        "base_url": "https://example.org/{brand_model}?cy={country}&page={page}",
+        "url_params": {"fregfrom": "{year}"},
+        "year_range": [2015, 2016],
+        "countries": ["NL"],
+        "brand_model": ["ford/fiesta"],
+    }
+    crawl_segment = mocker.patch(
+        "as24_crawl.scheduler.crawl_segment",
+        side_effect=[FetchError("https://example.org", 503), listings(*range(30))],
+    )
+    consume = mocker.patch.object(TokenBucket, "consume", autospec=True)
+
+    run(run_parameters, max_crawls=1, sleep=lambda seconds: None)
+
+    assert crawl_segment.call_count == 2
+    # one page estimated before each crawl, the second turned out to have two
+    assert [call.args[1] for call in consume.call_args_list] == [1, 1, 1]
+
+
+def test_failures_back_off_without_touching_last_crawled(parameters):
+    clock = FakeClock()
+    golf = SegmentState("NL", "volkswagen/golf", 2015)
+    scheduler = Scheduler([golf], parameters, clock=clock)
+    scheduler.record_crawl(golf, listings("€ 1", "€ 2"))
+
+    clock.now += 3600
+    scheduler.record_failure(golf)
+    assert golf.last_crawled == 0.0
+    assert scheduler.next_segment() is None
+    clock.now += 30 * 60
+    assert scheduler.next_segment() is golf
+
+    # the second failure in a row waits twice as long
+    scheduler.record_failure(golf)
+    clock.now += 30 * 60
+    assert scheduler.next_segment() is None
+    clock.now += 30 * 60
+    assert scheduler.next_segment() is golf
+
+    # changes are spread over the two and a half hours since the last successful crawl
+    scheduler.record_crawl(golf, listings("€ 1", "€ 3", "€ 4"))
+    assert golf.change_rate == pytest.approx(2 / 2.5)
+    assert (golf.failures, golf.retry_after) == (0, None)
@@ -0,0 +1,137 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from as24_crawl import scraping
+from as24_crawl.fetching import RetryableFetchError
+from as24_crawl.scraping import (
+    MAX_FETCH_ATTEMPTS,
+    parse_detail_page,
+    parse_listing,
+    run_deferrable,
+    scrape_autoscout24,
+    scrape_job,
+)
+from as24_crawl.sources import SourceCrawler
+
+RESULT_PAGE = (Path(__file__).parent / "fixtures" / "autoscout24" / "result_page.html").read_text()
+LAST_PAGE = RESULT_PAGE.replace('<li class="prev-next"><button class="FilteredListPagination_button__41hHM" aria-label="Zur nächsten Seite"', '<li class="prev-next pagination-item--disabled"><button class="FilteredListPagination_button__41hHM" aria-label="Zur nächsten Seite"')
+DETAIL_PAGE = (Path(__file__).parent / "fixtures" / "autoscout24" / "detail_page.html").read_text()
+
+
+@pytest.fixture
+def get(mocker):
+    crawler = SourceCrawler(scraping.DEFAULT_CRAWL_PARAMETERS, sleep=lambda seconds: None)
+    mocker.patch.object(scraping._crawler_state, "crawler", crawler)
+    return mocker.patch("as24_crawl.sources.runner.fetching.get", return_value=RESULT_PAGE)
+
+
+@pytest.fixture
+def listings():
+    return BeautifulSoup(RESULT_PAGE, "html.parser").find_all("article", class_="cldt-summary-full-item")
+
+
+def test_parse_listing(listings):
+    data = parse_listing(listings[0])
+
+    assert data["url"] == "/angebote/ford-fiesta-1-0-ecoboost-titanium-benzin-rot-0a1b2c3d"
+    assert data["subtitle"] == "1.0 EcoBoost Titanium"
+    assert data["price"] == "€ 9.490,-"
+    assert data["mileage"] == "78.500 km"
+    assert data["first_registration"] == "03/2017"
+    assert data["engine_power"] == "74 kW (101 PS)"
+    assert data["co2_emission"] == "104 g/km (komb.)"
+    assert data["vat_deductible"] is True
+    assert data["html"].startswith("<article")
+
+
+def test_parse_listing_edge_cases(listings):
+    on_request, no_values = parse_listing(listings[2]), parse_listing(listings[3])
+
+    assert on_request["price"] == "Preis auf Anfrage"
+    assert on_request["vat_deductible"] is False
+    assert no_values["engine_power"] == "- kW (- PS)"
+    assert no_values["first_registration"] == "-"
+
+
+def test_parse_listing_missing_required(listings):
+    with pytest.raises(ValueError, match="Missing mileage"):
+        parse_listing(listings[-1])
+
+
+def test_scrape_stops_on_seen_ads(get):
+    results = scrape_autoscout24("https://example.org/{brand_model}?cy={country}&page={page}&fregfrom={year}", "NL", "ford/fiesta", 2017, cache="test")
+
+    # the second page repeats every ad, so pagination stops there
+    assert get.call_count == 2
+    assert len(results) == 5
+
+
+def test_scrape_stops_on_last_page(get):
+    get.return_value = LAST_PAGE
+
+    results = scrape_autoscout24("https://example.org/{brand_model}?cy={country}&page={page}", "NL", "ford/fiesta", 2017, cache=None, start_page=3)
+
+    assert [call.args[0] for call in get.call_args_list] == ["https://example.org/ford/fiesta?cy=NL&page=3"]
+    assert results[0]["url"] == "/angebote/ford-fiesta-1-0-ecoboost-titanium-benzin-rot-0a1b2c3d"
+
+
+def test_scrape_job_without_cache_key_skips_joblib(get):
+    scraping.cached_scrape_autoscout24.cache_clear()
+
+    results = scrape_job(("https://example.org/{brand_model}?cy={country}&page={page}", "NL", "ford/fiesta", 2017, None, 1))
+
+    assert {result["country"] for result in results} == {"NL"}
+    assert scraping.cached_scrape_autoscout24.cache_info().currsize == 0
+
+
+def test_transient_failure_is_requeued_and_keeps_its_pages(get):
+    failures = [RetryableFetchError("https://example.org", 503)] * MAX_FETCH_ATTEMPTS
+    get.return_value, get.side_effect = None, [RESULT_PAGE, *failures, LAST_PAGE]
+    waits = []
+    task = ("https://example.org/{brand_model}?cy={country}&page={page}", "NL", "ford/fiesta", 2017, None, 1)
+
+    batches = list(run_deferrable(scrape_job, [task], sleep=waits.append))
+
+    # page 1 is kept, the task resumes at page 2 instead of being dropped
+    assert [len(results) for _, results in batches] == [5, 5]
+    assert batches[1][0] == (*task[:-1], 2)
+    assert [call.args[0][-1] for call in get.call_args_list] == ["1"] + ["2"] * (MAX_FETCH_ATTEMPTS + 1)
+    assert waits == [scraping.DEFER_SECONDS]
+
+
+def test_fetch_page_shares_the_crawler(get):
+    assert scraping.fetch_page("https://example.org/angebote/1") == RESULT_PAGE
+    assert get.call_args.args[1] is scraping.page_crawler().breaker
+
+
+def test_parse_detail_page():
+    data = parse_detail_page(DETAIL_PAGE)
+
+    assert data["location"] == "1012AB Amsterdam, NL"
+    assert data["seller_type"] == "Händler"
+    assert data["accident_free"] is True
+    assert data["previous_owners"] == "2"
+    assert data["equipment"] == ["Bluetooth", "Klimaanlage", "Navigationssystem", "Sitzheizung", "Tempomat"]
+    assert data["details"]["Farbe"] == "Rot"
+    assert parse_detail_page("<html></html>")["accident_free"] is None
+
+
+def test_configure_crawler(mocker):
+    get = mocker.patch("as24_crawl.sources.runner.fetching.get", return_value="page")
+    mocker.patch.object(scraping._crawler_state, "crawler", None)
+    mocker.patch.object(scraping._crawler_state, "parameters", scraping.DEFAULT_CRAWL_PARAMETERS)
+    parameters = {**scraping.DEFAULT_CRAWL_PARAMETERS, "max_requests": 5, "page_cache": {"ttl_seconds": 60, "max_bytes": 100}}
+
+    scraping.configure_crawler(parameters)
+    crawler = scraping.page_crawler()
+    # the segments of a run share one crawler, and with it the request budget
+    scraping.configure_crawler(dict(parameters))
+    assert scraping.page_crawler() is crawler
+    scraping.fetch_page("https://example.org/")
+    scraping.fetch_page("https://example.org/")
+    assert get.call_count == 1
+
+    scraping.configure_crawler({**parameters, "max_requests": 10})
+    assert scraping.page_crawler() is not crawler
@@ -0,0 +1,80 @@
+import json
+import threading
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from as24_crawl.pipelines.data_processing.cleanup import clean_data
+from as24_crawl.pipelines.data_science.nodes import create_model_input_table, train_model
+from as24_crawl.serving import PricePredictor, create_server
+
+FEATURES = ["mileage", "engine_power", "registration_year", "brand", "model", "fuel_type", "transmission", "country"]
+
+
+def raw_listing(price, mileage, year, country, fuel_type="Benzin"):
+    return {
+        "price": f"€ {price:,},-".replace(",", "."),
+        "mileage": f"{mileage:,} km".replace(",", "."),
+        "first_registration": f"06/{year}",
+        "engine_power": "74 kW (101 PS)",
+        "co2_emission": "-",
+        "fuel_type": fuel_type,
+        "transmission": "Schaltgetriebe",
+        "brand": "ford",
+        "model": "fiesta",
+        "country": country,
+    }
+
+
+@pytest.fixture
+def raw_listings():
+    return [
+        raw_listing(18_000 - 500 * (2022 - year) - mileage // 20, mileage, year, country)
+        for year in range(2012, 2023)
+        for mileage in (20_000, 80_000, 140_000)
+        for country in ("NL", "D")
+    ]
+
+
+@pytest.fixture
+def predictor(raw_listings):
+    model_input = create_model_input_table(clean_data(pd.DataFrame(raw_listings)), {"features": FEATURES})
+    regressor = train_model(model_input[FEATURES], model_input["price"])
+    return PricePredictor(regressor, FEATURES)
+
+
+def test_predict_matches_training_prices(predictor, raw_listings):
+    predictions = predictor.predict(raw_listings)
+    expected = clean_data(pd.DataFrame(raw_listings))["price"].to_numpy()
+    np.testing.assert_allclose(predictions, expected, rtol=0.05)
+
+
+def test_predict_missing_features_and_unknown_categories(predictor):
+    listing = raw_listing(10_000, 50_000, 2018, "NL", fuel_type="Elektro")
+    incomplete = dict(listing, engine_power="- kW (- PS)")
+
+    predictions = predictor.predict([listing, incomplete])
+    assert np.isfinite(predictions[0])
+    assert np.isnan(predictions[1])
+
+
+def test_http_predict(predictor, raw_listings):
+    server = create_server(predictor, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}/predict",
+            data=json.dumps({"listings": raw_listings[:3]}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            predictions = json.loads(response.read())["predictions"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(predictions) == 3
+    assert all(isinstance(prediction, float) for prediction in predictions)
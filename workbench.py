@@ -10,12 +10,25 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.ticker import ScalarFormatter
 
+# memory-mapped from data/.arrow_cache after the first load of a version
 cleaned_df = io.load("cleaned_results")
 # Remove any line with more than 400,000 km mileage (outliers)
 cleaned_df = cleaned_df[cleaned_df['mileage'] <= 400000]
 len(cleaned_df)
 # %%
 # %%
+# SQL straight on the parquet files, no full load into pandas
+from as24_crawl.query import median_price_by_country, query
+
+median_price_by_country("golf", 2015, 150_000)
+query("""
+    SELECT brand, model, country, count(*) AS listings, median(price) AS median_price
+    FROM cleaned_results
+    WHERE mileage <= 400000
+    GROUP BY ALL
+    ORDER BY brand, model, country
+""")
+# %%
 # Basic Stats
 
 # Replace 'data' with your actual data list. Here, it is assumed df is the DataFrame